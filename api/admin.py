@@ -5,6 +5,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from .models import Team, User
+from .search import search_users
 
 
 class CustomUserAdmin(UserAdmin):
@@ -32,6 +33,12 @@ class CustomUserAdmin(UserAdmin):
         (_("Important dates"), {"fields": ("last_login",)}),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search users through trigram indexes instead of '%term%' scans."""
+        if not search_term.strip():
+            return queryset, False
+        return search_users(queryset, search_term), False
+
 
 class TeamAdmin(admin.ModelAdmin):
     """Team admin site configuration."""
@@ -0,0 +1,111 @@
+"""Admission control of concurrent requests by route class for api app."""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+DEFAULT_RETRY_AFTER: int = 5
+
+# Outcomes of admission, 'admitted' and 'queued' requests are served.
+ADMITTED: str = "admitted"
+QUEUED: str = "queued"
+REJECTED: str = "rejected"
+TIMEOUT: str = "timeout"
+
+
+class ConcurrencyLimiter:
+    """Slots for concurrent requests of one route class with bounded queue.
+
+    Request takes free slot at once, or waits up to 'timeout' seconds among
+    at most 'queue' others, otherwise it's rejected without waiting. Limits
+    hold per worker process, size them by its threads.
+    """
+
+    def __init__(self, limit: int, queue: int = 0, timeout: float = 10) -> None:
+        """Initialize free slots and counters."""
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.active: int = 0
+        self.waiting: int = 0
+        self.counters: Dict[str, int] = dict.fromkeys(
+            (ADMITTED, QUEUED, REJECTED, TIMEOUT), 0
+        )
+
+    def count(self, outcome: str) -> str:
+        """Count outcome, lock must be held by caller."""
+        self.counters[outcome] += 1
+        return outcome
+
+    def acquire(self, wait: bool = True) -> Optional[str]:
+        """Take slot, waiting in queue if allowed, and get admission outcome.
+
+        Without 'wait' None is returned instead of queueing, so caller can
+        wait elsewhere.
+        """
+        with self.condition:
+            if self.active < self.limit:
+                self.active += 1
+                return self.count(ADMITTED)
+            if not wait:
+                return None
+            if self.waiting >= self.queue:
+                return self.count(REJECTED)
+            deadline: float = time.monotonic() + self.timeout
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    remaining: float = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return self.count(TIMEOUT)
+                    self.condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            return self.count(QUEUED)
+
+    def release(self) -> None:
+        """Free slot for next waiting request."""
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def stats(self) -> Dict[str, int]:
+        """Get busy slots, waiting requests and outcome counters."""
+        with self.condition:
+            return {"active": self.active, "waiting": self.waiting, **self.counters}
+
+
+limiters: Dict[Tuple, ConcurrencyLimiter] = {}
+limiters_lock = threading.Lock()
+
+
+def get_route_class(view_name: Optional[str]) -> Optional[str]:
+    """Get name of route class view belongs to, None if it's unlimited."""
+    classes: Dict[str, Dict] = getattr(settings, "API_ADMISSION_CLASSES", {})
+    for name, options in classes.items():
+        if view_name in options.get("views", ()):
+            return name
+    return None
+
+
+def get_limiter(route_class: str) -> ConcurrencyLimiter:
+    """Get limiter of route class, new one whenever its settings change."""
+    options: Dict = getattr(settings, "API_ADMISSION_CLASSES", {})[route_class]
+    key: Tuple = (
+        route_class,
+        options["limit"],
+        options.get("queue", 0),
+        options.get("timeout", 10),
+    )
+    with limiters_lock:
+        if key not in limiters:
+            limiters[key] = ConcurrencyLimiter(*key[1:])
+        return limiters[key]
+
+
+def get_retry_after() -> int:
+    """Get seconds rejected clients are told to wait before retrying."""
+    return getattr(settings, "API_ADMISSION_RETRY_AFTER", DEFAULT_RETRY_AFTER)
@@ -0,0 +1,22 @@
+"""Module for api app async views urls."""
+from django.urls import path
+
+from api.async_views import (
+    AsyncRegisterView,
+    AsyncTeamsView,
+    AsyncTeamView,
+    AsyncTokenObtainPairView,
+    AsyncUsersView,
+    AsyncUserView,
+)
+
+app_name = "async_api"
+
+urlpatterns = [
+    path("auth/token/", AsyncTokenObtainPairView.as_view(), name="token"),
+    path("auth/signup/", AsyncRegisterView.as_view(), name="sign_up"),
+    path("user/<int:pk>/", AsyncUserView.as_view(), name="user"),
+    path("user/", AsyncUsersView.as_view(), name="users"),
+    path("team/<int:pk>/", AsyncTeamView.as_view(), name="team"),
+    path("team/", AsyncTeamsView.as_view(), name="teams"),
+]
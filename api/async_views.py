@@ -0,0 +1,364 @@
+"""Async class views for api app served natively under ASGI."""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_login_failed
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+    NotFound,
+    ParseError,
+    PermissionDenied,
+    UnsupportedMediaType,
+)
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import Serializer
+
+from api.authentication import CachedJWTAuthentication
+from api.common import ReadOnly
+from api.hashing import acheck_password, amake_password, must_update_password
+from api.logins import record_login
+from api.models import Team, User
+from api.pagination import KeysetPagination
+from api.serializers import (
+    CreateUserSerializer,
+    TeamSerializer,
+    TokenObtainPairSerializer,
+    UserSerializer,
+)
+
+FORM_CONTENT_TYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+MODEL_BACKEND = "django.contrib.auth.backends.ModelBackend"
+
+
+class AsyncAPIView(View):
+    """Base async class view with json request parsing, exempt from CSRF.
+
+    Requests are authenticated and checked against 'permission_classes' the
+    way rest_framework views do it, errors are rendered with the same shapes.
+    """
+
+    authentication_classes: Sequence = (CachedJWTAuthentication,)
+    permission_classes: Sequence = ()
+    renderer: JSONRenderer = JSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Mark view as CSRF exempt like rest_framework views are."""
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Authenticate and authorize request, then call method handler."""
+        method: str = request.method.lower()
+        handler = None
+        if method in self.http_method_names:
+            handler = getattr(self, method, None)
+        try:
+            if handler is None:
+                raise MethodNotAllowed(request.method)
+            await self.authenticate(request)
+            self.check_permissions(request)
+            return await handler(request, *args, **kwargs)
+        except APIException as exc:
+            return self.error_response(exc)
+
+    async def authenticate(self, request: HttpRequest) -> None:
+        """Set user and auth of request by the first succeeded authenticator."""
+        request.user, request.auth = AnonymousUser(), None
+        self.authenticator = None
+        for authenticator in self.get_authenticators():
+            try:
+                result: Optional[Tuple] = await authenticator.aauthenticate(request)
+            except AuthenticationFailed as exc:
+                exc.auth_header = authenticator.authenticate_header(request)
+                raise
+            if result is not None:
+                request.user, request.auth = result
+                self.authenticator = authenticator
+                return
+
+    def get_authenticators(self) -> List:
+        """Instantiate authentication classes."""
+        return [authentication() for authentication in self.authentication_classes]
+
+    def check_permissions(self, request: HttpRequest) -> None:
+        """Raise error if any permission class denies request."""
+        for permission in [permission() for permission in self.permission_classes]:
+            if permission.has_permission(request, self):
+                continue
+            if self.authentication_classes and self.authenticator is None:
+                exc = NotAuthenticated()
+                exc.auth_header = self.get_authenticators()[0].authenticate_header(
+                    request
+                )
+                raise exc
+            raise PermissionDenied(
+                getattr(permission, "message", None),
+                getattr(permission, "code", None),
+            )
+
+    def parse_body(self, request: HttpRequest) -> Any:
+        """Parse json or form request body."""
+        if request.content_type == "application/json":
+            try:
+                return json.loads(request.body or b"{}")
+            except ValueError as exc:
+                raise ParseError(f"JSON parse error - {exc}")
+        if request.content_type in FORM_CONTENT_TYPES and request.method == "POST":
+            return request.POST
+        if request.content_type == "application/x-www-form-urlencoded":
+            return QueryDict(request.body, encoding=request.encoding)
+        raise UnsupportedMediaType(request.content_type)
+
+    def json_response(
+        self, data: Any, status_code: int = status.HTTP_200_OK, **headers
+    ) -> HttpResponse:
+        """Render data the same way rest_framework json renderer does."""
+        response = HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type="application/json",
+        )
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def error_response(self, exc: APIException) -> HttpResponse:
+        """Build response for api exception shaped as rest_framework does."""
+        detail = exc.detail
+        if not isinstance(detail, (dict, list)):
+            detail = {"detail": detail}
+        headers: Dict[str, str] = {}
+        if getattr(exc, "auth_header", None):
+            headers["WWW-Authenticate"] = exc.auth_header
+        return self.json_response(detail, exc.status_code, **headers)
+
+
+class AsyncModelAPIView(AsyncAPIView):
+    """Base async class view for model objects using async ORM interface."""
+
+    serializer_class: Serializer = None
+    queryset: QuerySet = None
+    permission_classes: Sequence = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    pagination_class = KeysetPagination
+    keyset_ordering: Tuple[str, str] = ("id", "id")
+
+    def get_queryset(self) -> QuerySet:
+        """Get fresh copy of view queryset."""
+        return self.queryset.all()
+
+    async def get_object(self, pk: int) -> Model:
+        """Get object by pk or raise not found error."""
+        queryset: QuerySet = self.get_queryset()
+        try:
+            return await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise NotFound(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+
+    async def validate(self, serializer: Serializer) -> None:
+        """Validate serializer data in thread as validators query database."""
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+    async def list(self, request: HttpRequest) -> HttpResponse:
+        """List objects, paginated by keyset if client asked for it."""
+        queryset: QuerySet = self.get_queryset()
+        paginator = self.pagination_class()
+        drf_request = Request(request)
+        if not paginator.is_requested(drf_request):
+            rows = [row async for row in queryset]
+            return self.json_response(self.serializer_class(rows, many=True).data)
+        position, reverse = paginator.prepare(drf_request, self)
+        page_queryset = paginator.get_page_queryset(queryset, position, reverse)
+        page = paginator.build_page(
+            [row async for row in page_queryset], position, reverse
+        )
+        data = self.serializer_class(page, many=True).data
+        return self.json_response(paginator.get_paginated_response(data).data)
+
+    async def create(self, request: HttpRequest) -> HttpResponse:
+        """Create object from request data."""
+        serializer: Serializer = self.serializer_class(data=self.parse_body(request))
+        await self.validate(serializer)
+        model = self.queryset.model
+        serializer.instance = await model.objects.acreate(**serializer.validated_data)
+        return self.json_response(serializer.data, status.HTTP_201_CREATED)
+
+    async def retrieve(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Retrieve object by pk."""
+        instance: Model = await self.get_object(pk)
+        return self.json_response(self.serializer_class(instance).data)
+
+    async def update(
+        self, request: HttpRequest, pk: int, partial: bool = False
+    ) -> HttpResponse:
+        """Update object by pk with request data."""
+        instance: Model = await self.get_object(pk)
+        serializer: Serializer = self.serializer_class(
+            instance, data=self.parse_body(request), partial=partial
+        )
+        await self.validate(serializer)
+        for attr, value in serializer.validated_data.items():
+            setattr(instance, attr, value)
+        await instance.asave()
+        return self.json_response(serializer.data)
+
+    async def destroy(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Delete object by pk."""
+        instance: Model = await self.get_object(pk)
+        await instance.adelete()
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncRegisterView(AsyncAPIView):
+    """Async class view for user registering with offloaded password hashing."""
+
+    async def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Create user."""
+        serializer = CreateUserSerializer(data=self.parse_body(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return self.json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        validated_data: Dict = dict(serializer.validated_data)
+        validated_data["password"] = await amake_password(validated_data["password"])
+        user = User(**validated_data)
+        await user.asave()
+        serializer.instance = user
+        return self.json_response(serializer.data, status.HTTP_201_CREATED)
+
+
+class AsyncTokenObtainPairView(AsyncAPIView):
+    """Async class view issuing token pair with offloaded password check.
+
+    Credentials are checked the way ModelBackend does it: outdated password
+    hash is upgraded and failure sends 'user_login_failed'. With any other
+    AUTHENTICATION_BACKENDS, authenticate() runs in thread instead.
+    """
+
+    authentication_classes: Sequence = ()
+
+    async def check_credentials(
+        self, request: HttpRequest, username: str, password: str
+    ) -> Optional[User]:
+        """Get active user with given credentials, None if there is no one."""
+        if list(settings.AUTHENTICATION_BACKENDS) != [MODEL_BACKEND]:
+            credentials: Dict = {User.USERNAME_FIELD: username, "password": password}
+            return await sync_to_async(authenticate)(request, **credentials)
+        user = await User.objects.filter(**{User.USERNAME_FIELD: username}).afirst()
+        if user is None:
+            # Hash anyway, so response time doesn't reveal existing accounts.
+            await amake_password(password)
+        elif await acheck_password(password, user.password):
+            if must_update_password(user.password):
+                user.password = await amake_password(password)
+                await user.asave(update_fields=["password"])
+            if ModelBackend().user_can_authenticate(user):
+                return user
+        await sync_to_async(user_login_failed.send)(
+            sender=__name__,
+            credentials={User.USERNAME_FIELD: username, "password": "*" * 20},
+            request=request,
+        )
+        return None
+
+    async def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Authenticate user by credentials and issue token pair."""
+        serializer = TokenObtainPairSerializer()
+        attrs: Dict = serializer.to_internal_value(self.parse_body(request))
+        user: Optional[User] = await self.check_credentials(
+            request, attrs[serializer.username_field], attrs["password"]
+        )
+        if user is None:
+            raise AuthenticationFailed(
+                serializer.error_messages["no_active_account"], "no_active_account"
+            )
+        refresh = serializer.get_token(user)
+        await sync_to_async(record_login)(user)
+        return self.json_response(
+            {"refresh": str(refresh), "access": str(refresh.access_token)}
+        )
+
+
+class AsyncUserView(AsyncModelAPIView):
+    """Async class view for user retrieve, update and delete."""
+
+    serializer_class: Serializer = UserSerializer
+    queryset: QuerySet = User.objects.all()
+
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Get user by pk."""
+        return await self.retrieve(request, pk)
+
+    async def put(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Update user by pk."""
+        return await self.update(request, pk)
+
+    async def patch(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Update partially by pk."""
+        return await self.update(request, pk, partial=True)
+
+    async def delete(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Delete user by pk."""
+        return await self.destroy(request, pk)
+
+
+class AsyncUsersView(AsyncModelAPIView):
+    """Async class view for list user."""
+
+    serializer_class: Serializer = UserSerializer
+    queryset: QuerySet = User.objects.all()
+    keyset_ordering = ("last_name", "id")
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """Retrieve users list."""
+        return await self.list(request)
+
+
+class AsyncTeamView(AsyncModelAPIView):
+    """Async class view for team retrieve, update and delete."""
+
+    serializer_class: Serializer = TeamSerializer
+    queryset: QuerySet = Team.objects.all()
+
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Get team by pk."""
+        return await self.retrieve(request, pk)
+
+    async def put(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Update team by pk."""
+        return await self.update(request, pk)
+
+    async def delete(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Delete team by pk."""
+        return await self.destroy(request, pk)
+
+
+class AsyncTeamsView(AsyncModelAPIView):
+    """Async class view for creating and get many teams."""
+
+    serializer_class: Serializer = TeamSerializer
+    queryset: QuerySet = Team.objects.all()
+    keyset_ordering = ("name", "id")
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """Retrieve teams list."""
+        return await self.list(request)
+
+    async def post(self, request: HttpRequest) -> HttpResponse:
+        """Create team."""
+        return await self.create(request)
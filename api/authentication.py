@@ -0,0 +1,169 @@
+"""Authentication classes for api app."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import Token
+
+from api.models import User
+from api.timing import timed
+
+AUTH_FIELDS: Tuple[str, ...] = ("is_active", "is_staff", "is_superuser", "password")
+
+CacheEntry = Tuple[float, User, Token]
+
+
+class TokenCache:
+    """Thread safe LRU cache of validated tokens and users with TTL.
+
+    Entries live in process memory, so other workers learn about changes of
+    a user only when entry expires, 'API_AUTH_CACHE_TTL' bounds this delay.
+    """
+
+    default_max_size: int = 10000
+    default_ttl: int = 60
+
+    def __init__(self) -> None:
+        """Initialize empty cache and counters."""
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[bytes, CacheEntry]" = OrderedDict()
+        self.user_tokens: Dict[int, Set[bytes]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @property
+    def max_size(self) -> int:
+        """Get max entries number from settings."""
+        return getattr(settings, "API_AUTH_CACHE_MAX_SIZE", self.default_max_size)
+
+    @property
+    def ttl(self) -> int:
+        """Get entry time to live in seconds from settings."""
+        return getattr(settings, "API_AUTH_CACHE_TTL", self.default_ttl)
+
+    def get(self, raw_token: bytes) -> Optional[Tuple[User, Token]]:
+        """Get copy of cached user and validated token."""
+        with self.lock:
+            entry: Optional[CacheEntry] = self.entries.get(raw_token)
+            if entry is not None and entry[0] <= time.time():
+                self.pop(raw_token)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(raw_token)
+            self.hits += 1
+        return copy.copy(entry[1]), entry[2]
+
+    def set(self, raw_token: bytes, user: User, token: Token) -> None:
+        """Store user and validated token until token or ttl expires."""
+        if self.max_size <= 0:
+            return
+        expires_at: float = min(time.time() + self.ttl, token["exp"])
+        with self.lock:
+            self.pop(raw_token)
+            self.entries[raw_token] = (expires_at, copy.copy(user), token)
+            self.user_tokens.setdefault(user.pk, set()).add(raw_token)
+            while len(self.entries) > self.max_size:
+                self.pop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def pop(self, raw_token: bytes) -> None:
+        """Remove entry, lock must be held by caller."""
+        entry: Optional[CacheEntry] = self.entries.pop(raw_token, None)
+        if entry is None:
+            return
+        tokens: Set[bytes] = self.user_tokens.get(entry[1].pk, set())
+        tokens.discard(raw_token)
+        if not tokens:
+            self.user_tokens.pop(entry[1].pk, None)
+
+    def invalidate_user(self, user: User) -> None:
+        """Remove user entries if fields used by authentication changed."""
+        with self.lock:
+            for raw_token in list(self.user_tokens.get(user.pk, ())):
+                cached: User = self.entries[raw_token][1]
+                if any(
+                    getattr(cached, field) != getattr(user, field)
+                    for field in AUTH_FIELDS
+                ):
+                    self.pop(raw_token)
+
+    def evict_user(self, user_id: int) -> None:
+        """Remove all entries of user."""
+        with self.lock:
+            for raw_token in list(self.user_tokens.get(user_id, ())):
+                self.pop(raw_token)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self.lock:
+            self.entries.clear()
+            self.user_tokens.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit, miss and eviction counters."""
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+token_cache = TokenCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication skipping signature check and user query on repeat."""
+
+    def get_raw_token_from_request(self, request) -> Optional[bytes]:
+        """Get raw token from authorization header of request."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        return self.get_raw_token(header)
+
+    def authenticate(self, request):
+        """Authenticate request using cached token and user if possible."""
+        with timed("auth"):
+            return self.authenticate_token(request)
+
+    def authenticate_token(self, request):
+        """Authenticate request by token from header."""
+        raw_token = self.get_raw_token_from_request(request)
+        if raw_token is None:
+            return None
+        cached = token_cache.get(raw_token)
+        if cached is not None:
+            return cached
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        token_cache.set(raw_token, user, validated_token)
+        return user, validated_token
+
+    async def aauthenticate(self, request):
+        """Authenticate request from async view, querying user off event loop."""
+        with timed("auth"):
+            return await self.aauthenticate_token(request)
+
+    async def aauthenticate_token(self, request):
+        """Authenticate request by token from header."""
+        raw_token = self.get_raw_token_from_request(request)
+        if raw_token is None:
+            return None
+        cached = token_cache.get(raw_token)
+        if cached is not None:
+            return cached
+        validated_token = self.get_validated_token(raw_token)
+        user = await sync_to_async(self.get_user)(validated_token)
+        token_cache.set(raw_token, user, validated_token)
+        return user, validated_token
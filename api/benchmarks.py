@@ -0,0 +1,364 @@
+"""Endpoint benchmark scenarios and measurements for api app."""
+import json
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.authentication import token_cache
+from api.models import User
+from api.seeding import analyze, seed_teams, seed_users
+
+BENCHMARK_PASSWORD: str = "benchmark-password"
+
+# Builds request of iteration: url args, query, body and content type.
+RequestBuilder = Callable[["Dataset", int], Tuple[List, str, Any, Optional[str]]]
+
+
+@dataclass
+class Dataset:
+    """Seeded rows boundaries and credentials of benchmark user."""
+
+    teams: int
+    users: int
+    first_team_id: int
+    first_user_id: int
+    headers: Dict[str, str]
+    refresh: str
+    # Appended to emails, so they don't clash with rows in database.
+    run: str = ""
+
+    def email(self, name: str) -> str:
+        """Get email of benchmark run."""
+        return f"{name}{self.run}@example.com"
+
+    def team_id(self, number: int) -> int:
+        """Get id of seeded team, wrapping around."""
+        return self.first_team_id + number % self.teams
+
+    def user_id(self, number: int) -> int:
+        """Get id of seeded user, wrapping around."""
+        return self.first_user_id + number % self.users
+
+
+@dataclass
+class Scenario:
+    """Request to url name with given method built for each iteration."""
+
+    url_name: str
+    method: str
+    build: RequestBuilder
+    authorized: bool = True
+
+    @property
+    def name(self) -> str:
+        """Get scenario name used in report."""
+        return f"{self.url_name}:{self.method}"
+
+
+def as_json(data: Any) -> Tuple[str, str]:
+    """Encode request body as json."""
+    return json.dumps(data), "application/json"
+
+
+def build_import(dataset: Dataset, number: int):
+    """Build csv body of ten new users."""
+    rows = [
+        f"{dataset.email(f'import{number}-{row}')},Imported,User,secret,"
+        f"{dataset.team_id(row)}"
+        for row in range(10)
+    ]
+    body = "\n".join(["email,first_name,last_name,password,team", *rows])
+    return [], "", body, "text/csv"
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "token",
+        "post",
+        lambda dataset, number: [
+            [],
+            "",
+            *as_json(
+                {"email": dataset.email("benchmark"), "password": BENCHMARK_PASSWORD}
+            ),
+        ],
+        authorized=False,
+    ),
+    Scenario(
+        "token_refresh",
+        "post",
+        lambda dataset, number: [[], "", *as_json({"refresh": dataset.refresh})],
+        authorized=False,
+    ),
+    Scenario(
+        "sign_up",
+        "post",
+        lambda dataset, number: [
+            [],
+            "",
+            *as_json({"email": dataset.email(f"signup{number}"), "password": "secret"}),
+        ],
+        authorized=False,
+    ),
+    Scenario(
+        "user",
+        "get",
+        lambda dataset, number: [[dataset.user_id(number * 7919)], "", None, None],
+    ),
+    Scenario(
+        "user",
+        "put",
+        lambda dataset, number: [
+            [dataset.user_id(number * 7919 + 1)],
+            "",
+            *as_json(
+                {
+                    "email": dataset.email(f"put{number}"),
+                    "first_name": "Put",
+                    "last_name": "User",
+                    "team": dataset.team_id(number),
+                }
+            ),
+        ],
+    ),
+    Scenario(
+        "user",
+        "patch",
+        lambda dataset, number: [
+            [dataset.user_id(number * 7919 + 2)],
+            "",
+            *as_json({"first_name": f"Patched{number}"}),
+        ],
+    ),
+    Scenario(
+        "users",
+        "get",
+        lambda dataset, number: [[], "?page_size=100", None, None],
+    ),
+    Scenario(
+        "users",
+        "patch",
+        lambda dataset, number: [
+            [],
+            "",
+            *as_json(
+                [
+                    {"id": dataset.user_id(number * 100 + row), "last_name": "Bulk"}
+                    for row in range(100)
+                ]
+            ),
+        ],
+    ),
+    Scenario(
+        "users_search",
+        "get",
+        lambda dataset, number: [[], f"?q=user{number + 1}", None, None],
+    ),
+    Scenario("users_import", "post", build_import),
+    Scenario(
+        "users_move",
+        "post",
+        lambda dataset, number: [
+            [],
+            "",
+            *as_json(
+                {
+                    "team": dataset.team_id(number + 1),
+                    "source_team": dataset.team_id(number),
+                }
+            ),
+        ],
+    ),
+    Scenario("users_export", "get", lambda dataset, number: [[], "", None, None]),
+    Scenario(
+        "team",
+        "get",
+        lambda dataset, number: [[dataset.team_id(number * 31)], "", None, None],
+    ),
+    Scenario(
+        "team",
+        "put",
+        lambda dataset, number: [
+            [dataset.team_id(number * 31 + 1)],
+            "",
+            *as_json({"name": f"Renamed {number}"}),
+        ],
+    ),
+    Scenario(
+        "teams",
+        "get",
+        lambda dataset, number: [[], "?page_size=100", None, None],
+    ),
+    Scenario(
+        "teams",
+        "post",
+        lambda dataset, number: [[], "", *as_json({"name": f"New team {number}"})],
+    ),
+    Scenario(
+        "team_roster",
+        "get",
+        lambda dataset, number: [[dataset.team_id(number * 31 + 3)], "", None, None],
+    ),
+    Scenario(
+        "teams_roster",
+        "get",
+        lambda dataset, number: [[], "?page_size=20", None, None],
+    ),
+    Scenario("metrics", "get", lambda dataset, number: [[], "", None, None]),
+    # Deletes go last, so other scenarios don't meet rows they removed.
+    Scenario(
+        "user",
+        "delete",
+        lambda dataset, number: [[dataset.user_id(number * 7919 + 3)], "", None, None],
+    ),
+    Scenario(
+        "team",
+        "delete",
+        lambda dataset, number: [[dataset.team_id(number * 31 + 2)], "", None, None],
+    ),
+]
+
+
+def seed(teams: int, users: int, run: str) -> Tuple[int, int]:
+    """Insert teams and users with COPY, get their first ids.
+
+    Every user is in team, emails end with 'run', so they are new.
+    """
+    team_ids: List[int] = seed_teams(teams)
+    first_user_id: int = seed_users(
+        users, "!", team_ids, 0, random.Random(0), email_suffix=run
+    )
+    analyze()
+    return team_ids[0], first_user_id
+
+
+def get_host() -> str:
+    """Get host allowed by settings to send benchmark requests to."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+def check(response, name: str) -> None:
+    """Fail benchmark on response which isn't successful."""
+    if not 200 <= response.status_code < 300:
+        raise CommandError(f"{name} returned {response.status_code} status.")
+
+
+def prepare(client: Client, teams: int, users: int) -> Dataset:
+    """Seed rows and log benchmark admin in."""
+    run: str = f"-{uuid.uuid4().hex[:8]}"
+    first_team_id, first_user_id = seed(teams, users, run)
+    email: str = f"benchmark{run}@example.com"
+    User.objects.create_superuser(email=email, password=BENCHMARK_PASSWORD)
+    response = client.post(
+        reverse("token"), {"email": email, "password": BENCHMARK_PASSWORD}
+    )
+    check(response, "token:post")
+    tokens: Dict = response.json()
+    return Dataset(
+        teams=teams,
+        users=users,
+        first_team_id=first_team_id,
+        first_user_id=first_user_id,
+        headers={"Authorization": f"Bearer {tokens['access']}"},
+        refresh=tokens["refresh"],
+        run=run,
+    )
+
+
+def send(client: Client, scenario: Scenario, dataset: Dataset, number: int) -> int:
+    """Send scenario request of iteration, reading streamed content too.
+
+    CommandError is raised when request isn't successful.
+    """
+    args, query, body, content_type = scenario.build(dataset, number)
+    kwargs: Dict[str, Any] = {"headers": dataset.headers if scenario.authorized else {}}
+    if body is not None:
+        kwargs.update(data=body, content_type=content_type)
+    url: str = reverse(scenario.url_name, args=args) + query
+    response = getattr(client, scenario.method)(url, **kwargs)
+    check(response, scenario.name)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response.status_code
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """Get inclusive percentile of values."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def measure(
+    client: Client, scenario: Scenario, dataset: Dataset, requests: int, warm: bool
+) -> Dict[str, Any]:
+    """Measure latency percentiles, then query count and peak memory once.
+
+    Query capturing and memory tracing slow requests down, so they are done
+    in one extra request, not in timed ones. Cache is cleared before every
+    request unless 'warm', so views do their work instead of cache hits.
+    """
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    for number in range(requests + 1):
+        if not warm:
+            cache.clear()
+            token_cache.clear()
+        started: float = time.perf_counter()
+        if number < requests:
+            status: int = send(client, scenario, dataset, number)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            continue
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                send(client, scenario, dataset, number)
+            peak: int = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """List routes slower than baseline beyond tolerance or doing more queries."""
+    regressions: List[str] = []
+    for name, result in report["routes"].items():
+        previous: Optional[Dict] = baseline.get("routes", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "peak_memory_kb"):
+            if result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]} -> {result[metric]}"
+                )
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name} queries: {previous['queries']} -> {result['queries']}"
+            )
+    return regressions
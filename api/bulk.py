@@ -0,0 +1,250 @@
+"""Bulk operations over users for api app."""
+import csv
+import json
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
+
+from api.caching import bump_versions
+from api.hashing import hash_passwords
+from api.models import Team, User
+from api.serializers import BulkUpdateUserSerializer, ImportUserSerializer
+from api.signals import users_moved
+
+CSV_CONTENT_TYPES = ("text/csv",)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+INVALID_ROW_MESSAGE = "Invalid JSON object."
+EMAIL_EXISTS_MESSAGE = "user with this email address already exists."
+TEAM_DOES_NOT_EXIST_MESSAGE = 'Invalid pk "{pk}" - object does not exist.'
+USER_DOES_NOT_EXIST_MESSAGE = TEAM_DOES_NOT_EXIST_MESSAGE
+DUPLICATE_ID_MESSAGE = "User is already updated by other item."
+INVALID_ENCODING_MESSAGE = "Line {line} is not valid UTF-8 text."
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Read rows from csv lines dropping empty values and extra columns."""
+    for row in csv.DictReader(lines):
+        yield {key: value for key, value in row.items() if key and value != ""}
+
+
+def read_ndjson_rows(lines: Iterable[str]) -> Iterator[Optional[Dict[str, Any]]]:
+    """Read objects from ndjson lines, yield None for malformed lines."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def decode_lines(stream: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 lines, rejecting whole body at first undecodable one.
+
+    Rows of chunks imported before that line stay imported.
+    """
+    for number, line in enumerate(stream, start=1):
+        try:
+            yield line.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            message: str = INVALID_ENCODING_MESSAGE.format(line=number)
+            raise ValidationError({"non_field_errors": [message]})
+
+
+def read_rows(stream: IO[bytes], content_type: str) -> Iterator[Optional[Dict]]:
+    """Read import rows from byte stream according to content type."""
+    media_type: str = content_type.split(";")[0].strip().lower()
+    lines: Iterator[str] = decode_lines(stream or ())
+    if media_type in CSV_CONTENT_TYPES:
+        return read_csv_rows(lines)
+    if media_type in NDJSON_CONTENT_TYPES:
+        return read_ndjson_rows(lines)
+    raise UnsupportedMediaType(content_type)
+
+
+def move_users(
+    team: Team,
+    user_ids: Optional[Iterable[int]] = None,
+    source_team: Optional[Team] = None,
+) -> int:
+    """Move given users or members of source team to team with one UPDATE.
+
+    Per-row signals are not sent, 'users_moved' is sent once instead.
+    """
+    queryset = User.objects.exclude(team=team)
+    if user_ids is not None:
+        queryset = queryset.filter(pk__in=list(user_ids))
+    if source_team is not None:
+        queryset = queryset.filter(team=source_team)
+    count: int = queryset.update(team=team)
+    users_moved.send(sender=User, team=team, count=count)
+    return count
+
+
+class UserImporter:
+    """Import users in chunks with batched inserts and pooled hashing."""
+
+    default_chunk_size: int = 500
+
+    def __init__(self, chunk_size: Optional[int] = None) -> None:
+        """Set chunk size from settings if not given explicitly."""
+        self.chunk_size: int = chunk_size or getattr(
+            settings, "API_IMPORT_CHUNK_SIZE", self.default_chunk_size
+        )
+        self.created: int = 0
+        self.errors: List[Dict] = []
+
+    def validate_chunk(
+        self, chunk: List[Tuple[int, Optional[Dict]]]
+    ) -> List[Tuple[int, Dict]]:
+        """Validate chunk rows, resolving teams and emails with one query each."""
+        validated: List[Tuple[int, Dict]] = []
+        for number, row in chunk:
+            if row is None:
+                self.add_error(number, {"non_field_errors": [INVALID_ROW_MESSAGE]})
+                continue
+            serializer = ImportUserSerializer(data=row)
+            if serializer.is_valid():
+                data: Dict = serializer.validated_data
+                data["email"] = User.objects.normalize_email(data["email"])
+                validated.append((number, data))
+            else:
+                self.add_error(number, serializer.errors)
+        team_ids: Set[int] = {
+            data["team"] for _, data in validated if data["team"] is not None
+        }
+        teams: Dict[int, Team] = Team.objects.in_bulk(team_ids)
+        existing: Set[str] = set(
+            User.objects.filter(
+                email__in=[data["email"] for _, data in validated]
+            ).values_list("email", flat=True)
+        )
+        valid: List[Tuple[int, Dict]] = []
+        for number, data in validated:
+            if data["email"] in existing:
+                self.add_error(number, {"email": [EMAIL_EXISTS_MESSAGE]})
+            elif data["team"] is not None and data["team"] not in teams:
+                message: str = TEAM_DOES_NOT_EXIST_MESSAGE.format(pk=data["team"])
+                self.add_error(number, {"team": [message]})
+            else:
+                existing.add(data["email"])
+                valid.append((number, data))
+        return valid
+
+    def import_chunk(self, chunk: List[Tuple[int, Optional[Dict]]]) -> None:
+        """Validate chunk and insert its valid rows with one bulk insert."""
+        valid: List[Tuple[int, Dict]] = self.validate_chunk(chunk)
+        if not valid:
+            return
+        passwords: List[str] = hash_passwords([data["password"] for _, data in valid])
+        users: List[User] = [
+            User(
+                email=data["email"],
+                first_name=data["first_name"],
+                last_name=data["last_name"],
+                team_id=data["team"],
+                password=password,
+            )
+            for (_, data), password in zip(valid, passwords)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.chunk_size)
+        bump_versions("user")
+        self.created += len(users)
+
+    def add_error(self, number: int, errors: Dict) -> None:
+        """Add row errors to import report."""
+        self.errors.append({"row": number, "errors": errors})
+
+    def run(self, rows: Iterable[Optional[Dict]]) -> Dict[str, Any]:
+        """Import all rows and return report with per-row errors."""
+        numbered: Iterator[Tuple[int, Optional[Dict]]] = enumerate(rows, start=1)
+        while chunk := list(islice(numbered, self.chunk_size)):
+            self.import_chunk(chunk)
+        self.errors.sort(key=lambda error: error["row"])
+        return {"created": self.created, "errors": self.errors}
+
+
+class UserUpdater:
+    """Apply partial updates of many users with batched UPDATE statements."""
+
+    default_batch_size: int = 500
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        """Set batch size from settings if not given explicitly."""
+        self.batch_size: int = batch_size or getattr(
+            settings, "API_BULK_UPDATE_BATCH_SIZE", self.default_batch_size
+        )
+        self.users: Dict[int, User] = {}
+        self.errors: List[Dict] = []
+
+    def validate(self, items: Iterable[Any]) -> List[Tuple[int, Dict]]:
+        """Validate items, resolving users and teams with one query each."""
+        validated: List[Tuple[int, Dict]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                self.add_error(index, {"non_field_errors": [INVALID_ROW_MESSAGE]})
+                continue
+            serializer = BulkUpdateUserSerializer(data=item)
+            if serializer.is_valid():
+                validated.append((index, serializer.validated_data))
+            else:
+                self.add_error(index, serializer.errors)
+        # Rows stay locked until update, so concurrent edits aren't overwritten.
+        self.users = (
+            User.objects.select_for_update()
+            .order_by("pk")
+            .in_bulk([data["id"] for _, data in validated])
+        )
+        team_ids: Set[int] = {
+            data["team"] for _, data in validated if data.get("team") is not None
+        }
+        teams: Dict[int, Team] = Team.objects.in_bulk(team_ids)
+        seen: Set[int] = set()
+        valid: List[Tuple[int, Dict]] = []
+        for index, data in validated:
+            if data["id"] not in self.users:
+                message: str = USER_DOES_NOT_EXIST_MESSAGE.format(pk=data["id"])
+                self.add_error(index, {"id": [message]})
+            elif data["id"] in seen:
+                self.add_error(index, {"id": [DUPLICATE_ID_MESSAGE]})
+            elif data.get("team") is not None and data["team"] not in teams:
+                message = TEAM_DOES_NOT_EXIST_MESSAGE.format(pk=data["team"])
+                self.add_error(index, {"team": [message]})
+            else:
+                seen.add(data["id"])
+                valid.append((index, data))
+        return valid
+
+    def add_error(self, index: int, errors: Dict) -> None:
+        """Add item errors to update report."""
+        self.errors.append({"index": index, "errors": errors})
+
+    def run(self, items: Iterable[Any]) -> Dict[str, Any]:
+        """Update users of valid items and return report with per-item errors.
+
+        All fields given by any item are written, so rows of items without
+        some of them keep values loaded during validation, in same transaction.
+        """
+        fields: Set[str] = set()
+        users: List[User] = []
+        with transaction.atomic():
+            for _, data in self.validate(items):
+                user: User = self.users[data.pop("id")]
+                if not data:
+                    continue
+                for field, value in data.items():
+                    setattr(user, "team_id" if field == "team" else field, value)
+                fields.update(data)
+                users.append(user)
+            if users:
+                User.objects.bulk_update(
+                    users, sorted(fields), batch_size=self.batch_size
+                )
+                bump_versions("user")
+        self.errors.sort(key=lambda error: error["index"])
+        return {"updated": len(users), "errors": self.errors}
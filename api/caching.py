@@ -0,0 +1,151 @@
+"""Response caching with conditional GET support for api app."""
+import hashlib
+import time
+import uuid
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.routers import get_sticky_seconds, is_reading_replica
+
+VERSION_KEY: str = "api:version:{resource}"
+RESPONSE_KEY: str = "api:response:{view}:{digest}"
+DEFAULT_TIMEOUT: int = 300
+
+
+def new_version() -> str:
+    """Generate unique version token starting with its creation time."""
+    return f"{time.time():.6f}:{uuid.uuid4().hex}"
+
+
+def get_versions(resources: Sequence[str]) -> Tuple[str, ...]:
+    """Get current cache versions of resources, creating missing ones."""
+    keys = [VERSION_KEY.format(resource=resource) for resource in resources]
+    versions: Dict[str, str] = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_versions(*resources: str) -> None:
+    """Invalidate cached responses built from given resources.
+
+    Versions are bumped again when transaction commits, concurrent requests
+    could cache pre-commit rows under versions bumped inside of it.
+    """
+
+    def bump() -> None:
+        cache.set_many(
+            {
+                VERSION_KEY.format(resource=resource): new_version()
+                for resource in resources
+            },
+            None,
+        )
+
+    if transaction.get_connection().in_atomic_block:
+        bump()
+    transaction.on_commit(bump)
+
+
+def changed_within(versions: Sequence[str], seconds: float) -> bool:
+    """Check whether any of versions was created less than seconds ago."""
+    since: float = time.time() - seconds
+    return any(float(version.partition(":")[0]) > since for version in versions)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match request header against response etag."""
+    header: Optional[str] = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+class CachedResponseMixin:
+    """Cache rendered json GET responses until their resources change.
+
+    Cache key includes versions of 'cache_resources', which signal receivers
+    bump on every change, so stale entries are never read and just expire.
+    Responses carry strong ETag and requests with matching If-None-Match get
+    304 without touching database.
+    """
+
+    cache_resources: Tuple[str, ...] = ()
+
+    def get_response_cache_key(self, request: Request) -> str:
+        """Build cache key from view, resources versions, path and media type."""
+        self.response_versions = get_versions(self.cache_resources)
+        source = "\n".join(
+            [
+                *self.response_versions,
+                request.get_full_path(),
+                request.accepted_media_type,
+            ]
+        )
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        return RESPONSE_KEY.format(view=type(self).__name__, digest=digest)
+
+    def cached_response(self, handler: Callable, request: Request, *args, **kwargs):
+        """Return cached response or build it with handler."""
+        if getattr(request.accepted_renderer, "format", None) != "json":
+            return handler(request, *args, **kwargs)
+        self.response_cache_key = self.get_response_cache_key(request)
+        cached = cache.get(self.response_cache_key)
+        if cached is None:
+            return handler(request, *args, **kwargs)
+        content, content_type, etag = cached
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        return response
+
+    def may_be_stale(self) -> bool:
+        """Check whether response was read from replica lagging behind change.
+
+        Such response is not cached, otherwise it would outlive replica lag
+        and break read-your-writes for client which made the change.
+        """
+        return is_reading_replica() and changed_within(
+            self.response_versions, get_sticky_seconds()
+        )
+
+    def list(self, request, *args, **kwargs):
+        """List objects using response cache."""
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve object using response cache."""
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Store freshly rendered successful response in cache."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key: Optional[str] = getattr(self, "response_cache_key", None)
+        if key is None or not isinstance(response, Response):
+            return response
+        if response.status_code != 200:
+            return response
+        response.render()
+        etag: str = quote_etag(hashlib.sha256(response.content).hexdigest())
+        timeout: int = getattr(settings, "API_RESPONSE_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+        if not self.may_be_stale():
+            cache.set(key, (response.content, response["Content-Type"], etag), timeout)
+        if etag_matches(request, etag):
+            not_modified = HttpResponseNotModified()
+            if response.has_header("Vary"):
+                not_modified["Vary"] = response["Vary"]
+            response = not_modified
+        response["ETag"] = etag
+        return response
@@ -0,0 +1,88 @@
+"""Streaming export of users for api app."""
+import csv
+import io
+import json
+from itertools import chain
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import router
+
+from api.models import User
+
+EXPORT_FIELDS: Tuple[str, ...] = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "team",
+    "team_name",
+)
+EXPORT_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "team_id",
+    "team__name",
+)
+DEFAULT_CHUNK_SIZE: int = 2000
+BUFFER_SIZE: int = 64 * 1024
+
+
+def get_export_rows(chunk_size: Optional[int] = None) -> Iterator[Sequence]:
+    """Iterate over users rows with team name through server-side cursor.
+
+    Database is chosen right away, as rows are streamed after request
+    routing context is gone.
+    """
+    chunk_size = chunk_size or getattr(
+        settings, "API_EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE
+    )
+    return (
+        User.objects.using(router.db_for_read(User))
+        .order_by("id")
+        .values_list(*EXPORT_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def buffered(lines: Iterable[str], size: int = BUFFER_SIZE) -> Iterator[bytes]:
+    """Join small lines into bigger chunks to keep response writes cheap."""
+    buffer = io.StringIO()
+    for line in lines:
+        buffer.write(line)
+        if buffer.tell() >= size:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class Echo:
+    """File-like object returning written value instead of storing it."""
+
+    def write(self, value: str) -> str:
+        """Return written value."""
+        return value
+
+
+def iter_csv(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """Render rows as csv lines with header."""
+    writer = csv.writer(Echo())
+    yield from buffered(writer.writerow(row) for row in chain([EXPORT_FIELDS], rows))
+
+
+def iter_ndjson(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """Render rows as newline delimited json objects."""
+    lines = (
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+    yield from buffered(lines)
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv; charset=utf-8"),
+    "ndjson": (iter_ndjson, "application/x-ndjson; charset=utf-8"),
+}
@@ -0,0 +1,68 @@
+"""Sparse fieldsets selected by 'fields' query param for api app."""
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+UNKNOWN_FIELDS_MESSAGE: str = "Unknown fields: {unknown}. Choose from: {available}."
+
+
+class SparseFieldsMixin:
+    """Return only fields listed in 'fields' query param of safe requests.
+
+    Serializer output is trimmed to requested fields and queryset loads only
+    columns backing them, plus keyset ordering columns needed for cursors.
+    """
+
+    fields_query_param: str = "fields"
+
+    def get_requested_fields(self) -> Optional[Tuple[str, ...]]:
+        """Get validated requested field names, None if all are wanted."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        raw: Optional[str] = self.request.query_params.get(self.fields_query_param)
+        if raw is None:
+            return None
+        requested: Tuple[str, ...] = tuple(
+            dict.fromkeys(name.strip() for name in raw.split(",") if name.strip())
+        )
+        available: List[str] = list(self.get_serializer_class()().fields)
+        unknown: List[str] = [name for name in requested if name not in available]
+        if unknown or not requested:
+            message: str = UNKNOWN_FIELDS_MESSAGE.format(
+                unknown=", ".join(unknown) or "none given",
+                available=", ".join(available),
+            )
+            raise ValidationError({self.fields_query_param: [message]})
+        return requested
+
+    def get_only_fields(self, queryset: QuerySet, fields: Tuple[str, ...]) -> List[str]:
+        """Get concrete model fields backing requested serializer fields."""
+        serializer_fields = self.get_serializer_class()().fields
+        names: List[str] = [serializer_fields[name].source for name in fields] + list(
+            getattr(self, "keyset_ordering", ())
+        )
+        only: List[str] = []
+        for name in dict.fromkeys(names):
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                only.append(name)
+        return only
+
+    def get_queryset(self) -> QuerySet:
+        """Load only columns needed by requested fields."""
+        queryset: QuerySet = super().get_queryset()
+        fields: Optional[Tuple[str, ...]] = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        return queryset.only(*self.get_only_fields(queryset, fields))
+
+    def get_serializer(self, *args, **kwargs):
+        """Build serializer with requested fields only."""
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,103 @@
+"""Password hashing helpers for api app."""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+
+DEFAULT_HASH_POOL_MIN_ROWS: int = 50
+
+async_executor: Optional[ThreadPoolExecutor] = None
+async_executor_lock = threading.Lock()
+hash_executors: Dict[Tuple[int, int], ProcessPoolExecutor] = {}
+hash_executors_lock = threading.Lock()
+
+
+def get_hash_workers() -> int:
+    """Get number of processes used for bulk password hashing."""
+    workers: Optional[int] = getattr(settings, "API_IMPORT_HASH_WORKERS", None)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """Get process pool for bulk hashing shared by requests of this process.
+
+    Pool is created on first use and its processes are spawned, not forked,
+    so threads of request worker aren't copied into them mid-operation.
+    """
+    key: Tuple[int, int] = (os.getpid(), get_hash_workers())
+    with hash_executors_lock:
+        if key not in hash_executors:
+            hash_executors[key] = ProcessPoolExecutor(
+                max_workers=key[1],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return hash_executors[key]
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash passwords, spreading large batches over process pool."""
+    workers: int = get_hash_workers()
+    min_rows: int = getattr(
+        settings, "API_IMPORT_HASH_POOL_MIN_ROWS", DEFAULT_HASH_POOL_MIN_ROWS
+    )
+    if workers <= 1 or len(passwords) < max(min_rows, 2):
+        return [make_password(password) for password in passwords]
+    chunksize: int = max(1, len(passwords) // (workers * 4))
+    return list(get_hash_executor().map(make_password, passwords, chunksize=chunksize))
+
+
+def get_async_executor() -> ThreadPoolExecutor:
+    """Get shared bounded pool for hashing requested from async views.
+
+    Threads are enough here: hashlib releases GIL while computing PBKDF2,
+    so hashes run in parallel and event loop stays free meanwhile.
+    """
+    global async_executor
+    with async_executor_lock:
+        if async_executor is None:
+            workers: Optional[int] = getattr(
+                settings, "API_PASSWORD_HASH_WORKERS", None
+            )
+            async_executor = ThreadPoolExecutor(
+                max_workers=workers or os.cpu_count() or 1,
+                thread_name_prefix="password-hash",
+            )
+        return async_executor
+
+
+async def amake_password(password: str) -> str:
+    """Hash password in bounded executor without blocking event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_async_executor(), make_password, password)
+
+
+async def acheck_password(password: str, encoded: str) -> bool:
+    """Check password in bounded executor without blocking event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_async_executor(), check_password, password, encoded
+    )
+
+
+def must_update_password(encoded: str) -> bool:
+    """Check password hash is made by outdated hasher or its parameters."""
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
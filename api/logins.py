@@ -0,0 +1,107 @@
+"""Write-behind buffer for users last_login updates."""
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.db import connections, router
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from api.models import User
+
+logger = logging.getLogger(__name__)
+
+UPDATE_SQL: str = (
+    "UPDATE {table} SET last_login = v.last_login "
+    "FROM (VALUES {values}) AS v(id, last_login) WHERE {table}.id = v.id"
+)
+
+
+class LastLoginBuffer:
+    """Collect last_login updates in memory and flush them in bulk.
+
+    Pending updates are flushed every 'API_LAST_LOGIN_FLUSH_INTERVAL' seconds
+    by background thread, started lazily in every worker process, and at
+    interpreter exit. Zero interval disables the thread, so updates are
+    written only by explicit flush() calls.
+    """
+
+    default_interval: float = 5
+    batch_size: int = 1000
+
+    def __init__(self) -> None:
+        """Initialize empty buffer."""
+        self.lock = threading.Lock()
+        self.pending: Dict[int, datetime] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.stopped = threading.Event()
+        atexit.register(self.flush)
+
+    @property
+    def interval(self) -> float:
+        """Get flush interval in seconds from settings."""
+        return getattr(settings, "API_LAST_LOGIN_FLUSH_INTERVAL", self.default_interval)
+
+    def add(self, user_id: int, when: datetime) -> None:
+        """Remember login time of user to be written on next flush."""
+        with self.lock:
+            if when < self.pending.get(user_id, when):
+                return
+            self.pending[user_id] = when
+            if self.pid != os.getpid() and self.interval > 0:
+                self.pid = os.getpid()
+                self.thread = threading.Thread(
+                    target=self.run, name="last-login-flush", daemon=True
+                )
+                self.thread.start()
+
+    def run(self) -> None:
+        """Flush buffer periodically until stopped."""
+        while not self.stopped.wait(self.interval):
+            self.flush()
+            connections.close_all()
+
+    def flush(self) -> int:
+        """Write pending updates with one bulk UPDATE per batch."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        items: Iterator[Tuple[int, datetime]] = iter(pending.items())
+        updated: int = 0
+        while batch := list(islice(items, self.batch_size)):
+            try:
+                updated += self.write(batch)
+            except Exception:
+                logger.exception("Failed to flush %s last_login updates.", len(batch))
+                for user_id, when in batch:
+                    self.add(user_id, when)
+        return updated
+
+    def write(self, batch: List[Tuple[int, datetime]]) -> int:
+        """Execute bulk UPDATE for batch of (user id, login time) pairs."""
+        connection = connections[router.db_for_write(User)]
+        sql: str = UPDATE_SQL.format(
+            table=connection.ops.quote_name(User._meta.db_table),
+            values=", ".join(["(%s, %s::timestamptz)"] * len(batch)),
+        )
+        params: List = [value for pair in batch for value in pair]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+
+last_login_buffer = LastLoginBuffer()
+
+
+def record_login(user: User) -> None:
+    """Update last_login of user synchronously or through write-behind buffer."""
+    if getattr(settings, "API_LAST_LOGIN_WRITE_BEHIND", False):
+        last_login_buffer.add(user.pk, timezone.now())
+    elif api_settings.UPDATE_LAST_LOGIN:
+        update_last_login(None, user)
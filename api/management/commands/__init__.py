@@ -0,0 +1 @@
+"""Init module for api app management commands."""
@@ -0,0 +1,94 @@
+"""Management command benchmarking every api endpoint on large dataset."""
+import json
+import platform
+from typing import Any, Dict, List, Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from api.benchmarks import SCENARIOS, compare, get_host, measure, prepare
+
+
+class Command(BaseCommand):
+    """Report latency percentiles, queries and peak memory of api endpoints.
+
+    Rows are seeded in transaction, which is rolled back when done, so run
+    it against database you can afford to lock for the benchmark time.
+    """
+
+    help = "Report latency percentiles, queries and peak memory of api endpoints."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("--teams", type=int, default=1000, help="Teams to seed.")
+        parser.add_argument("--users", type=int, default=100000, help="Users to seed.")
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Timed requests per endpoint."
+        )
+        parser.add_argument(
+            "--only", nargs="*", default=None, help="Url names to benchmark."
+        )
+        parser.add_argument(
+            "--warm",
+            action="store_true",
+            help="Keep response and token caches between requests.",
+        )
+        parser.add_argument("--output", help="Path to write json report to.")
+        parser.add_argument("--baseline", help="Path to json report to compare to.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative slowdown against baseline.",
+        )
+
+    def handle(self, *args, **options):
+        """Seed data, measure endpoints, write report and compare to baseline."""
+        if options["requests"] < 1:
+            raise CommandError("At least one timed request is needed.")
+        only: Optional[List[str]] = options["only"]
+        scenarios = [
+            scenario
+            for scenario in SCENARIOS
+            if only is None or scenario.url_name in only
+        ]
+        report: Dict[str, Any] = {
+            "meta": {
+                "teams": options["teams"],
+                "users": options["users"],
+                "requests": options["requests"],
+                "warm": options["warm"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "routes": {},
+        }
+        client = Client(HTTP_HOST=get_host())
+        # Replicas can't see rows seeded in transaction, so reads stay on primary.
+        with override_settings(API_DATABASE_REPLICAS=[]), transaction.atomic():
+            dataset = prepare(client, options["teams"], options["users"])
+            for scenario in scenarios:
+                result: Dict[str, Any] = measure(
+                    client, scenario, dataset, options["requests"], options["warm"]
+                )
+                report["routes"][scenario.name] = result
+                self.stdout.write(
+                    f"{scenario.name}: p50 {result['p50_ms']} ms, "
+                    f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms, "
+                    f"{result['queries']} queries, "
+                    f"peak {result['peak_memory_kb']} KB, "
+                    f"statuses {result['statuses']}"
+                )
+            transaction.set_rollback(True)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline:
+                regressions = compare(report, json.load(baseline), options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions:\n" + "\n".join(regressions))
+            self.stdout.write("No regressions against baseline.")
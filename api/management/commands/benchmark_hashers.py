@@ -0,0 +1,60 @@
+"""Management command measuring password hashers throughput."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+def measure(algorithm: str, seconds: float) -> float:
+    """Count hashes per second computed by hasher on one core."""
+    hasher = next(item for item in get_hashers() if item.algorithm == algorithm)
+    count: int = 0
+    started: float = time.perf_counter()
+    deadline: float = started + seconds
+    while (now := time.perf_counter()) < deadline or not count:
+        hasher.encode("benchmark-password", hasher.salt())
+        count += 1
+    return count / (now - started)
+
+
+class Command(BaseCommand):
+    """Report hashes per second per core for configured PASSWORD_HASHERS."""
+
+    help = "Report hashes per second per core for configured PASSWORD_HASHERS."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--seconds", type=float, default=2.0, help="Measuring time per run."
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes hashing in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        """Measure every hasher on one core and on all processes."""
+        seconds: float = options["seconds"]
+        processes: int = options["processes"]
+        with ProcessPoolExecutor(processes, initializer=django.setup) as executor:
+            for hasher in get_hashers():
+                try:
+                    single: float = measure(hasher.algorithm, seconds)
+                except ValueError as error:
+                    # Hashers raise it when their library isn't installed.
+                    self.stdout.write(f"{hasher.algorithm}: unavailable ({error})")
+                    continue
+                rates = executor.map(
+                    measure, [hasher.algorithm] * processes, [seconds] * processes
+                )
+                total: float = sum(rates)
+                self.stdout.write(
+                    f"{hasher.algorithm}: {single:.1f} hashes/s on one core, "
+                    f"{total:.1f} hashes/s on {processes} processes "
+                    f"({total / processes:.1f} per core)"
+                )
@@ -0,0 +1,80 @@
+"""Management command comparing list serialization paths throughput."""
+import time
+from typing import Callable, Dict, List
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Team, User
+from api.reads import get_fast_columns, serialize_rows
+from api.renderers import FastJSONRenderer
+from api.serializers import UserSerializer
+
+
+def measure(render: Callable[[], bytes], repeat: int) -> float:
+    """Get best time of rendering in seconds out of repeated runs."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    """Report users list rendering rows per second for serializer and fast path."""
+
+    help = "Report users list rows per second for serializer and fast path."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--rows", type=int, default=10000, help="Number of users to render."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of runs, best is taken."
+        )
+
+    def handle(self, *args, **options):
+        """Seed users in rolled back transaction and render them both ways."""
+        rows: int = options["rows"]
+        repeat: int = options["repeat"]
+        with transaction.atomic():
+            teams: List[Team] = Team.objects.bulk_create(
+                Team(name=f"Benchmark team {number}")
+                for number in range(max(rows // 50, 1))
+            )
+            User.objects.bulk_create(
+                (
+                    User(
+                        email=f"benchmark{number}@example.com",
+                        first_name=f"First{number}",
+                        last_name=f"Last{number}",
+                        team=teams[number % len(teams)],
+                        password="!",
+                    )
+                    for number in range(rows)
+                ),
+                batch_size=1000,
+            )
+            queryset = User.objects.order_by("last_name", "id")
+            columns: Dict[str, str] = get_fast_columns(UserSerializer(), User)
+            renderers: Dict[str, Callable[[], bytes]] = {
+                "serializer": lambda: JSONRenderer().render(
+                    UserSerializer(queryset.all(), many=True).data
+                ),
+                "fast path": lambda: FastJSONRenderer().render(
+                    serialize_rows(queryset.values_list(*columns.values()), columns)
+                ),
+            }
+            total: int = queryset.count()
+            identical: bool = len({render() for render in renderers.values()}) == 1
+            timings: Dict[str, float] = {
+                name: measure(render, repeat) for name, render in renderers.items()
+            }
+            transaction.set_rollback(True)
+        for name, seconds in timings.items():
+            self.stdout.write(f"{name}: {total / seconds:.0f} rows/s")
+        speedup: float = timings["serializer"] / timings["fast path"]
+        self.stdout.write(f"speedup: {speedup:.1f}x, identical output: {identical}")
@@ -0,0 +1,57 @@
+"""Management command measuring per-request overhead of instrumentation."""
+import time
+from typing import Callable, Dict
+
+from django.core.management.base import BaseCommand
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from api.metrics import registry
+from api.middleware import MetricsMiddleware, ServerTimingMiddleware
+
+
+def respond(request: HttpRequest) -> HttpResponse:
+    """Return empty response, standing for view."""
+    return HttpResponse()
+
+
+def measure(handler: Callable, request: HttpRequest, requests: int) -> float:
+    """Get average time of handling request in microseconds."""
+    started: float = time.perf_counter()
+    for _ in range(requests):
+        handler(request)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+class Command(BaseCommand):
+    """Report time metrics and timing middlewares add to each request."""
+
+    help = "Report time metrics and timing middlewares add to each request."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--requests", type=int, default=100000, help="Requests per handler."
+        )
+
+    def handle(self, *args, **options):
+        """Measure bare handler and handler wrapped by middlewares."""
+        requests: int = options["requests"]
+        request: HttpRequest = RequestFactory().get("/user/")
+        request.resolver_match = resolve("/user/")
+        handlers: Dict[str, Callable] = {
+            "metrics": MetricsMiddleware(respond),
+            "server timing": ServerTimingMiddleware(respond),
+            "both": ServerTimingMiddleware(MetricsMiddleware(respond)),
+        }
+        measure(respond, request, min(requests, 1000))
+        bare: float = measure(respond, request, requests)
+        self.stdout.write(f"bare: {bare:.2f} us per request")
+        for name, handler in handlers.items():
+            measure(handler, request, min(requests, 1000))
+            took: float = measure(handler, request, requests)
+            self.stdout.write(
+                f"{name}: {took:.2f} us per request, {took - bare:.2f} us overhead"
+            )
+        registry.clear()
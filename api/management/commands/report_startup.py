@@ -0,0 +1,162 @@
+"""Management command reporting import time and memory of project startup."""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from typing import Dict, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Runs in fresh interpreter, so modules imported by this process don't count.
+# Import statements are wrapped to charge memory allocated while importing
+# to new module, minus memory charged to modules it imports itself.
+STARTUP_SCRIPT: str = """
+import builtins, json, os, resource, sys, time, tracemalloc
+from importlib import import_module
+memory, nested = {}, []
+original_import = builtins.__import__
+
+def measuring_import(*args, **kwargs):
+    before, start = set(sys.modules), tracemalloc.get_traced_memory()[0]
+    nested.append(0)
+    try:
+        return original_import(*args, **kwargs)
+    finally:
+        children = nested.pop()
+        new = sys.modules.keys() - before
+        if new:
+            size = tracemalloc.get_traced_memory()[0] - start
+            name = max(new, key=len)
+            memory[name] = memory.get(name, 0) + size - children
+            if nested:
+                nested[-1] += size
+
+def get_peak_rss_kb():
+    # ru_maxrss survives exec on Linux, so it may be peak of parent process.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+if os.environ.get("REPORT_TRACE_MEMORY"):
+    tracemalloc.start()
+    builtins.__import__ = measuring_import
+started = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+import_module(settings.ROOT_URLCONF)
+seconds = time.perf_counter() - started
+builtins.__import__ = original_import
+print(json.dumps({
+    "seconds": seconds,
+    "max_rss_kb": get_peak_rss_kb(),
+    "docs_enabled": settings.API_DOCS_ENABLED,
+    "allocated": tracemalloc.get_traced_memory()[0],
+    "memory": memory,
+}))
+"""
+
+
+def get_package(name: str, depth: int) -> str:
+    """Cut dotted module name to given depth."""
+    return ".".join(name.split(".")[:depth])
+
+
+def parse_importtime(output: str, depth: int) -> Tuple[Counter, int]:
+    """Sum self import time in microseconds by package and get total."""
+    packages: Counter = Counter()
+    total: int = 0
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[get_package(name, depth)] += int(self_us)
+        if not indent:
+            total += int(cumulative_us)
+    return packages, total
+
+
+class Command(BaseCommand):
+    """Report import time and memory by package of settings and url conf load."""
+
+    help = "Report import time and memory by package of settings and urls load."
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of packages to list."
+        )
+        parser.add_argument(
+            "--depth", type=int, default=1, help="Dotted name parts of package."
+        )
+        parser.add_argument(
+            "--no-docs",
+            action="store_true",
+            help="Measure lean startup with API_DOCS_ENABLED off.",
+        )
+        parser.add_argument("--json", action="store_true", help="Write report as json.")
+
+    def run_startup(self, env: Dict[str, str], *flags: str) -> Tuple[Dict, str]:
+        """Run startup in fresh interpreter, get its report and stderr."""
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", STARTUP_SCRIPT],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Startup failed:\n{result.stderr}")
+        return json.loads(result.stdout.splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        """Measure startup twice, for import times and for allocations."""
+        depth: int = options["depth"]
+        top: int = options["top"]
+        env: Dict[str, str] = dict(os.environ)
+        if options["no_docs"]:
+            env["API_DOCS_ENABLED"] = "False"
+        timing, importtime = self.run_startup(env, "-X", "importtime")
+        traced, _ = self.run_startup({**env, "REPORT_TRACE_MEMORY": "1"})
+        import_us, import_total = parse_importtime(importtime, depth)
+        memory: Counter = Counter()
+        for name, size in traced["memory"].items():
+            memory[get_package(name, depth)] += size
+        report: Dict = {
+            "startup_ms": round(timing["seconds"] * 1000, 1),
+            "imports_ms": round(import_total / 1000, 1),
+            "max_rss_kb": timing["max_rss_kb"],
+            "allocated_kb": round(traced["allocated"] / 1024, 1),
+            "docs_enabled": timing["docs_enabled"],
+            "import_ms": {
+                name: round(value / 1000, 1)
+                for name, value in import_us.most_common(top)
+            },
+            "memory_kb": {
+                name: round(value / 1024, 1) for name, value in memory.most_common(top)
+            },
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(
+            f"startup: {report['startup_ms']} ms, imports: {report['imports_ms']} ms, "
+            f"max rss: {report['max_rss_kb']} KB, "
+            f"allocated: {report['allocated_kb']} KB, "
+            f"docs enabled: {report['docs_enabled']}"
+        )
+        self.stdout.write("import time by package, ms:")
+        for name, value in report["import_ms"].items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write("allocated memory by package, KB:")
+        for name, value in report["memory_kb"].items():
+            self.stdout.write(f"  {name}: {value}")
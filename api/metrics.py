@@ -0,0 +1,334 @@
+"""Process metrics registry in Prometheus text format for api app."""
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[str, ...]
+Snapshot = Dict[str, Dict[Labels, List[float]]]
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+QUERIES_BUCKETS: Tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100)
+# Name: (type, help, label names, histogram buckets).
+METRICS: Dict[str, Tuple[str, str, Labels, Tuple[float, ...]]] = {
+    "api_requests_total": (
+        "counter",
+        "Requests by view, method and status code.",
+        ("view", "method", "status"),
+        (),
+    ),
+    "api_request_duration_seconds": (
+        "histogram",
+        "Request latency by view and method.",
+        ("view", "method"),
+        LATENCY_BUCKETS,
+    ),
+    "api_request_queries": (
+        "histogram",
+        "SQL queries per request by view and method.",
+        ("view", "method"),
+        QUERIES_BUCKETS,
+    ),
+    "api_request_db_duration_seconds": (
+        "histogram",
+        "SQL time per request by view and method.",
+        ("view", "method"),
+        LATENCY_BUCKETS,
+    ),
+    "api_admission_total": (
+        "counter",
+        "Admission outcomes of limited requests by route class.",
+        ("route_class", "outcome"),
+        (),
+    ),
+}
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+# Other methods are labeled 'other', so clients can't add series at will.
+METHODS: FrozenSet[str] = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE")
+)
+DEFAULT_ALLOWED_IPS: Sequence[str] = ()
+
+
+def escape(value: str) -> str:
+    """Escape label value for text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Format label pairs in braces."""
+    pairs: str = ",".join(
+        f'{name}="{escape(value)}"' for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+def format_value(value: float) -> str:
+    """Format sample value, integers without fraction."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def merge(snapshots: Iterable[Snapshot]) -> Snapshot:
+    """Sum values of same metrics and labels from several processes."""
+    merged: Snapshot = {name: {} for name in METRICS}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            if name not in merged:
+                continue
+            for labels, values in series.items():
+                current: Optional[List[float]] = merged[name].get(labels)
+                if current is None:
+                    merged[name][labels] = list(values)
+                else:
+                    merged[name][labels] = [a + b for a, b in zip(current, values)]
+    return merged
+
+
+def render(snapshot: Snapshot) -> str:
+    """Render metrics in Prometheus text exposition format."""
+    lines: List[str] = []
+    for name, (kind, help_text, label_names, buckets) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, values in sorted(snapshot.get(name, {}).items()):
+            if kind == "counter":
+                lines.append(
+                    f"{name}{format_labels(label_names, labels)} "
+                    f"{format_value(values[0])}"
+                )
+                continue
+            cumulative: float = 0
+            bounds: List[str] = [format_value(bound) for bound in buckets] + ["+Inf"]
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket"
+                    f"{format_labels((*label_names, 'le'), (*labels, bound))} "
+                    f"{format_value(cumulative)}"
+                )
+            lines.append(
+                f"{name}_sum{format_labels(label_names, labels)} "
+                f"{format_value(values[-1])}"
+            )
+            lines.append(
+                f"{name}_count{format_labels(label_names, labels)} "
+                f"{format_value(cumulative)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def is_running(pid: int) -> bool:
+    """Check process with given id exists on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_snapshot(path: str) -> Optional[Snapshot]:
+    """Read values written by process, None if file is gone or partial."""
+    try:
+        with open(path) as source:
+            data: Dict[str, List] = json.load(source)
+    except (OSError, ValueError):
+        return None
+    return {
+        name: {tuple(labels): values for labels, values in series}
+        for name, series in data.items()
+    }
+
+
+class MetricsRegistry:
+    """Thread safe counters and histograms of current process.
+
+    Histogram series hold count per bucket, +Inf included, followed by sum.
+    With 'API_METRICS_DIR' set, every process writes its values to own file
+    there every 'API_METRICS_FLUSH_INTERVAL' seconds and at exit, so any
+    worker can serve sum of all of them. Values of exited processes are
+    taken over by collecting process and their files removed, so sums stay
+    monotonic. Processes must share one host to tell exited ones apart.
+    """
+
+    default_interval: float = 5
+
+    def __init__(self) -> None:
+        """Initialize empty series."""
+        self.lock = threading.Lock()
+        self.series: Snapshot = {name: {} for name in METRICS}
+        self.pid: Optional[int] = None
+        self.path: Optional[str] = None
+        self.stopped = threading.Event()
+        atexit.register(self.flush)
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Get directory shared by worker processes from settings."""
+        return getattr(settings, "API_METRICS_DIR", None)
+
+    @property
+    def interval(self) -> float:
+        """Get flush interval in seconds from settings."""
+        return getattr(settings, "API_METRICS_FLUSH_INTERVAL", self.default_interval)
+
+    def start(self) -> None:
+        """Forget values inherited from parent process and start flushing.
+
+        Lock must be held by caller.
+        """
+        self.pid = os.getpid()
+        self.series = {name: {} for name in METRICS}
+        self.path = None
+        if self.directory:
+            self.path = os.path.join(
+                self.directory, f"metrics_{self.pid}_{time.time_ns()}.json"
+            )
+            if self.interval > 0:
+                threading.Thread(
+                    target=self.run, name="metrics-flush", daemon=True
+                ).start()
+
+    def add(self, samples: Iterable[Tuple[str, Labels, float]]) -> None:
+        """Increment counters and add values to histograms under one lock."""
+        with self.lock:
+            if self.pid != os.getpid():
+                self.start()
+            for name, labels, value in samples:
+                buckets: Tuple[float, ...] = METRICS[name][3]
+                series: Dict[Labels, List[float]] = self.series[name]
+                if METRICS[name][0] == "counter":
+                    series.setdefault(labels, [0])[0] += value
+                    continue
+                values: Optional[List[float]] = series.get(labels)
+                if values is None:
+                    values = series[labels] = [0] * (len(buckets) + 2)
+                values[bisect_left(buckets, value)] += 1
+                values[-1] += value
+
+    def snapshot(self) -> Snapshot:
+        """Get copy of values of current process."""
+        with self.lock:
+            if self.pid != os.getpid():
+                return {name: {} for name in METRICS}
+            return {
+                name: {labels: list(values) for labels, values in series.items()}
+                for name, series in self.series.items()
+            }
+
+    def run(self) -> None:
+        """Flush values periodically until stopped."""
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write values of current process to its file atomically."""
+        path: Optional[str] = self.path
+        if path is None or self.pid != os.getpid():
+            return
+        data: Dict[str, List] = {
+            name: [[list(labels), values] for labels, values in series.items()]
+            for name, series in self.snapshot().items()
+        }
+        try:
+            with open(f"{path}.tmp", "w") as output:
+                json.dump(data, output)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            logger.exception("Failed to write metrics to %s.", path)
+
+    def take_over(self, paths: Iterable[str]) -> None:
+        """Add values of exited processes to this one and remove their files.
+
+        Files are claimed by renaming, so only one process takes them over.
+        """
+        claimed: List[str] = []
+        for path in paths:
+            try:
+                pid: int = int(os.path.basename(path).split("_")[1])
+            except (IndexError, ValueError):
+                continue
+            if pid == os.getpid() or is_running(pid):
+                continue
+            try:
+                os.rename(path, f"{path}.{os.getpid()}.claimed")
+            except OSError:
+                continue
+            claimed.append(f"{path}.{os.getpid()}.claimed")
+        if not claimed:
+            return
+        snapshots: List[Snapshot] = [
+            snapshot for snapshot in map(read_snapshot, claimed) if snapshot
+        ]
+        with self.lock:
+            if self.pid != os.getpid():
+                self.start()
+            self.series = merge([self.series, *snapshots])
+        self.flush()
+        for path in claimed:
+            os.remove(path)
+
+    def collect(self) -> Snapshot:
+        """Get values of all processes sharing directory, or of this one."""
+        if not self.directory:
+            return self.snapshot()
+        pattern: str = os.path.join(self.directory, "metrics_*.json")
+        self.take_over(glob.glob(pattern))
+        self.flush()
+        snapshots: List[Snapshot] = [
+            snapshot for snapshot in map(read_snapshot, glob.glob(pattern)) if snapshot
+        ]
+        if self.path is None:
+            snapshots.append(self.snapshot())
+        return merge(snapshots)
+
+    def clear(self) -> None:
+        """Remove all values of current process."""
+        with self.lock:
+            self.series = {name: {} for name in METRICS}
+
+
+registry = MetricsRegistry()
+
+
+def observe_request(
+    view: str, method: str, status: int, seconds: float, queries: int, db_seconds: float
+) -> None:
+    """Record finished request in registry."""
+    if method not in METHODS:
+        method = "other"
+    labels: Labels = (view, method)
+    registry.add(
+        (
+            ("api_requests_total", (view, method, str(status)), 1),
+            ("api_request_duration_seconds", labels, seconds),
+            ("api_request_queries", labels, queries),
+            ("api_request_db_duration_seconds", labels, db_seconds),
+        )
+    )
+
+
+def get_allowed_ips() -> Sequence[str]:
+    """Get addresses metrics are served to without staff token."""
+    return getattr(settings, "API_METRICS_ALLOWED_IPS", DEFAULT_ALLOWED_IPS)
@@ -0,0 +1,388 @@
+"""Middleware classes for api app."""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.urls import Resolver404, resolve
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+
+from api.admission import (
+    ADMITTED,
+    QUEUED,
+    REJECTED,
+    TIMEOUT,
+    ConcurrencyLimiter,
+    get_limiter,
+    get_retry_after,
+    get_route_class,
+)
+from api.metrics import observe_request, registry
+from api.routers import get_replicas, get_sticky_seconds, read_from_replica
+from api.timing import RequestTimings, current_timings, get_server_timing_mode
+
+PRIMARY_KEY: str = "api:primary:{client}"
+BUSY_MESSAGE: str = "Server is busy, retry later."
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe requests read from replicas with read-your-writes stickiness.
+
+    After client sends unsafe request, its reads stick to primary for
+    'API_REPLICA_STICKY_SECONDS', which should exceed replication lag.
+    Clients are told apart by Authorization header or by address, pins are
+    kept in shared cache so they hold across worker processes.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response) -> None:
+        """Store next handler and adapt to its mode."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def get_primary_key(self, request: HttpRequest) -> str:
+        """Build cache key of client primary pin."""
+        client: str = request.META.get("HTTP_AUTHORIZATION") or request.META.get(
+            "REMOTE_ADDR", ""
+        )
+        digest: str = hashlib.sha256(client.encode()).hexdigest()
+        return PRIMARY_KEY.format(client=digest)
+
+    def __call__(self, request: HttpRequest):
+        """Route request reads and pin client to primary after write."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+        key: str = self.get_primary_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            cache.set(key, True, get_sticky_seconds())
+            return response
+        token = read_from_replica.set(not cache.get(key, False))
+        try:
+            return self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+
+    async def __acall__(self, request: HttpRequest):
+        """Route request reads and pin client to primary after write."""
+        if not get_replicas():
+            return await self.get_response(request)
+        key: str = self.get_primary_key(request)
+        if request.method not in SAFE_METHODS:
+            response = await self.get_response(request)
+            await cache.aset(key, True, get_sticky_seconds())
+            return response
+        token = read_from_replica.set(not await cache.aget(key, False))
+        try:
+            return await self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+
+
+class ServerTimingMiddleware:
+    """Measure SQL, auth, serializer and render time of requests.
+
+    Timings go to Server-Timing header for everyone or for staff users only,
+    by 'API_SERVER_TIMING'. Requests over 'API_SLOW_REQUEST_MS' or
+    'API_SLOW_REQUEST_QUERIES' are logged with repeated statements, which
+    usually point to N+1 queries.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response) -> None:
+        """Store next handler and adapt to its mode."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def process_template_response(self, request: HttpRequest, response):
+        """Measure rendering of response, which happens right after this."""
+        timings = current_timings.get()
+        if timings is not None:
+            started: float = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timings.add("render", time.perf_counter() - started)
+            )
+        return response
+
+    def is_staff(self, request: HttpRequest) -> bool:
+        """Check request is made by staff user, loading session user if lazy."""
+        return getattr(getattr(request, "user", None), "is_staff", False)
+
+    async def ais_staff(self, request: HttpRequest) -> bool:
+        """Check request is made by staff user, loading session user in thread."""
+        user = getattr(request, "user", None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            return await sync_to_async(self.is_staff)(request)
+        return self.is_staff(request)
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timings: RequestTimings,
+        staff: bool,
+    ) -> None:
+        """Add Server-Timing header if allowed and log slow request."""
+        timings.finish()
+        mode: str = get_server_timing_mode()
+        if mode == "all" or (mode == "staff" and staff):
+            response["Server-Timing"] = timings.get_header()
+        if timings.is_slow():
+            repeated: str = "".join(
+                f"\n  {count}x {sql}"
+                for sql, count in timings.get_repeated_statements()
+            )
+            logger.warning(
+                "Slow request %s %s: %.1f ms, %s queries in %.1f ms.%s",
+                request.method,
+                request.get_full_path(),
+                timings.total * 1000,
+                timings.queries,
+                timings.query_time * 1000,
+                f" Repeated queries:{repeated}" if repeated else "",
+            )
+
+    def __call__(self, request: HttpRequest):
+        """Measure request and report its timings."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        staff: bool = get_server_timing_mode() == "staff" and self.is_staff(request)
+        self.report(request, response, timings, staff)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        """Measure request and report its timings."""
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        # Lazy session user can't be loaded in event loop.
+        staff: bool = get_server_timing_mode() == "staff" and (
+            await self.ais_staff(request)
+        )
+        self.report(request, response, timings, staff)
+        return response
+
+
+class MetricsMiddleware:
+    """Record count, latency, status and SQL queries of requests by view.
+
+    Views are labelled by resolved url name, namespace included. Queries are
+    counted by request timings, started here unless ServerTimingMiddleware
+    measures the request already.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response) -> None:
+        """Store next handler and adapt to its mode."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def record(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timings: RequestTimings,
+        started: float,
+        queries: Tuple[int, float],
+    ) -> None:
+        """Add finished request to metrics registry."""
+        match = getattr(request, "resolver_match", None)
+        observe_request(
+            match.view_name if match is not None else "unresolved",
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            timings.queries - queries[0],
+            timings.query_time - queries[1],
+        )
+
+    def __call__(self, request: HttpRequest):
+        """Measure request and record it."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = current_timings.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = current_timings.set(timings)
+        queries: Tuple[int, float] = (timings.queries, timings.query_time)
+        started: float = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        self.record(request, response, timings, started, queries)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        """Measure request and record it."""
+        timings = current_timings.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = current_timings.set(timings)
+        queries: Tuple[int, float] = (timings.queries, timings.query_time)
+        started: float = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        self.record(request, response, timings, started, queries)
+        return response
+
+
+class ReleasingContent:
+    """Streaming content freeing admission slot when response is closed."""
+
+    def __init__(self, content, limiter: ConcurrencyLimiter) -> None:
+        """Wrap content iterator."""
+        self.content = content
+        self.limiter = limiter
+        self.released: bool = False
+
+    def __iter__(self):
+        """Iterate over wrapped content."""
+        return iter(self.content)
+
+    def close(self) -> None:
+        """Release slot once."""
+        if not self.released:
+            self.released = True
+            self.limiter.release()
+
+
+class AdmissionControlMiddleware:
+    """Limit concurrent requests per route class, shedding load beyond queue.
+
+    Views are grouped into classes by 'API_ADMISSION_CLASSES', each with
+    'limit' of concurrent requests, 'queue' of waiting ones and 'timeout'
+    of waiting. Requests beyond get 503 with Retry-After at once, so slow
+    password hashing or large lists can't take every worker thread, while
+    views outside classes, like cheap reads, aren't limited.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response) -> None:
+        """Store next handler and adapt to its mode."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def get_limiter(self, request: HttpRequest) -> Optional[ConcurrencyLimiter]:
+        """Resolve request view and get limiter of its route class."""
+        try:
+            request.resolver_match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        route_class: Optional[str] = get_route_class(request.resolver_match.view_name)
+        if route_class is None:
+            return None
+        request.route_class = route_class
+        return get_limiter(route_class)
+
+    def admit(self, request: HttpRequest, outcome: str) -> Optional[HttpResponse]:
+        """Count admission outcome, get 503 response if request isn't served."""
+        registry.add((("api_admission_total", (request.route_class, outcome), 1),))
+        if outcome not in (REJECTED, TIMEOUT):
+            return None
+        response = JsonResponse({"detail": BUSY_MESSAGE}, status=503)
+        response["Retry-After"] = str(get_retry_after())
+        return response
+
+    def release(self, response: HttpResponse, limiter: ConcurrencyLimiter) -> None:
+        """Free slot now, or when sync streaming response is closed."""
+        if response.streaming and not response.is_async:
+            response.streaming_content = ReleasingContent(
+                response.streaming_content, limiter
+            )
+        else:
+            limiter.release()
+
+    async def wait(self, limiter: ConcurrencyLimiter) -> str:
+        """Wait in queue in thread, freeing slot it takes after cancellation.
+
+        Waiting thread can't be interrupted, so cancelled request lets it
+        finish and releases slot it may still get.
+        """
+        waiting = asyncio.ensure_future(
+            sync_to_async(limiter.acquire, thread_sensitive=False)()
+        )
+        try:
+            return await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+
+            def release(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    if future.result() in (ADMITTED, QUEUED):
+                        limiter.release()
+
+            waiting.add_done_callback(release)
+            raise
+
+    def __call__(self, request: HttpRequest):
+        """Serve request when its route class has free slot or queue."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        limiter: Optional[ConcurrencyLimiter] = self.get_limiter(request)
+        if limiter is None:
+            return self.get_response(request)
+        rejection = self.admit(request, limiter.acquire())
+        if rejection is not None:
+            return rejection
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            limiter.release()
+            raise
+        self.release(response, limiter)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        """Serve request when its route class has free slot or queue."""
+        limiter: Optional[ConcurrencyLimiter] = self.get_limiter(request)
+        if limiter is None:
+            return await self.get_response(request)
+        outcome: Optional[str] = limiter.acquire(wait=False)
+        if outcome is None:
+            outcome = await self.wait(limiter)
+        rejection = self.admit(request, outcome)
+        if rejection is not None:
+            return rejection
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            limiter.release()
+            raise
+        self.release(response, limiter)
+        return response
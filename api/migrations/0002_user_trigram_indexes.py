@@ -0,0 +1,34 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:38
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    models.Func(
+                        "email",
+                        "first_name",
+                        "last_name",
+                        template="(%(expressions)s)",
+                        arg_joiner=" || ' ' || ",
+                        output_field=models.TextField(),
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="user_search_trgm_idx",
+            ),
+        ),
+    ]
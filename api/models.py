@@ -1,15 +1,24 @@
 """Models for api app."""
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from api.search import get_search_document
+
 
 class Team(models.Model):
     """Team model."""
 
     name = models.CharField(max_length=50, verbose_name="Team name")
 
+    class Meta:
+        """Class Meta for Team model."""
+
+        indexes = [models.Index(fields=["name", "id"], name="team_name_id_idx")]
+
     def __str__(self) -> str:
         """Represent model."""
         return str(self.name)
@@ -55,10 +64,30 @@ class User(AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
     team = models.ForeignKey(
-        Team, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Team"
+        Team,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Team",
+        db_index=False,  # Covered by user_team_last_name_id_idx.
     )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        """Class Meta for User model."""
+
+        indexes = [
+            models.Index(fields=["last_name", "id"], name="user_last_name_id_idx"),
+            models.Index(
+                fields=["team", "last_name", "id"], name="user_team_last_name_id_idx"
+            ),
+            models.Index(Upper("email"), name="user_email_upper_idx"),
+            GinIndex(
+                OpClass(get_search_document(), name="gin_trgm_ops"),
+                name="user_search_trgm_idx",
+            ),
+        ]
@@ -0,0 +1,162 @@
+"""Pagination classes for api app."""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Position = Tuple[Any, int]
+
+
+class KeysetPagination(BasePagination):
+    """Opt-in keyset pagination over an indexed (ordering key, id) pair.
+
+    Pagination is applied only when 'cursor' or 'page_size' query parameter
+    is given, otherwise the whole list is returned as before. Pages are
+    selected with a range condition on the view's 'keyset_ordering', so the
+    cost of a page doesn't depend on how deep the client is.
+    """
+
+    cursor_query_param: str = "cursor"
+    page_size_query_param: str = "page_size"
+    default_page_size: int = 100
+    default_max_page_size: int = 1000
+    default_ordering: Tuple[str, str] = ("id", "id")
+    invalid_cursor_message: str = "Invalid cursor."
+
+    def is_requested(self, request: Request) -> bool:
+        """Check whether client asked for paginated response."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request: Request) -> int:
+        """Get page size from query params limited by max page size."""
+        page_size = getattr(settings, "API_PAGE_SIZE", self.default_page_size)
+        max_page_size = getattr(
+            settings, "API_MAX_PAGE_SIZE", self.default_max_page_size
+        )
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            requested = page_size
+        if requested <= 0:
+            requested = page_size
+        return min(requested, max_page_size)
+
+    def encode_cursor(self, position: Position, reverse: bool) -> str:
+        """Encode position and direction into opaque cursor."""
+        payload = json.dumps([int(reverse), *position], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request: Request) -> Tuple[Optional[Position], bool]:
+        """Decode cursor from query params into position and direction."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            reverse, key, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(pk, int) or reverse not in (0, 1):
+            raise NotFound(self.invalid_cursor_message)
+        return (key, pk), bool(reverse)
+
+    def get_keyset_filter(self, position: Position, reverse: bool) -> Q:
+        """Build range condition placing rows after (or before) position.
+
+        The outer '>=' condition on ordering key lets database start an index
+        range scan right at the position instead of filtering from the start.
+        """
+        key_field, pk_field = self.ordering
+        key, pk = position
+        operator = "lt" if reverse else "gt"
+        return Q(**{f"{key_field}__{operator}e": key}) & (
+            Q(**{f"{key_field}__{operator}": key})
+            | Q(**{f"{pk_field}__{operator}": pk})
+        )
+
+    def get_page_queryset(
+        self, queryset: QuerySet, position: Optional[Position], reverse: bool
+    ) -> QuerySet:
+        """Get lazy queryset for requested page with one extra lookahead row."""
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+        ordering = [f"-{field}" if reverse else field for field in self.ordering]
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def get_position(self, row: Any) -> Position:
+        """Get (ordering key, id) pair of model instance or values row.
+
+        Tuple rows of values_list() must start with ordering columns.
+        """
+        if isinstance(row, tuple):
+            return row[0], row[1]
+        if isinstance(row, dict):
+            return row[self.ordering[0]], row[self.ordering[1]]
+        return getattr(row, self.ordering[0]), getattr(row, self.ordering[1])
+
+    def build_page(
+        self, rows: Sequence[Any], position: Optional[Position], reverse: bool
+    ) -> List[Any]:
+        """Trim lookahead row and prepare next and previous cursors."""
+        has_more = len(rows) > self.page_size
+        page = list(rows[: self.page_size])
+        if reverse:
+            page.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        self.next_position = self.get_position(page[-1]) if page and has_next else None
+        self.previous_position = (
+            self.get_position(page[0]) if page and has_previous else None
+        )
+        return page
+
+    def prepare(self, request: Request, view=None) -> Tuple[Optional[Position], bool]:
+        """Store request state and decode cursor before paginating."""
+        self.request = request
+        self.ordering = getattr(view, "keyset_ordering", self.default_ordering)
+        self.page_size = self.get_page_size(request)
+        return self.decode_cursor(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate queryset if pagination is requested by client."""
+        if not self.is_requested(request):
+            return None
+        position, reverse = self.prepare(request, view)
+        rows = list(self.get_page_queryset(queryset, position, reverse))
+        return self.build_page(rows, position, reverse)
+
+    def get_link(self, position: Optional[Position], reverse: bool) -> Optional[str]:
+        """Build absolute url with cursor for given position."""
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position, reverse)
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        """Get link to the next page."""
+        return self.get_link(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """Get link to the previous page."""
+        return self.get_link(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        """Wrap page data with next and previous links."""
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
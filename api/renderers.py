@@ -0,0 +1,38 @@
+"""Renderers for api app."""
+from typing import Any, Optional
+
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+# Encoder keeps no state between calls, so one is shared by all requests.
+ENCODER = JSONRenderer.encoder_class(
+    ensure_ascii=JSONRenderer.ensure_ascii,
+    allow_nan=not JSONRenderer.strict,
+    separators=SHORT_SEPARATORS if JSONRenderer.compact else LONG_SEPARATORS,
+    check_circular=False,
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer producing same bytes as JSONRenderer with less overhead.
+
+    Module level encoder is used instead of one built per render, circular
+    references check is skipped, serializers output is a tree. Indented
+    output, requested by browsable api or 'indent' param, is left to parent.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict] = None,
+    ) -> bytes:
+        """Render data into JSON bytes, escaping line separators like parent."""
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        content: str = ENCODER.encode(data)
+        return (
+            content.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+        )
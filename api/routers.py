@@ -0,0 +1,52 @@
+"""Database routers for api app."""
+import random
+from contextvars import ContextVar
+from typing import List
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+DEFAULT_STICKY_SECONDS: float = 5
+
+read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+def get_replicas() -> List[str]:
+    """Get aliases of read replicas from settings."""
+    return list(getattr(settings, "API_DATABASE_REPLICAS", []))
+
+
+def get_sticky_seconds() -> float:
+    """Get time client reads from primary after write, exceeding replica lag."""
+    return getattr(settings, "API_REPLICA_STICKY_SECONDS", DEFAULT_STICKY_SECONDS)
+
+
+def is_reading_replica() -> bool:
+    """Check whether reads of current request go to replica."""
+    return read_from_replica.get() and bool(get_replicas())
+
+
+class ReplicaRouter:
+    """Route reads to random replica when allowed by request, writes to primary.
+
+    Reads go to replica only inside requests marked by ReplicaRoutingMiddleware,
+    so management commands, signal receivers and writing requests always see
+    primary data.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Choose replica for reads of safe requests."""
+        if is_reading_replica():
+            return random.choice(get_replicas())
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """Send all writes to primary, even of objects read from replica."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between objects of primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -1,74 +1,13 @@
-"""Schemas module for 'api' app."""
-from drf_yasg import openapi
-
-swagger_user_register_schema = openapi.Schema(
-    title="Create user.",
-    type=openapi.TYPE_OBJECT,
-    properties={
-        "id": openapi.Schema(
-            type=openapi.TYPE_INTEGER, description="User id", example=1
-        ),
-        "email": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User email. Required. Unique.",
-            example="ex@example.com",
-        ),
-        "first_name": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User first name.",
-            example="Alex",
-        ),
-        "last_name": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User last name.",
-            example="Alan",
-        ),
-        "team": openapi.Schema(
-            type=openapi.TYPE_INTEGER,
-            description="Team id to join. Can be blank.",
-            example=1,
-        ),
-        "password": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User password.",
-            example="111",
-        ),
-    },
-    required=["email", "password"],
-)
+"""Schemas module for 'api' app.
 
+Openapi objects need drf_yasg, so they are built on first access and only
+if docs are enabled. Lean workers with 'API_DOCS_ENABLED' off never import
+drf_yasg, objects are None there and 'swagger_auto_schema' does nothing.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
 
-swagger_user_schema = openapi.Schema(
-    title="User operations.",
-    type=openapi.TYPE_OBJECT,
-    properties={
-        "id": openapi.Schema(
-            type=openapi.TYPE_INTEGER, description="User id", example=1
-        ),
-        "email": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User email. Required. Unique.",
-            example="ex@example.com",
-        ),
-        "first_name": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User first name.",
-            example="Alex",
-        ),
-        "last_name": openapi.Schema(
-            type=openapi.TYPE_STRING,
-            description="User last name.",
-            example="Alan",
-        ),
-        "team": openapi.Schema(
-            type=openapi.TYPE_INTEGER,
-            description="Team id to join. Can be blank.",
-            example=1,
-        ),
-    },
-    required=["email"],
-)
-
+from django.conf import settings
 
 swagger_put_responses = {
     200: "Operation successfully performed.",
@@ -106,17 +45,246 @@ swagger_delete_responses = {
 }
 
 
-swagger_team_schema = openapi.Schema(
-    title="Team operations.",
-    type=openapi.TYPE_OBJECT,
-    properties={
-        "id": openapi.Schema(
-            type=openapi.TYPE_INTEGER, description="Team id", example=1
+swagger_import_responses = {
+    200: "Import report with created rows count and per-row errors.",
+    401: "Unauthorized.",
+    403: "You don't have permission to perform this action.",
+    415: "Invalid format. Use text/csv or application/x-ndjson.",
+}
+
+
+swagger_bulk_update_responses = {
+    200: "Update report with updated users count and per-item errors.",
+    400: "Request body is not a list.",
+    401: "Unauthorized.",
+    403: "You don't have permission to perform this action.",
+    415: "Invalid format.",
+}
+
+
+swagger_move_responses = {
+    200: "Number of moved users.",
+    400: "Validation errors.",
+    401: "Unauthorized.",
+    403: "You don't have permission to perform this action.",
+    415: "Invalid format.",
+}
+
+
+swagger_export_responses = {
+    200: "Users streamed as csv or ndjson.",
+    400: "Unknown output format.",
+    401: "Unauthorized.",
+    403: "You don't have permission to perform this action.",
+}
+
+
+swagger_search_responses = {
+    200: "Users ordered by relevance.",
+    400: "Validation errors.",
+    401: "Unauthorized.",
+}
+
+
+def build_openapi_objects() -> Dict[str, Any]:
+    """Build openapi schemas and parameters describing api views."""
+    from drf_yasg import openapi
+
+    swagger_user_register_schema = openapi.Schema(
+        title="Create user.",
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "id": openapi.Schema(
+                type=openapi.TYPE_INTEGER, description="User id", example=1
+            ),
+            "email": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User email. Required. Unique.",
+                example="ex@example.com",
+            ),
+            "first_name": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User first name.",
+                example="Alex",
+            ),
+            "last_name": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User last name.",
+                example="Alan",
+            ),
+            "team": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="Team id to join. Can be blank.",
+                example=1,
+            ),
+            "password": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User password.",
+                example="111",
+            ),
+        },
+        required=["email", "password"],
+    )
+
+    swagger_user_schema = openapi.Schema(
+        title="User operations.",
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "id": openapi.Schema(
+                type=openapi.TYPE_INTEGER, description="User id", example=1
+            ),
+            "email": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User email. Required. Unique.",
+                example="ex@example.com",
+            ),
+            "first_name": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User first name.",
+                example="Alex",
+            ),
+            "last_name": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="User last name.",
+                example="Alan",
+            ),
+            "team": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="Team id to join. Can be blank.",
+                example=1,
+            ),
+        },
+        required=["email"],
+    )
+
+    swagger_bulk_update_schema = openapi.Schema(
+        title="Update users partially.",
+        type=openapi.TYPE_ARRAY,
+        items=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "id": openapi.Schema(
+                    type=openapi.TYPE_INTEGER, description="User id", example=1
+                ),
+                "first_name": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="User first name.",
+                    example="Alex",
+                ),
+                "last_name": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="User last name.",
+                    example="Alan",
+                ),
+                "team": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="Team id to join. Can be null.",
+                    example=1,
+                ),
+            },
+            required=["id"],
         ),
-        "name": openapi.Schema(
+    )
+
+    swagger_move_schema = openapi.Schema(
+        title="Move users to team.",
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "team": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="Target team id. Required.",
+                example=1,
+            ),
+            "users": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                description="Ids of users to move. Either this or source_team.",
+                example=[1, 2, 3],
+            ),
+            "source_team": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="Team id, all its members are moved.",
+                example=2,
+            ),
+        },
+        required=["team"],
+    )
+
+    swagger_search_parameters = [
+        openapi.Parameter(
+            "q",
+            openapi.IN_QUERY,
+            description="Email or name prefix, typos are tolerated. Min 3 chars.",
             type=openapi.TYPE_STRING,
-            description="Team name.",
-            example="Bad girls",
+            required=True,
         ),
-    },
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description="Max number of returned users.",
+            type=openapi.TYPE_INTEGER,
+        ),
+    ]
+
+    swagger_team_schema = openapi.Schema(
+        title="Team operations.",
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "id": openapi.Schema(
+                type=openapi.TYPE_INTEGER, description="Team id", example=1
+            ),
+            "name": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description="Team name.",
+                example="Bad girls",
+            ),
+        },
+    )
+
+    return {
+        "swagger_user_register_schema": swagger_user_register_schema,
+        "swagger_user_schema": swagger_user_schema,
+        "swagger_bulk_update_schema": swagger_bulk_update_schema,
+        "swagger_move_schema": swagger_move_schema,
+        "swagger_search_parameters": swagger_search_parameters,
+        "swagger_team_schema": swagger_team_schema,
+    }
+
+
+OPENAPI_OBJECTS: Tuple[str, ...] = (
+    "swagger_user_register_schema",
+    "swagger_user_schema",
+    "swagger_bulk_update_schema",
+    "swagger_move_schema",
+    "swagger_search_parameters",
+    "swagger_team_schema",
 )
+
+
+def docs_enabled() -> bool:
+    """Check whether api docs are served."""
+    return getattr(settings, "API_DOCS_ENABLED", True)
+
+
+@lru_cache(maxsize=None)
+def get_openapi_objects() -> Dict[str, Any]:
+    """Get openapi objects built once."""
+    return build_openapi_objects()
+
+
+def __getattr__(name: str) -> Any:
+    """Get openapi object by name, None if docs are disabled."""
+    if name not in OPENAPI_OBJECTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if not docs_enabled():
+        return None
+    return get_openapi_objects()[name]
+
+
+def swagger_auto_schema(**overrides) -> Callable:
+    """Apply drf_yasg 'swagger_auto_schema' if docs are enabled."""
+    if not docs_enabled():
+        return lambda view_method: view_method
+    from drf_yasg.utils import swagger_auto_schema as decorate
+
+    return decorate(**overrides)
@@ -0,0 +1,72 @@
+"""Index-backed users search for api app."""
+from functools import reduce
+from operator import or_
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import (
+    Case,
+    Func,
+    IntegerField,
+    Q,
+    QuerySet,
+    TextField,
+    Value,
+    When,
+)
+
+SEARCH_FIELDS: Tuple[str, ...] = ("email", "first_name", "last_name")
+DEFAULT_LIMIT: int = 20
+DEFAULT_MAX_LIMIT: int = 100
+
+
+def get_search_document() -> Func:
+    """Get email and names joined with spaces, indexed by 'user_search_trgm_idx'.
+
+    Plain '||' is used instead of CONCAT(), which isn't immutable and so
+    can't be indexed, one document lets a single trigram index serve search.
+    It's plain Func, so migrations can repeat it without importing this module.
+    """
+    return Func(
+        *SEARCH_FIELDS,
+        template="(%(expressions)s)",
+        arg_joiner=" || ' ' || ",
+        output_field=TextField(),
+    )
+
+
+def get_prefix_filter(query: str) -> Q:
+    """Build condition matching users with any field starting with query."""
+    return reduce(
+        or_, (Q(**{f"{field}__istartswith": query}) for field in SEARCH_FIELDS)
+    )
+
+
+def search_users(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter users word similar to query and order them by relevance.
+
+    Prefix of any word has high word similarity, so prefix matches are found
+    too and go first, then users are ranked by similarity. Filter is served
+    by trigram GIN index on search document, so only matching rows are read.
+    """
+    query = query.strip()
+    return (
+        queryset.alias(search_document=get_search_document())
+        .filter(search_document__trigram_word_similar=query)
+        .annotate(
+            search_prefix=Case(
+                When(get_prefix_filter(query), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            search_rank=TrigramWordSimilarity(query, get_search_document()),
+        )
+        .order_by("-search_prefix", "-search_rank", "id")
+    )
+
+
+def get_search_limit(requested: Optional[int] = None) -> int:
+    """Get number of returned users limited by max limit from settings."""
+    limit: int = requested or getattr(settings, "API_SEARCH_LIMIT", DEFAULT_LIMIT)
+    return min(limit, getattr(settings, "API_SEARCH_MAX_LIMIT", DEFAULT_MAX_LIMIT))
@@ -0,0 +1,191 @@
+"""Bulk seeding of teams and users through COPY for api app."""
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence
+
+from django.db import connection
+from django.utils import timezone
+
+from api.models import Team, User
+
+FIRST_NAMES: Sequence[str] = (
+    "Anna", "Olena", "Maria", "Iryna", "Sofia", "Daria", "Kateryna", "Yulia",
+    "Emma", "Olivia", "Mia", "Laura", "Andrii", "Oleksandr", "Dmytro", "Ivan",
+    "Serhii", "Maksym", "Taras", "Bohdan", "James", "John", "Robert", "Michael",
+    "David", "Daniel", "Thomas", "Lucas", "Noah", "Leo",
+)  # fmt: skip
+LAST_NAMES: Sequence[str] = (
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Melnyk", "Boyko", "Koval", "Shevchuk", "Polishchuk", "Lysenko", "Marchenko",
+    "Savchenko", "Rudenko", "Moroz", "Smith", "Johnson", "Williams", "Brown",
+    "Jones", "Garcia", "Miller", "Davis", "Martinez", "Wilson", "Anderson",
+    "Taylor", "Thomas", "Moore", "Martin",
+)  # fmt: skip
+TEAM_COLUMNS: Sequence[str] = ("id", "name")
+USER_COLUMNS: Sequence[str] = (
+    "id",
+    "password",
+    "is_superuser",
+    "email",
+    "first_name",
+    "last_name",
+    "is_staff",
+    "is_active",
+    "date_joined",
+    "team_id",
+)
+ROWS_PER_CHUNK: int = 1000
+JOINED_WITHIN_DAYS: int = 3 * 365
+
+
+class RowsReader:
+    """File-like object reading lines of COPY text format generated on demand.
+
+    COPY pulls data by read() calls, so rows are never held all at once.
+    """
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        """Store chunks iterator."""
+        self.chunks = chunks
+        self.buffer: str = ""
+
+    def read(self, size: int = -1) -> str:
+        """Read up to 'size' characters, everything left if it's negative."""
+        parts: List[str] = [self.buffer]
+        length: int = len(self.buffer)
+        while size < 0 or length < size:
+            chunk: Optional[str] = next(self.chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+        data: str = "".join(parts)
+        if size < 0:
+            self.buffer = ""
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+
+def reserve_ids(model, count: int) -> int:
+    """Move primary key sequence of model by count, get first reserved id.
+
+    Reservation isn't atomic, so inserts shouldn't run concurrently. Nothing
+    is reserved for zero count, as sequence can't be set below its minimum.
+    """
+    if count == 0:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+            "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+            [model._meta.db_table] * 2 + [count],
+        )
+        return cursor.fetchone()[0] - count + 1
+
+
+def copy_rows(model, columns: Sequence[str], chunks: Iterator[str]) -> None:
+    """Stream rows into table of model with COPY FROM STDIN."""
+    table: str = connection.ops.quote_name(model._meta.db_table)
+    names: str = ", ".join(connection.ops.quote_name(name) for name in columns)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f"COPY {table} ({names}) FROM STDIN", RowsReader(chunks)
+        )
+
+
+def get_team_weights(teams: int, rng: random.Random) -> List[float]:
+    """Get cumulative team size weights, log-normal like real team sizes.
+
+    Most teams are small, while few are many times larger than median.
+    """
+    return list(accumulate(rng.lognormvariate(0, 1) for _ in range(teams)))
+
+
+def generate_teams(first_id: int, teams: int) -> Iterator[str]:
+    """Generate chunks of team rows."""
+    for start in range(first_id, first_id + teams, ROWS_PER_CHUNK):
+        stop: int = min(start + ROWS_PER_CHUNK, first_id + teams)
+        yield "".join(f"{pk}\tTeam {pk}\n" for pk in range(start, stop))
+
+
+def generate_users(
+    first_id: int,
+    users: int,
+    password: str,
+    team_ids: Sequence[int],
+    without_team: float,
+    rng: random.Random,
+    email_suffix: str = "",
+) -> Iterator[str]:
+    """Generate chunks of user rows spread over teams by their weights."""
+    weights: List[float] = get_team_weights(len(team_ids), rng)
+    now: datetime = timezone.now()
+    for start in range(first_id, first_id + users, ROWS_PER_CHUNK):
+        stop: int = min(start + ROWS_PER_CHUNK, first_id + users)
+        teams: List = (
+            rng.choices(team_ids, cum_weights=weights, k=stop - start)
+            if team_ids
+            else [None] * (stop - start)
+        )
+        lines: List[str] = []
+        for pk, team_id in zip(range(start, stop), teams):
+            if team_id is None or rng.random() < without_team:
+                team_id = "\\N"
+            joined: datetime = now - timedelta(
+                seconds=rng.randrange(JOINED_WITHIN_DAYS * 86400)
+            )
+            lines.append(
+                f"{pk}\t{password}\tf\tuser{pk}{email_suffix}@example.com\t"
+                f"{rng.choice(FIRST_NAMES)}\t{rng.choice(LAST_NAMES)}\tf\tt\t"
+                f"{joined.isoformat()}\t{team_id}\n"
+            )
+        yield "".join(lines)
+
+
+def seed_teams(teams: int) -> List[int]:
+    """Insert teams with COPY, get their ids."""
+    first_id: int = reserve_ids(Team, teams)
+    copy_rows(Team, TEAM_COLUMNS, generate_teams(first_id, teams))
+    return list(range(first_id, first_id + teams))
+
+
+def seed_users(
+    users: int,
+    password: str,
+    team_ids: Sequence[int],
+    without_team: float = 0.05,
+    rng: Optional[random.Random] = None,
+    email_suffix: str = "",
+) -> int:
+    """Insert users sharing given password hash with COPY, get first id.
+
+    Ids of inserted users follow one another.
+    """
+    first_id: int = reserve_ids(User, users)
+    copy_rows(
+        User,
+        USER_COLUMNS,
+        generate_users(
+            first_id,
+            users,
+            password,
+            team_ids,
+            without_team,
+            rng or random.Random(),
+            email_suffix,
+        ),
+    )
+    return first_id
+
+
+def analyze() -> None:
+    """Update planner statistics of seeded tables."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ANALYZE {}, {}".format(
+                connection.ops.quote_name(Team._meta.db_table),
+                connection.ops.quote_name(User._meta.db_table),
+            )
+        )
@@ -1,7 +1,12 @@
 """Module for api app serializers."""
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
+)
 
+from api.logins import record_login
 from api.models import Team, User
+from api.timing import timed
 
 
 class CreateUserSerializer(serializers.ModelSerializer):
@@ -22,7 +27,86 @@ class CreateUserSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ImportUserSerializer(serializers.Serializer):
+    """Serializer for validating one row of users bulk import."""
+
+    email = serializers.EmailField(max_length=254)
+    first_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True, default=""
+    )
+    last_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True, default=""
+    )
+    password = serializers.CharField(max_length=128, write_only=True)
+    team = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class BulkUpdateUserSerializer(serializers.Serializer):
+    """Serializer for validating one item of users bulk partial update."""
+
+    id = serializers.IntegerField(min_value=1)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    team = serializers.IntegerField(required=False, allow_null=True)
+
+
+class MoveUsersSerializer(serializers.Serializer):
+    """Serializer for validating bulk team move of users."""
+
+    team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all())
+    users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+    )
+    source_team = serializers.PrimaryKeyRelatedField(
+        queryset=Team.objects.all(), required=False
+    )
+
+    def validate(self, attrs):
+        """Check exactly one of users and source team is given."""
+        if ("users" in attrs) == ("source_team" in attrs):
+            raise serializers.ValidationError(
+                "Provide either 'users' or 'source_team'."
+            )
+        return attrs
+
+
+class UserSearchSerializer(serializers.Serializer):
+    """Serializer for validating users search query params."""
+
+    q = serializers.CharField(min_length=3, max_length=254)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """List serializer adding its output time to request timings."""
+
+    @property
+    def data(self):
+        """Get serialized objects."""
+        with timed("serialize"):
+            return super().data
+
+
+class SparseFieldsModelSerializer(serializers.ModelSerializer):
+    """Model serializer which can be limited to subset of its fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """Drop fields not listed in 'fields' if it's given."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @property
+    def data(self):
+        """Get serialized object, adding output time to request timings."""
+        with timed("serialize"):
+            return super().data
+
+
+class UserSerializer(SparseFieldsModelSerializer):
     """User model serializer class."""
 
     class Meta:
@@ -30,9 +114,10 @@ class UserSerializer(serializers.ModelSerializer):
 
         model = User
         fields = ["id", "email", "first_name", "last_name", "team"]
+        list_serializer_class = TimedListSerializer
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(SparseFieldsModelSerializer):
     """Team model serializer class."""
 
     class Meta:
@@ -40,3 +125,31 @@ class TeamSerializer(serializers.ModelSerializer):
 
         model = Team
         fields = "__all__"
+        list_serializer_class = TimedListSerializer
+
+
+class TeamRosterSerializer(SparseFieldsModelSerializer):
+    """Team model serializer class with embedded members."""
+
+    member_count = serializers.IntegerField(read_only=True)
+    members = UserSerializer(many=True, read_only=True, source="user_set")
+
+    class Meta:
+        """Class Meta for TeamRoster serializer class."""
+
+        model = Team
+        fields = ["id", "name", "member_count", "members"]
+        list_serializer_class = TimedListSerializer
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """Token pair serializer recording last_login through write-behind buffer."""
+
+    def validate(self, attrs):
+        """Authenticate user, issue tokens and record login time."""
+        data = super(BaseTokenObtainPairSerializer, self).validate(attrs)
+        refresh = self.get_token(self.user)
+        data["refresh"] = str(refresh)
+        data["access"] = str(refresh.access_token)
+        record_login(self.user)
+        return data
@@ -0,0 +1,53 @@
+"""Signal receivers for api app."""
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from api.authentication import token_cache
+from api.caching import bump_versions
+from api.models import Team, User
+from api.timing import install_query_recorder
+
+# Sent once per set-based team change of many users with 'team' and 'count'.
+users_moved = Signal()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached user responses, login timestamps aside."""
+    token_cache.invalidate_user(instance)
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    bump_versions("user")
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Invalidate cached user responses."""
+    token_cache.evict_user(instance.pk)
+    bump_versions("user")
+
+
+@receiver(post_save, sender=Team)
+def team_saved(sender, instance, **kwargs):
+    """Invalidate cached team responses."""
+    bump_versions("team")
+
+
+@receiver(post_delete, sender=Team)
+def team_deleted(sender, instance, **kwargs):
+    """Invalidate cached team and user responses, members lose their team."""
+    bump_versions("team", "user")
+
+
+@receiver(users_moved, sender=User)
+def users_team_changed(sender, team, count, **kwargs):
+    """Invalidate cached user responses once for all moved users."""
+    if count:
+        bump_versions("user")
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """Record queries of connection for Server-Timing of requests."""
+    install_query_recorder(connection)
@@ -0,0 +1,125 @@
+"""Per-request SQL and phase timings for api app."""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+# Phases reported in Server-Timing header, in order.
+PHASES: Tuple[str, ...] = ("auth", "serialize", "render")
+DEFAULT_SERVER_TIMING: str = "staff"
+DEFAULT_SLOW_REQUEST_MS: Optional[float] = 1000
+DEFAULT_SLOW_REQUEST_QUERIES: Optional[int] = 50
+REPEATED_QUERIES_LIMIT: int = 5
+
+
+class RequestTimings:
+    """Time spent by one request in SQL queries and in named phases.
+
+    Phases may overlap, queries run during authentication count in both
+    'db' and 'auth'.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty timings and start request clock."""
+        self.started: float = time.perf_counter()
+        self.total: float = 0
+        self.phases: Dict[str, float] = {}
+        self.queries: int = 0
+        self.query_time: float = 0
+        self.statements: Counter = Counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time spent in phase."""
+        self.phases[phase] = self.phases.get(phase, 0) + seconds
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        """Add executed statement and its time."""
+        self.queries += 1
+        self.query_time += seconds
+        self.statements[sql] += 1
+
+    def finish(self) -> None:
+        """Stop request clock."""
+        self.total = time.perf_counter() - self.started
+
+    def get_repeated_statements(self) -> List[Tuple[str, int]]:
+        """Get statements executed more than once, most repeated first."""
+        return [
+            (sql, count)
+            for sql, count in self.statements.most_common(REPEATED_QUERIES_LIMIT)
+            if count > 1
+        ]
+
+    def is_slow(self) -> bool:
+        """Check whether request exceeded time or queries thresholds."""
+        slow_ms: Optional[float] = getattr(
+            settings, "API_SLOW_REQUEST_MS", DEFAULT_SLOW_REQUEST_MS
+        )
+        slow_queries: Optional[int] = getattr(
+            settings, "API_SLOW_REQUEST_QUERIES", DEFAULT_SLOW_REQUEST_QUERIES
+        )
+        return (slow_ms is not None and self.total * 1000 > slow_ms) or (
+            slow_queries is not None and self.queries > slow_queries
+        )
+
+    def get_header(self) -> str:
+        """Build Server-Timing header value with durations in milliseconds."""
+        metrics: List[str] = [
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries"'
+        ]
+        metrics += [
+            f"{phase};dur={self.phases[phase] * 1000:.1f}"
+            for phase in PHASES
+            if phase in self.phases
+        ]
+        metrics.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add time of block to phase of current request, if it's measured."""
+    timings: Optional[RequestTimings] = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding statement and its time to current request."""
+    timings: Optional[RequestTimings] = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started: float = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(connection) -> None:
+    """Add query recorder to connection once, below temporary wrappers.
+
+    Wrappers installed by 'connection.execute_wrapper()' are popped from the
+    end of the list, so the recorder goes first to stay in place.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def get_server_timing_mode() -> str:
+    """Get who receives Server-Timing header: 'all', 'staff' or nobody."""
+    return getattr(settings, "API_SERVER_TIMING", DEFAULT_SERVER_TIMING) or ""
@@ -2,7 +2,20 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from api.views import RegisterView, TeamsView, TeamView, UsersView, UserView
+from api.views import (
+    RegisterView,
+    TeamRosterView,
+    TeamsRosterView,
+    TeamsView,
+    TeamView,
+    UsersExportView,
+    UsersImportView,
+    UsersMoveView,
+    UsersSearchView,
+    UsersView,
+    UserView,
+    metrics_view,
+)
 
 urlpatterns = [
     path("auth/token/", TokenObtainPairView.as_view(), name="token"),
@@ -10,6 +23,13 @@ urlpatterns = [
     path("auth/signup/", RegisterView.as_view(), name="sign_up"),
     path("user/<int:pk>/", UserView.as_view(), name="user"),
     path("user/", UsersView.as_view(), name="users"),
+    path("user/search/", UsersSearchView.as_view(), name="users_search"),
+    path("user/import/", UsersImportView.as_view(), name="users_import"),
+    path("user/move/", UsersMoveView.as_view(), name="users_move"),
+    path("user/export/", UsersExportView.as_view(), name="users_export"),
     path("team/<int:pk>/", TeamView.as_view(), name="team"),
     path("team/", TeamsView.as_view(), name="teams"),
+    path("team/<int:pk>/roster/", TeamRosterView.as_view(), name="team_roster"),
+    path("team/roster/", TeamsRosterView.as_view(), name="teams_roster"),
+    path("metrics", metrics_view, name="metrics"),
 ]
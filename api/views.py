@@ -1,6 +1,13 @@
 """Class and function views for api app."""
-from django.db.models import QuerySet
-from drf_yasg.utils import swagger_auto_schema
+from django.db.models import Count, Prefetch, QuerySet
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (
     CreateModelMixin,
@@ -10,21 +17,47 @@ from rest_framework.mixins import (
     UpdateModelMixin,
 )
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.schemas import AutoSchema
 from rest_framework.serializers import Serializer
 
+from api.authentication import CachedJWTAuthentication
+from api.bulk import UserImporter, UserUpdater, move_users, read_rows
+from api.caching import CachedResponseMixin
 from api.common import ReadOnly
+from api.exports import EXPORT_FORMATS, get_export_rows
+from api.fieldsets import SparseFieldsMixin
+from api.metrics import CONTENT_TYPE, get_allowed_ips, registry, render
 from api.models import Team, User
+from api.pagination import KeysetPagination
+from api.reads import FastListMixin
 from api.schemas import (
+    swagger_auto_schema,
+    swagger_bulk_update_responses,
+    swagger_bulk_update_schema,
     swagger_delete_responses,
+    swagger_export_responses,
     swagger_get_responses,
+    swagger_import_responses,
+    swagger_move_responses,
+    swagger_move_schema,
     swagger_post_responses,
     swagger_put_responses,
+    swagger_search_parameters,
+    swagger_search_responses,
     swagger_team_schema,
     swagger_user_register_schema,
     swagger_user_schema,
 )
-from api.serializers import CreateUserSerializer, TeamSerializer, UserSerializer
+from api.search import get_search_limit, search_users
+from api.serializers import (
+    CreateUserSerializer,
+    MoveUsersSerializer,
+    TeamRosterSerializer,
+    TeamSerializer,
+    UserSearchSerializer,
+    UserSerializer,
+)
 
 
 class RegisterView(CreateModelMixin, GenericAPIView):
@@ -43,6 +76,8 @@ class RegisterView(CreateModelMixin, GenericAPIView):
 
 
 class UserView(
+    CachedResponseMixin,
+    SparseFieldsMixin,
     RetrieveModelMixin,
     UpdateModelMixin,
     DestroyModelMixin,
@@ -54,6 +89,7 @@ class UserView(
     serializer_class: Serializer = UserSerializer
     queryset: QuerySet = User.objects.all()
     permission_classes = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    cache_resources = ("user",)
 
     @swagger_auto_schema(responses=swagger_get_responses)
     def get(self, request, *args, **kwargs):
@@ -84,21 +120,127 @@ class UserView(
         return self.destroy(request, *args, **kwargs)
 
 
-class UsersView(ListModelMixin, GenericAPIView):
+class UsersView(
+    CachedResponseMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    ListModelMixin,
+    GenericAPIView,
+):
     """Class view for list user."""
 
     schema: AutoSchema = AutoSchema()
     serializer_class: Serializer = UserSerializer
     queryset: QuerySet = User.objects.all()
     permission_classes = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    cache_resources = ("user",)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("last_name", "id")
 
     @swagger_auto_schema(responses=swagger_get_responses)
     def get(self, request, *args, **kwargs):
         """Retrieve users list."""
         return self.list(request, *args, **kwargs)
 
+    @swagger_auto_schema(
+        request_body=swagger_bulk_update_schema,
+        responses=swagger_bulk_update_responses,
+    )
+    def patch(self, request, *args, **kwargs):
+        """Update partially many users given as list of objects with ids."""
+        if not isinstance(request.data, list):
+            received: str = type(request.data).__name__
+            message: str = f'Expected a list of items but got type "{received}".'
+            raise ValidationError({"non_field_errors": [message]})
+        return Response(UserUpdater().run(request.data))
+
+
+class UsersSearchView(
+    CachedResponseMixin, SparseFieldsMixin, ListModelMixin, GenericAPIView
+):
+    """Class view for searching users by email and names."""
+
+    schema: AutoSchema = AutoSchema()
+    serializer_class: Serializer = UserSerializer
+    queryset: QuerySet = User.objects.all()
+    permission_classes = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    cache_resources = ("user",)
+
+    def get_queryset(self) -> QuerySet:
+        """Get users matching query ordered by relevance and limited."""
+        params = UserSearchSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = search_users(super().get_queryset(), params.validated_data["q"])
+        return queryset[: get_search_limit(params.validated_data.get("limit"))]
+
+    @swagger_auto_schema(
+        manual_parameters=swagger_search_parameters,
+        responses=swagger_search_responses,
+    )
+    def get(self, request, *args, **kwargs):
+        """Search users by email or name prefix and similarity."""
+        return self.list(request, *args, **kwargs)
+
+
+class UsersImportView(GenericAPIView):
+    """Class view for bulk users import from csv or ndjson stream."""
+
+    schema: AutoSchema = AutoSchema()
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(responses=swagger_import_responses)
+    def post(self, request, *args, **kwargs):
+        """Import users streamed in request body."""
+        rows = read_rows(request.stream, request.content_type)
+        return Response(UserImporter().run(rows))
+
+
+class UsersMoveView(GenericAPIView):
+    """Class view for moving many users to team at once."""
+
+    schema: AutoSchema = AutoSchema()
+    serializer_class: Serializer = MoveUsersSerializer
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        request_body=swagger_move_schema,
+        responses=swagger_move_responses,
+    )
+    def post(self, request, *args, **kwargs):
+        """Move given users or all members of source team to team."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        moved: int = move_users(
+            data["team"], data.get("users"), data.get("source_team")
+        )
+        return Response({"moved": moved})
+
+
+class UsersExportView(GenericAPIView):
+    """Class view for streaming export of all users with team names."""
+
+    schema: AutoSchema = AutoSchema()
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(responses=swagger_export_responses)
+    def get(self, request, *args, **kwargs):
+        """Stream users as csv or ndjson chosen by 'output' query param."""
+        output: str = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            choices: str = ", ".join(EXPORT_FORMATS)
+            raise ValidationError({"output": [f"Choose one of: {choices}."]})
+        render, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            render(get_export_rows()), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="users.{output}"'
+        return response
+
 
 class TeamView(
+    CachedResponseMixin,
+    SparseFieldsMixin,
     RetrieveModelMixin,
     UpdateModelMixin,
     DestroyModelMixin,
@@ -110,6 +252,7 @@ class TeamView(
     serializer_class: Serializer = TeamSerializer
     queryset: QuerySet = Team.objects.all()
     permission_classes = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    cache_resources = ("team",)
 
     @swagger_auto_schema(responses=swagger_get_responses)
     def get(self, request, *args, **kwargs):
@@ -130,13 +273,23 @@ class TeamView(
         return self.destroy(request, *args, **kwargs)
 
 
-class TeamsView(CreateModelMixin, ListModelMixin, GenericAPIView):
+class TeamsView(
+    CachedResponseMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    CreateModelMixin,
+    ListModelMixin,
+    GenericAPIView,
+):
     """Class view for creating and get many teams."""
 
     schema: AutoSchema = AutoSchema()
     serializer_class: Serializer = TeamSerializer
     queryset: QuerySet = Team.objects.all()
     permission_classes = [IsAdminUser | (ReadOnly & IsAuthenticated)]
+    cache_resources = ("team",)
+    pagination_class = KeysetPagination
+    keyset_ordering = ("name", "id")
 
     @swagger_auto_schema(responses=swagger_get_responses)
     def get(self, request, *args, **kwargs):
@@ -150,3 +303,51 @@ class TeamsView(CreateModelMixin, ListModelMixin, GenericAPIView):
     def post(self, request, *args, **kwargs):
         """Create team."""
         return self.create(request, *args, **kwargs)
+
+
+roster_queryset: QuerySet = Team.objects.annotate(
+    member_count=Count("user")
+).prefetch_related(
+    Prefetch("user_set", queryset=User.objects.order_by("last_name", "id"))
+)
+
+
+class TeamRosterView(TeamView):
+    """Class view for retrieving team with its members."""
+
+    serializer_class: Serializer = TeamRosterSerializer
+    queryset: QuerySet = roster_queryset
+    cache_resources = ("team", "user")
+    http_method_names = ["get", "head", "options"]
+
+
+class TeamsRosterView(TeamsView):
+    """Class view for retrieving teams list with their members."""
+
+    serializer_class: Serializer = TeamRosterSerializer
+    queryset: QuerySet = roster_queryset
+    cache_resources = ("team", "user")
+    http_method_names = ["get", "head", "options"]
+
+
+def is_metrics_reader(request: HttpRequest) -> bool:
+    """Check request comes from allowed address or from staff user."""
+    if request.META.get("REMOTE_ADDR") in get_allowed_ips():
+        return True
+    try:
+        authenticated = CachedJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    user = authenticated[0] if authenticated else getattr(request, "user", None)
+    return getattr(user, "is_staff", False)
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Expose metrics of all worker processes in Prometheus text format.
+
+    Served to 'API_METRICS_ALLOWED_IPS' and to staff users only.
+    """
+    if not is_metrics_reader(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(registry.collect()), content_type=CONTENT_TYPE)
@@ -0,0 +1,32 @@
+"""Api docs urls, mounted only if 'API_DOCS_ENABLED' setting is on."""
+from django.urls import path
+from drf_yasg import openapi
+from rest_framework import authentication
+
+from config.schema import get_cached_schema_view
+
+schema_view = get_cached_schema_view(
+    openapi.Info(
+        title="Person API",
+        default_version="v1",
+        description="Service for creating persons and commands.",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="nuzhniyva@gmail.com"),
+        license=openapi.License(name="BSD License"),
+    ),
+    public=True,
+    authentication_classes=[authentication.BasicAuthentication],
+)
+
+
+urlpatterns = [
+    path(
+        "swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"
+    ),
+    path(
+        "swagger/",
+        schema_view.with_ui("swagger", cache_timeout=0),
+        name="schema-swagger-ui",
+    ),
+    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+]
@@ -0,0 +1 @@
+"""PostgreSQL database backend keeping connections in per-process pool."""
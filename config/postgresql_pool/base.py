@@ -0,0 +1,78 @@
+"""PostgreSQL database backend handing out connections from pool."""
+import os
+from typing import Any, Dict, Tuple
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+from config.postgresql_pool.creation import DatabaseCreation
+from config.postgresql_pool.pool import ConnectionPool, PoolTimeout, pools, pools_lock
+
+POOL_DEFAULTS: Dict[str, Any] = {
+    "MIN_SIZE": 0,
+    "MAX_SIZE": 10,
+    "TIMEOUT": 30,
+    "MAX_LIFETIME": 3600,
+    "HEALTH_CHECK": True,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connection wrapper taking connections from shared pool.
+
+    Pool is configured by 'POOL' key of database settings, see POOL_DEFAULTS.
+    Closing connection, as Django does at the end of every request when
+    'CONN_MAX_AGE' is 0, returns it to pool instead of disconnecting.
+    """
+
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params: Dict) -> ConnectionPool:
+        """Get pool for connection params of current process, creating it once."""
+        params = tuple(
+            sorted((name, repr(value)) for name, value in conn_params.items())
+        )
+        key: Tuple = (os.getpid(), self.alias, params)
+        with pools_lock:
+            if key not in pools:
+                options = {**POOL_DEFAULTS, **self.settings_dict.get("POOL", {})}
+                pools[key] = ConnectionPool(
+                    min_size=options["MIN_SIZE"],
+                    max_size=options["MAX_SIZE"],
+                    timeout=options["TIMEOUT"],
+                    max_lifetime=options["MAX_LIFETIME"],
+                    health_check=options["HEALTH_CHECK"],
+                )
+            return pools[key]
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        """Check out connection from pool, opening new one if needed."""
+        self.pool = self.get_pool(conn_params)
+        try:
+            connection = self.pool.get(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+            )
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+        return connection
+
+    def _close(self):
+        """Return connection to pool.
+
+        Inside atomic block Django keeps reference to closed connection until
+        rollback, so such connection is closed for real instead.
+        """
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                self.pool.discard(self.connection)
+            else:
+                self.pool.put(self.connection)
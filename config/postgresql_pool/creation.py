@@ -0,0 +1,13 @@
+"""Test database creation for pooled PostgreSQL backend."""
+from django.db.backends.postgresql import creation
+
+from config.postgresql_pool.pool import close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Close pooled connections before test database is dropped."""
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        """Close idle pooled connections, then drop test database."""
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,200 @@
+"""Thread safe pool of database connections."""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Connect = Callable[[], Any]
+
+
+class PoolTimeout(Exception):
+    """No connection became available within pool timeout."""
+
+
+class ConnectionPool:
+    """Pool of open DB-API connections shared by threads of one process.
+
+    Connections are handed out most recently used first, so surplus ones
+    stay idle and get recycled by 'max_lifetime'. Checkout blocks up to
+    'timeout' seconds when 'max_size' connections are in use.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 30,
+        max_lifetime: Optional[float] = 3600,
+        health_check: bool = True,
+    ) -> None:
+        """Initialize empty pool and counters."""
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self.condition = threading.Condition()
+        self.idle: Deque[Any] = deque()
+        self.created_at: Dict[int, float] = {}
+        self.size: int = 0
+        self.counters: Dict[str, int] = dict.fromkeys(
+            ("checkouts", "waits", "timeouts", "created", "closed", "failed_checks"),
+            0,
+        )
+
+    def is_expired(self, connection: Any) -> bool:
+        """Check whether connection lived longer than max lifetime."""
+        if self.max_lifetime is None:
+            return False
+        born: float = self.created_at.get(id(connection), 0)
+        return time.monotonic() - born >= self.max_lifetime
+
+    def is_healthy(self, connection: Any) -> bool:
+        """Check connection with trivial query."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def create(self, connect: Connect) -> Any:
+        """Open new connection, size slot must be reserved by caller."""
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created_at[id(connection)] = time.monotonic()
+            self.counters["created"] += 1
+        return connection
+
+    def discard(self, connection: Any) -> None:
+        """Close connection and free its slot."""
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Failed to close pooled connection.", exc_info=True)
+        with self.condition:
+            self.created_at.pop(id(connection), None)
+            self.size -= 1
+            self.counters["closed"] += 1
+            self.condition.notify()
+
+    def fill(self, connect: Connect) -> None:
+        """Open connections until pool holds at least min size of them."""
+        while True:
+            with self.condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            connection = self.create(connect)
+            with self.condition:
+                self.idle.append(connection)
+                self.condition.notify()
+
+    def acquire(self, deadline: float) -> Optional[Any]:
+        """Pop idle connection or reserve slot for new one, returning None."""
+        with self.condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available in {self.timeout}s, "
+                        f"all {self.max_size} are in use."
+                    )
+                self.counters["waits"] += 1
+                self.condition.wait(remaining)
+
+    def get(self, connect: Connect) -> Any:
+        """Check out idle connection or open new one, waiting if pool is full."""
+        if self.size < self.min_size:
+            self.fill(connect)
+        deadline: float = time.monotonic() + self.timeout
+        while True:
+            connection = self.acquire(deadline)
+            if connection is None:
+                connection = self.create(connect)
+            elif self.is_expired(connection):
+                self.discard(connection)
+                continue
+            elif self.health_check and not self.is_healthy(connection):
+                with self.condition:
+                    self.counters["failed_checks"] += 1
+                self.discard(connection)
+                continue
+            with self.condition:
+                self.counters["checkouts"] += 1
+            return connection
+
+    def put(self, connection: Any) -> None:
+        """Return connection to pool, closing it if it can't be reused."""
+        if getattr(connection, "closed", False) or self.is_expired(connection):
+            self.discard(connection)
+            return
+        try:
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self.condition:
+            idle, self.idle = list(self.idle), deque()
+        for connection in idle:
+            self.discard(connection)
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool size, idle connections number and counters."""
+        with self.condition:
+            return {"size": self.size, "idle": len(self.idle), **self.counters}
+
+
+pools: Dict[Tuple, ConnectionPool] = {}
+pools_lock = threading.Lock()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Get summed stats of pools of current process by database alias."""
+    stats: Dict[str, Dict[str, int]] = {}
+    with pools_lock:
+        current = [
+            (key[1], pool) for key, pool in pools.items() if key[0] == os.getpid()
+        ]
+    for alias, pool in current:
+        totals = stats.setdefault(alias, {})
+        for name, value in pool.stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return stats
+
+
+@atexit.register
+def close_pools(alias: Optional[str] = None) -> None:
+    """Close idle connections of pools of current process."""
+    with pools_lock:
+        current = [
+            pool
+            for key, pool in pools.items()
+            if key[0] == os.getpid() and alias in (None, key[1])
+        ]
+    for pool in current:
+        pool.close()
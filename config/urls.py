@@ -14,38 +14,15 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import authentication
-from rest_framework.documentation import include_docs_urls
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Person API",
-        default_version="v1",
-        description="Service for creating persons and commands.",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="nuzhniyva@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    authentication_classes=[authentication.BasicAuthentication],
-)
-
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("api.urls")),
-    path("api/", include_docs_urls(title="Person API")),
-    path(
-        "swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"
-    ),
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("async/", include("api.async_urls")),
 ]
+
+if settings.API_DOCS_ENABLED:
+    urlpatterns.append(path("", include("config.docs_urls")))
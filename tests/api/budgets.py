@@ -0,0 +1,47 @@
+"""Query budgets of api app endpoints for tests."""
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Max queries per request by url name, same for any number of rows.
+QUERY_BUDGETS: Dict[str, int] = {
+    "token": 2,
+    "token_refresh": 0,
+    "sign_up": 3,
+    "user": 6,
+    "users": 5,
+    "users_search": 2,
+    "users_import": 6,
+    "users_move": 4,
+    "users_export": 2,
+    "team": 4,
+    "teams": 2,
+    "team_roster": 3,
+    "teams_roster": 3,
+    "metrics": 0,
+}
+
+
+def format_queries(queries: CaptureQueriesContext) -> str:
+    """List captured SQL statements, numbered."""
+    lines: List[str] = [
+        f"{number}. {query['sql']}"
+        for number, query in enumerate(queries.captured_queries, 1)
+    ]
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_query_budget(url_name: str) -> Iterator[CaptureQueriesContext]:
+    """Fail if block makes more queries than budget of url name, listing them."""
+    with CaptureQueriesContext(connection) as queries:
+        yield queries
+    budget: int = QUERY_BUDGETS[url_name]
+    if len(queries) > budget:
+        pytest.fail(
+            f"{url_name} made {len(queries)} queries, budget is {budget}:\n"
+            f"{format_queries(queries)}"
+        )
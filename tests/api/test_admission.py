@@ -0,0 +1,161 @@
+"""Module for testing api app admission control."""
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory
+from django.urls import reverse
+
+from api.admission import (
+    ADMITTED,
+    QUEUED,
+    REJECTED,
+    TIMEOUT,
+    ConcurrencyLimiter,
+    get_limiter,
+)
+from api.middleware import AdmissionControlMiddleware
+from api.models import User
+
+TOKEN_DATA: Dict = {"email": "test@gmail.com", "password": "password"}
+
+
+@pytest.fixture
+def admission(settings) -> ConcurrencyLimiter:
+    """Limit token and export views to one request without queue."""
+    settings.API_ADMISSION_CLASSES = {
+        "expensive": {
+            "views": ["token", "users_export", "async_api:token"],
+            "limit": 1,
+            "queue": 0,
+        }
+    }
+    settings.API_ADMISSION_RETRY_AFTER = 3
+    return get_limiter("expensive")
+
+
+class TestConcurrencyLimiter:
+    """Class for testing ConcurrencyLimiter."""
+
+    def test_queue(self) -> None:
+        """Test request waits in queue for slot, others beyond are rejected."""
+        limiter = ConcurrencyLimiter(limit=1, queue=1, timeout=5)
+        assert limiter.acquire() == ADMITTED
+        outcomes: List[Optional[str]] = []
+        waiter = threading.Thread(target=lambda: outcomes.append(limiter.acquire()))
+        waiter.start()
+        while limiter.stats()["waiting"] == 0:
+            pass
+        assert limiter.acquire() == REJECTED
+        assert limiter.acquire(wait=False) is None
+        limiter.release()
+        waiter.join()
+        assert outcomes == [QUEUED]
+        assert limiter.stats() == {
+            "active": 1,
+            "waiting": 0,
+            ADMITTED: 1,
+            QUEUED: 1,
+            REJECTED: 1,
+            TIMEOUT: 0,
+        }
+
+    def test_timeout(self) -> None:
+        """Test queued request gives up after timeout."""
+        limiter = ConcurrencyLimiter(limit=1, queue=1, timeout=0.05)
+        limiter.acquire()
+        assert limiter.acquire() == TIMEOUT
+        assert limiter.stats()["waiting"] == 0
+
+
+@pytest.mark.django_db
+class TestAdmissionControlMiddleware:
+    """Class for testing AdmissionControlMiddleware."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_saturated_class_rejected(
+        self,
+        client: Client,
+        admission: ConcurrencyLimiter,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test full class fails fast while other views are served."""
+        _, headers = get_authorized_admin_user_data
+        admission.acquire()
+        response = client.post(reverse("token"), data=TOKEN_DATA)
+        assert response.status_code == 503
+        assert response["Retry-After"] == "3"
+        assert response.json() == {"detail": "Server is busy, retry later."}
+        assert client.get(reverse("teams"), headers=headers).status_code == 200
+        admission.release()
+        assert client.post(reverse("token"), data=TOKEN_DATA).status_code == 200
+        assert admission.stats()["active"] == 0
+        metrics: str = client.get(reverse("metrics")).content.decode()
+        assert 'api_admission_total{route_class="expensive",outcome="rejected"} 1' in (
+            metrics
+        )
+        assert 'requests_total{view="token",method="POST",status="503"} 1' in metrics
+
+    def test_streaming_holds_slot(
+        self,
+        client: Client,
+        admission: ConcurrencyLimiter,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test streamed response keeps its slot until it's closed."""
+        _, headers = get_authorized_admin_user_data
+        response = client.get(reverse("users_export"), headers=headers)
+        assert response.status_code == 200
+        assert admission.stats()["active"] == 1
+        b"".join(response.streaming_content)
+        response.close()
+        assert admission.stats()["active"] == 0
+
+    def test_async(
+        self, admission: ConcurrencyLimiter, django_user_model: User
+    ) -> None:
+        """Test async views are limited too."""
+        django_user_model.objects.create_user(**TOKEN_DATA)
+        url: str = reverse("async_api:token")
+        admission.acquire()
+        response = async_to_sync(AsyncClient().post)(url, data=TOKEN_DATA)
+        assert response.status_code == 503
+        admission.release()
+        response = async_to_sync(AsyncClient().post)(url, data=TOKEN_DATA)
+        assert response.status_code == 200
+        assert admission.stats()["active"] == 0
+
+    def test_async_cancelled_in_queue(self, settings) -> None:
+        """Test slot taken after queued async request is cancelled is freed."""
+        settings.API_ADMISSION_CLASSES = {
+            "expensive": {"views": ["teams"], "limit": 1, "queue": 1}
+        }
+        limiter: ConcurrencyLimiter = get_limiter("expensive")
+
+        async def get_response(request):
+            return HttpResponse()
+
+        async def cancel() -> None:
+            middleware = AdmissionControlMiddleware(get_response)
+            task = asyncio.ensure_future(
+                middleware(RequestFactory().get(reverse("teams")))
+            )
+            while limiter.stats()["waiting"] == 0:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            limiter.release()
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if limiter.stats()["active"] == 0:
+                    break
+
+        limiter.acquire()
+        async_to_sync(cancel)()
+        assert limiter.stats()["queued"] == 1
+        assert limiter.stats()["active"] == 0
@@ -0,0 +1,350 @@
+"""Module for testing api app async views."""
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from django.test import Client
+from django.urls import reverse
+from faker import Faker
+
+from api import async_views
+from api.models import Team, User
+from tests.api.factories import TeamFactory, UserFactory
+
+TOKEN_DATA: Dict = {"email": "test@gmail.com", "password": "password"}
+
+
+class AnyPasswordBackend(BaseBackend):
+    """Backend accepting any password of existing user."""
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        """Get user by email only."""
+        return User.objects.filter(email=email).first()
+
+
+@pytest.mark.django_db
+class TestAsyncRegisterView:
+    """Class for testing AsyncRegisterView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_register_view(self, faker: Faker, client: Client) -> None:
+        """Test AsyncRegisterView creates user with hashed password."""
+        data: Dict = {
+            "email": faker.email(),
+            "password": faker.pystr(min_chars=1, max_chars=40),
+            "first_name": faker.first_name(),
+            "last_name": faker.last_name(),
+            "team": TeamFactory().id,
+        }
+        url: str = reverse("async_api:sign_up")
+        response = client.post(url, data=data)
+        result: Dict = response.json()
+        assert response.status_code == 201
+        for key, value in data.items():
+            if key != "password":
+                assert result[key] == value
+        assert User.objects.get(pk=result["id"]).check_password(data["password"])
+
+    def test_register_view_invalid_data(self, faker: Faker, client: Client) -> None:
+        """Test AsyncRegisterView returns validation errors."""
+        url: str = reverse("async_api:sign_up")
+        response = client.post(
+            url, data={"email": faker.email()}, content_type="application/json"
+        )
+        assert response.status_code == 400
+        assert "password" in response.json()
+
+    def test_register_view_unsupported_media_type(self, client: Client) -> None:
+        """Test AsyncRegisterView rejects unknown content types."""
+        url: str = reverse("async_api:sign_up")
+        response = client.post(url, data="email", content_type="text/plain")
+        assert response.status_code == 415
+
+
+@pytest.mark.django_db
+class TestAsyncTokenObtainPairView:
+    """Class for testing AsyncTokenObtainPairView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_token_obtain(self, client: Client, django_user_model: User) -> None:
+        """Test issued access token authenticates requests."""
+        user: User = django_user_model.objects.create_user(
+            email="test@gmail.com", password="password"
+        )
+        url: str = reverse("async_api:token")
+        data: Dict = {"email": user.email, "password": "password"}
+        response = client.post(url, data=data)
+        assert response.status_code == 200
+        headers: Dict = {"Authorization": f"Bearer {response.json()['access']}"}
+        assert client.get(reverse("teams"), headers=headers).status_code == 200
+        user.refresh_from_db()
+        assert user.last_login is not None
+
+    @pytest.mark.parametrize("email", ["test@gmail.com", "unknown@gmail.com"])
+    def test_token_obtain_invalid_credentials(
+        self, email: str, client: Client, django_user_model: User
+    ) -> None:
+        """Test wrong password and unknown email are rejected alike."""
+        django_user_model.objects.create_user(
+            email="test@gmail.com", password="password"
+        )
+        url: str = reverse("async_api:token")
+        response = client.post(url, data={"email": email, "password": "wrong"})
+        assert response.status_code == 401
+        assert response.json() == {
+            "detail": "No active account found with the given credentials"
+        }
+
+    def test_token_obtain_inactive(
+        self, client: Client, django_user_model: User, monkeypatch
+    ) -> None:
+        """Test inactive user password is checked too and failure is signalled."""
+        django_user_model.objects.create_user(
+            email="test@gmail.com", password="password", is_active=False
+        )
+        checked: List[str] = []
+        failed: List[Dict] = []
+        check = async_views.acheck_password
+
+        async def acheck_password(password: str, encoded: str) -> bool:
+            checked.append(password)
+            return await check(password, encoded)
+
+        def receiver(sender, credentials: Dict, **kwargs) -> None:
+            failed.append(credentials)
+
+        monkeypatch.setattr(async_views, "acheck_password", acheck_password)
+        user_login_failed.connect(receiver)
+        try:
+            response = client.post(reverse("async_api:token"), data=TOKEN_DATA)
+        finally:
+            user_login_failed.disconnect(receiver)
+        assert response.status_code == 401
+        assert checked == ["password"]
+        assert failed == [{"email": "test@gmail.com", "password": "*" * 20}]
+
+    def test_token_obtain_upgrades_hash(
+        self, client: Client, django_user_model: User
+    ) -> None:
+        """Test password hashed by outdated hasher is rehashed on login."""
+        user: User = django_user_model.objects.create_user(email="test@gmail.com")
+        user.password = make_password("password", hasher="pbkdf2_sha1")
+        user.save()
+        response = client.post(reverse("async_api:token"), data=TOKEN_DATA)
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$")
+        assert user.check_password("password")
+
+    def test_token_obtain_custom_backend(
+        self, client: Client, settings, django_user_model: User
+    ) -> None:
+        """Test configured authentication backends are used."""
+        settings.AUTHENTICATION_BACKENDS = [
+            "tests.api.test_async_views.AnyPasswordBackend"
+        ]
+        django_user_model.objects.create_user(
+            email="test@gmail.com", password="password"
+        )
+        data: Dict = {"email": "test@gmail.com", "password": "wrong"}
+        response = client.post(reverse("async_api:token"), data=data)
+        assert response.status_code == 200
+
+    def test_token_obtain_missing_fields(self, client: Client) -> None:
+        """Test missing credentials are reported as validation errors."""
+        url: str = reverse("async_api:token")
+        response = client.post(url, data={}, content_type="application/json")
+        assert response.status_code == 400
+        assert set(response.json()) == {"email", "password"}
+
+
+@pytest.mark.django_db
+class TestAsyncUserViews:
+    """Class for testing AsyncUserView and AsyncUsersView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_get_user_same_as_sync(
+        self, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test async user response is identical to sync one."""
+        _, headers = get_authorized_user_data
+        user: User = UserFactory()
+        sync_response = client.get(reverse("user", args=[user.pk]), headers=headers)
+        response = client.get(
+            reverse("async_api:user", args=[user.pk]), headers=headers
+        )
+        assert response.status_code == 200
+        assert response.content == sync_response.content
+
+    @pytest.mark.parametrize("query", ["", "?page_size=2"])
+    def test_list_users_same_as_sync(
+        self, query: str, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test async users list, plain and paginated, is identical to sync one."""
+        _, headers = get_authorized_user_data
+        UserFactory.create_batch(3)
+        sync_response = client.get(reverse("users") + query, headers=headers)
+        response = client.get(reverse("async_api:users") + query, headers=headers)
+        assert response.status_code == 200
+        if query:
+            sync_result: Dict = sync_response.json()
+            result: Dict = response.json()
+            assert result["results"] == sync_result["results"]
+            assert result["next"].split("?")[1] == sync_result["next"].split("?")[1]
+        else:
+            assert response.content == sync_response.content
+
+    def test_get_user_not_found(
+        self, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test missing user gets the same 404 response as sync view."""
+        _, headers = get_authorized_user_data
+        sync_response = client.get(reverse("user", args=[0]), headers=headers)
+        response = client.get(reverse("async_api:user", args=[0]), headers=headers)
+        assert response.status_code == 404
+        assert response.json() == sync_response.json()
+
+    def test_update_user(
+        self,
+        faker: Faker,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test admin updates user fully and partially."""
+        _, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("async_api:user", args=[user.pk])
+        data: Dict = {
+            "email": faker.email(),
+            "first_name": faker.first_name(),
+            "last_name": faker.last_name(),
+            "team": TeamFactory().id,
+        }
+        response = client.put(url, data=json.dumps(data), headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"id": user.pk, **data}
+        response = client.patch(
+            url, data=json.dumps({"first_name": "Jane"}), headers=headers
+        )
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.first_name == "Jane"
+        assert user.email == data["email"]
+
+    def test_update_user_invalid_data(
+        self, client: Client, get_authorized_admin_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test invalid data is reported as validation errors."""
+        _, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("async_api:user", args=[user.pk])
+        response = client.patch(url, data=json.dumps({"team": 0}), headers=headers)
+        assert response.status_code == 400
+        assert "team" in response.json()
+
+    def test_delete_user(
+        self, client: Client, get_authorized_admin_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test admin deletes user."""
+        _, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        response = client.delete(
+            reverse("async_api:user", args=[user.pk]), headers=headers
+        )
+        assert response.status_code == 204
+        assert not User.objects.filter(pk=user.pk).exists()
+
+    def test_write_forbidden_for_regular_user(
+        self, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test regular user can't change users."""
+        _, headers = get_authorized_user_data
+        user: User = UserFactory()
+        url: str = reverse("async_api:user", args=[user.pk])
+        response = client.delete(url, headers=headers)
+        assert response.status_code == 403
+        assert User.objects.filter(pk=user.pk).exists()
+
+    def test_anonymous_user_unauthorized(self, client: Client) -> None:
+        """Test anonymous request is asked to authenticate."""
+        response = client.get(reverse("async_api:users"))
+        assert response.status_code == 401
+        assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    def test_invalid_token_unauthorized(self, client: Client) -> None:
+        """Test invalid token is rejected like in sync views."""
+        headers: Dict = {"Authorization": "Bearer invalid"}
+        sync_response = client.get(reverse("users"), headers=headers)
+        response = client.get(reverse("async_api:users"), headers=headers)
+        assert response.status_code == 401
+        assert response.json() == sync_response.json()
+
+
+@pytest.mark.django_db
+class TestAsyncTeamViews:
+    """Class for testing AsyncTeamView and AsyncTeamsView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_create_team(
+        self,
+        faker: Faker,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test admin creates team."""
+        _, headers = get_authorized_admin_user_data
+        name: str = faker.company()
+        response = client.post(
+            reverse("async_api:teams"),
+            data={"name": name},
+            content_type="application/json",
+            headers=headers,
+        )
+        result: Dict = response.json()
+        assert response.status_code == 201
+        assert result == {"id": Team.objects.get(name=name).pk, "name": name}
+
+    def test_list_teams_same_as_sync(
+        self, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test async teams list is identical to sync one."""
+        _, headers = get_authorized_user_data
+        TeamFactory.create_batch(3)
+        sync_response = client.get(reverse("teams"), headers=headers)
+        response = client.get(reverse("async_api:teams"), headers=headers)
+        assert response.status_code == 200
+        assert response.content == sync_response.content
+
+    def test_update_and_delete_team(
+        self, client: Client, get_authorized_admin_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test admin updates and deletes team."""
+        _, headers = get_authorized_admin_user_data
+        team: Team = TeamFactory()
+        url: str = reverse("async_api:team", args=[team.pk])
+        response = client.put(
+            url, data=json.dumps({"name": "Renamed"}), headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json() == {"id": team.pk, "name": "Renamed"}
+        assert client.delete(url, headers=headers).status_code == 204
+        assert not Team.objects.filter(pk=team.pk).exists()
+
+    def test_method_not_allowed(
+        self, client: Client, get_authorized_admin_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test team can't be patched, as in sync view."""
+        _, headers = get_authorized_admin_user_data
+        team: Team = TeamFactory()
+        url: str = reverse("async_api:team", args=[team.pk])
+        response = client.patch(
+            url, data=json.dumps({"name": "Renamed"}), headers=headers
+        )
+        assert response.status_code == 405
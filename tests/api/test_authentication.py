@@ -0,0 +1,77 @@
+"""Module for testing api app authentication."""
+from typing import Dict, Tuple
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from api.authentication import token_cache
+from api.models import User
+from tests.api.factories import TeamFactory
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Class for testing CachedJWTAuthentication."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_repeated_request_without_queries(
+        self,
+        client: Client,
+        django_assert_num_queries,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test cached token and response make repeated GET query free."""
+        current_user, headers = get_authorized_user_data
+        TeamFactory.create_batch(size=2)
+        url: str = reverse("teams")
+        client.get(url, headers=headers)
+        with django_assert_num_queries(0):
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert token_cache.stats()["hits"] == 1
+
+    def test_deactivated_user_invalidated(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test cached user entry is dropped when user is deactivated."""
+        current_user, headers = get_authorized_user_data
+        url: str = reverse("teams")
+        assert client.get(url, headers=headers).status_code == 200
+        current_user.is_active = False
+        current_user.save()
+        assert token_cache.stats()["size"] == 0
+        assert client.get(url, headers=headers).status_code == 401
+
+    def test_unrelated_change_keeps_entry(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test changes of fields not used by authentication keep entry."""
+        current_user, headers = get_authorized_user_data
+        client.get(reverse("teams"), headers=headers)
+        current_user.first_name = "Alex"
+        current_user.save()
+        assert token_cache.stats()["size"] == 1
+
+    def test_max_size(
+        self,
+        client: Client,
+        settings,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test least recently used entries are evicted over max size."""
+        settings.API_AUTH_CACHE_MAX_SIZE = 1
+        current_user, headers = get_authorized_user_data
+        token_data: Dict = {"email": current_user.email, "password": "password"}
+        access_token: str = client.post(reverse("token"), data=token_data).json()[
+            "access"
+        ]
+        for authorization in (headers["Authorization"], f"Bearer {access_token}"):
+            client.get(reverse("teams"), headers={"Authorization": authorization})
+        assert token_cache.stats()["size"] == 1
+        assert token_cache.stats()["evictions"] == 1
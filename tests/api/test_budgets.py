@@ -0,0 +1,117 @@
+"""Module for testing api app endpoints query budgets."""
+from typing import Dict, List, Tuple
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+
+from api import urls
+from api.authentication import token_cache
+from api.benchmarks import BENCHMARK_PASSWORD, SCENARIOS, Dataset, Scenario, send
+from api.models import Team, User
+from api.serializers import UserSerializer
+from api.views import UsersView
+from tests.api.budgets import QUERY_BUDGETS, assert_query_budget, format_queries
+from tests.api.factories import TeamFactory, UserFactory
+
+SIZES: Tuple[int, ...] = (10, 1000)
+# Users are spread over few teams, so rosters grow with dataset too.
+TEAMS_WITH_USERS: int = 5
+
+
+class TeamNameUserSerializer(UserSerializer):
+    """User serializer exposing team name, which costs query per user."""
+
+    team_name = serializers.CharField(source="team.name", read_only=True)
+
+    class Meta(UserSerializer.Meta):
+        """Class Meta for TeamNameUserSerializer class."""
+
+        fields = [*UserSerializer.Meta.fields, "team_name"]
+
+
+def seed(size: int) -> Tuple[int, int]:
+    """Grow dataset to 'size' teams and users, get their first ids."""
+    Team.objects.bulk_create(TeamFactory.build_batch(size - Team.objects.count()))
+    teams: List[Team] = list(Team.objects.order_by("id")[:TEAMS_WITH_USERS])
+    members = User.objects.filter(is_superuser=False)
+    User.objects.bulk_create(
+        UserFactory.build(
+            team=teams[number % TEAMS_WITH_USERS],
+            email=f"member{size}-{number}@example.com",
+        )
+        for number in range(members.count(), size)
+    )
+    return teams[0].pk, members.order_by("id").values_list("id", flat=True)[0]
+
+
+def measure(client: Client, scenario: Scenario) -> List[CaptureQueriesContext]:
+    """Send scenario request at every dataset size, get queries of each."""
+    User.objects.create_superuser(
+        email="benchmark@example.com", password=BENCHMARK_PASSWORD
+    )
+    tokens: Dict = client.post(
+        reverse("token"),
+        {"email": "benchmark@example.com", "password": BENCHMARK_PASSWORD},
+    ).json()
+    captured: List[CaptureQueriesContext] = []
+    for number, size in enumerate(SIZES):
+        first_team_id, first_user_id = seed(size)
+        dataset = Dataset(
+            teams=size,
+            users=size,
+            first_team_id=first_team_id,
+            first_user_id=first_user_id,
+            headers={"Authorization": f"Bearer {tokens['access']}"},
+            refresh=tokens["refresh"],
+        )
+        cache.clear()
+        token_cache.clear()
+        with assert_query_budget(scenario.url_name) as queries:
+            assert send(client, scenario, dataset, number) < 400
+        captured.append(queries)
+    return captured
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Class for testing endpoints keep to query budgets at any data size."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_budgets_cover_routes(self) -> None:
+        """Test every route has budget and is requested by scenario."""
+        url_names = {pattern.name for pattern in urls.urlpatterns}
+        assert set(QUERY_BUDGETS) == url_names
+        assert {scenario.url_name for scenario in SCENARIOS} == url_names
+
+    @pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda item: item.name)
+    def test_budget(self, client: Client, scenario: Scenario) -> None:
+        """Test query count is within budget and doesn't grow with rows."""
+        small, large = measure(client, scenario)
+        assert len(small) == len(large), (
+            f"{scenario.name} queries grow with rows from {len(small)} "
+            f"to {len(large)}:\n{format_queries(large)}"
+        )
+
+    def test_query_per_row_caught(self, client: Client, monkeypatch) -> None:
+        """Test serializer querying related object per row exceeds budget."""
+        monkeypatch.setattr(UsersView, "serializer_class", TeamNameUserSerializer)
+        scenario: Scenario = next(
+            item for item in SCENARIOS if item.name == "users:get"
+        )
+        with pytest.raises(pytest.fail.Exception, match=r"users made \d+ queries"):
+            measure(client, scenario)
+
+    def test_over_budget_lists_queries(self) -> None:
+        """Test failure message lists every statement of block."""
+        message: str = (
+            r"(?s)teams made 3 queries, budget is 2:\n1\. SELECT .*\n3\. SELECT"
+        )
+        with pytest.raises(pytest.fail.Exception, match=message):
+            with assert_query_budget("teams"):
+                for _ in range(3):
+                    Team.objects.exists()
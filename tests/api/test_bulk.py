@@ -0,0 +1,513 @@
+"""Module for testing api app bulk operations."""
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from faker import Faker
+
+from api import hashing
+from api.models import Team, User
+from api.signals import users_moved
+from tests.api.factories import TeamFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestUsersImportView:
+    """Class for testing UsersImportView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_import_csv(
+        self,
+        faker: Faker,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are created from csv with per-row errors reported."""
+        settings.API_IMPORT_CHUNK_SIZE = 2
+        settings.API_IMPORT_HASH_WORKERS = 2
+        settings.API_IMPORT_HASH_POOL_MIN_ROWS = 2
+        current_user, headers = get_authorized_admin_user_data
+        team: Team = TeamFactory()
+        existing: User = UserFactory()
+        emails: List[str] = [faker.unique.email() for _ in range(4)]
+        content: str = "\n".join(
+            [
+                "email,first_name,last_name,password,team",
+                f"{emails[0]},Alex,Alan,secret1,{team.pk}",
+                f"{emails[1]},,,secret2,",
+                f"{existing.email},Bob,Brown,secret3,",
+                "not-an-email,Bob,Brown,secret4,",
+                f"{emails[2]},Bob,Brown,secret5,{team.pk + 1000}",
+                f"{emails[1]},Bob,Brown,secret6,",
+                f"{emails[3]},Bob,Brown,secret7,0",
+            ]
+        )
+        url: str = reverse("users_import")
+        response = client.post(
+            url,
+            data=content,
+            content_type="text/csv",
+            headers={"Authorization": headers["Authorization"]},
+        )
+        result: Dict = response.json()
+        assert response.status_code == 200
+        assert result["created"] == 2
+        assert [error["row"] for error in result["errors"]] == [3, 4, 5, 6, 7]
+        assert set(result["errors"][0]["errors"]) == {"email"}
+        assert set(result["errors"][2]["errors"]) == {"team"}
+        assert set(result["errors"][4]["errors"]) == {"team"}
+        user: User = User.objects.get(email=emails[0])
+        assert user.team == team
+        assert user.check_password("secret1")
+        assert User.objects.get(email=emails[1]).team is None
+
+    def test_import_ndjson(
+        self,
+        faker: Faker,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are created from ndjson and malformed lines reported."""
+        settings.API_IMPORT_HASH_WORKERS = 0
+        current_user, headers = get_authorized_admin_user_data
+        rows: List[str] = [
+            json.dumps({"email": faker.unique.email(), "password": "secret"}),
+            "{not json",
+            json.dumps({"email": faker.unique.email()}),
+        ]
+        url: str = reverse("users_import")
+        response = client.post(
+            url,
+            data="\n".join(rows),
+            content_type="application/x-ndjson",
+            headers={"Authorization": headers["Authorization"]},
+        )
+        result: Dict = response.json()
+        assert response.status_code == 200
+        assert result["created"] == 1
+        assert result["errors"][0]["row"] == 2
+        assert result["errors"][1] == {
+            "row": 3,
+            "errors": {"password": ["This field is required."]},
+        }
+
+    def test_small_chunk_hashed_inline(
+        self,
+        faker: Faker,
+        client: Client,
+        settings,
+        monkeypatch,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test chunks below pool threshold don't start hashing processes."""
+        settings.API_IMPORT_HASH_WORKERS = 2
+        monkeypatch.setattr(hashing, "get_hash_executor", None)
+        current_user, headers = get_authorized_admin_user_data
+        rows: List[str] = [
+            json.dumps({"email": faker.unique.email(), "password": "secret"})
+            for _ in range(2)
+        ]
+        response = client.post(
+            reverse("users_import"),
+            data="\n".join(rows),
+            content_type="application/x-ndjson",
+            headers={"Authorization": headers["Authorization"]},
+        )
+        assert response.json()["created"] == 2
+
+    def test_hash_pool_shared(self, settings) -> None:
+        """Test hashing process pool is created once per process and size."""
+        settings.API_IMPORT_HASH_WORKERS = 2
+        assert hashing.get_hash_executor() is hashing.get_hash_executor()
+
+    def test_import_invalid_encoding(
+        self,
+        faker: Faker,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test body which isn't UTF-8 is rejected with its line number."""
+        current_user, headers = get_authorized_admin_user_data
+        content: bytes = "\n".join(
+            [
+                "email,first_name,last_name,password,team",
+                f"{faker.unique.email()},Alex,Alan,secret1,",
+                f"{faker.unique.email()},Jürgen,Brown,secret2,",
+            ]
+        ).encode("latin-1")
+        response = client.post(
+            reverse("users_import"),
+            data=content,
+            content_type="text/csv",
+            headers={"Authorization": headers["Authorization"]},
+        )
+        assert response.status_code == 400
+        assert response.json() == {
+            "non_field_errors": ["Line 3 is not valid UTF-8 text."]
+        }
+
+    def test_import_unsupported_media_type(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test import rejects unknown content types."""
+        current_user, headers = get_authorized_admin_user_data
+        url: str = reverse("users_import")
+        response = client.post(
+            url, data="{}", content_type="application/json", headers=headers
+        )
+        assert response.status_code == 415
+
+    def test_import_not_admin_user(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test import is allowed only for admin users."""
+        current_user, headers = get_authorized_user_data
+        url: str = reverse("users_import")
+        response = client.post(
+            url,
+            data="email,password\n",
+            content_type="text/csv",
+            headers={"Authorization": headers["Authorization"]},
+        )
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestUsersExportView:
+    """Class for testing UsersExportView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_export_csv(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are streamed as csv with team names."""
+        current_user, headers = get_authorized_admin_user_data
+        users: List[User] = UserFactory.create_batch(size=3)
+        url: str = reverse("users_export")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.streaming
+        lines: List[str] = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0] == "id,email,first_name,last_name,team,team_name"
+        assert len(lines) == 5
+        for user in users:
+            expected: str = (
+                f"{user.id},{user.email},{user.first_name},{user.last_name},"
+                f"{user.team.id},{user.team.name}"
+            )
+            assert any(line == expected for line in lines)
+
+    def test_export_ndjson(
+        self,
+        client: Client,
+        django_assert_num_queries,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are streamed as ndjson with team joined in one query."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=3)
+        url: str = reverse("users_export") + "?output=ndjson"
+        response = client.get(url, headers=headers)
+        with django_assert_num_queries(1):
+            content: bytes = b"".join(response.streaming_content)
+        rows: List[Dict] = [json.loads(line) for line in content.splitlines()]
+        assert len(rows) == 4
+        assert rows[0] == {
+            "id": current_user.id,
+            "email": current_user.email,
+            "first_name": "",
+            "last_name": "",
+            "team": None,
+            "team_name": None,
+        }
+
+    def test_export_unknown_output(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test unknown output format is rejected."""
+        current_user, headers = get_authorized_admin_user_data
+        url: str = reverse("users_export") + "?output=xml"
+        response = client.get(url, headers=headers)
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestUsersMoveView:
+    """Class for testing UsersMoveView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_move_users_by_ids(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test given users are moved with one UPDATE and one notification."""
+        current_user, headers = get_authorized_admin_user_data
+        users: List[User] = UserFactory.create_batch(size=3)
+        team: Team = TeamFactory()
+        notifications: List[Dict] = []
+
+        def receiver(sender, **kwargs):
+            notifications.append(kwargs)
+
+        users_moved.connect(receiver, sender=User)
+        url: str = reverse("users_move")
+        data: Dict = {"team": team.pk, "users": [user.pk for user in users[:2]]}
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.post(
+                    url, data=data, content_type="application/json", headers=headers
+                )
+        finally:
+            users_moved.disconnect(receiver, sender=User)
+        assert response.status_code == 200
+        assert response.json() == {"moved": 2}
+        updates: List[str] = [
+            query["sql"] for query in queries if query["sql"].startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+        assert len(notifications) == 1
+        assert notifications[0]["count"] == 2
+        assert set(team.user_set.all()) == set(users[:2])
+        users[2].refresh_from_db()
+        assert users[2].team != team
+
+    def test_move_source_team_members(
+        self,
+        faker: Faker,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test all members of source team are moved, others are kept."""
+        current_user, headers = get_authorized_admin_user_data
+        source: Team = TeamFactory()
+        User.objects.bulk_create(
+            User(email=faker.unique.email(), team=source) for _ in range(5)
+        )
+        other: User = UserFactory()
+        team: Team = TeamFactory()
+        url: str = reverse("users_move")
+        data: Dict = {"team": team.pk, "source_team": source.pk}
+        response = client.post(
+            url, data=data, content_type="application/json", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json() == {"moved": 5}
+        assert team.user_set.count() == 5
+        assert not source.user_set.exists()
+        other.refresh_from_db()
+        assert other.team != team
+
+    def test_move_invalidates_cached_responses(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test cached user responses are rebuilt after move."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        team: Team = TeamFactory()
+        user_url: str = reverse("user", args=[user.pk])
+        assert client.get(user_url, headers=headers).json()["team"] == user.team.pk
+        data: Dict = {"team": team.pk, "users": [user.pk]}
+        client.post(
+            reverse("users_move"),
+            data=data,
+            content_type="application/json",
+            headers=headers,
+        )
+        assert client.get(user_url, headers=headers).json()["team"] == team.pk
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"users": [1]},
+            {"team": 0, "users": [1]},
+            {"team": None},
+            {"team": None, "users": [1], "source_team": None},
+            {"team": None, "users": []},
+        ],
+    )
+    def test_move_validation_errors(
+        self,
+        data: Dict,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test request without team or with both or none of sources fails."""
+        current_user, headers = get_authorized_admin_user_data
+        team: Team = TeamFactory()
+        data = {key: team.pk if value is None else value for key, value in data.items()}
+        response = client.post(
+            reverse("users_move"),
+            data=data,
+            content_type="application/json",
+            headers=headers,
+        )
+        assert response.status_code == 400
+
+    def test_move_not_admin_user(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test move is allowed only for admin users."""
+        current_user, headers = get_authorized_user_data
+        team: Team = TeamFactory()
+        data: Dict = {"team": team.pk, "users": [current_user.pk]}
+        response = client.post(
+            reverse("users_move"),
+            data=data,
+            content_type="application/json",
+            headers=headers,
+        )
+        assert response.status_code == 403
+        current_user.refresh_from_db()
+        assert current_user.team is None
+
+
+@pytest.mark.django_db
+class TestUsersBulkUpdateView:
+    """Class for testing bulk partial update of UsersView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_bulk_update(
+        self,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are updated in batches, loading rows with one query each."""
+        settings.API_BULK_UPDATE_BATCH_SIZE = 2
+        current_user, headers = get_authorized_admin_user_data
+        users: List[User] = UserFactory.create_batch(size=5)
+        team: Team = TeamFactory()
+        items: List[Dict] = [
+            {"id": users[0].pk, "first_name": "Alex", "team": team.pk},
+            {"id": users[1].pk, "last_name": "Alan"},
+            {"id": users[2].pk, "team": None},
+            {"id": users[3].pk, "first_name": "Bob", "last_name": ""},
+            {"id": users[4].pk, "team": team.pk},
+        ]
+        url: str = reverse("users")
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(url, data=json.dumps(items), headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"updated": 5, "errors": []}
+        statements: List[str] = [query["sql"] for query in queries]
+        assert len([sql for sql in statements if sql.startswith("UPDATE")]) == 3
+        assert len([sql for sql in statements if 'FROM "api_team"' in sql]) == 1
+        # Rows are locked in transaction updating them.
+        locked: List[int] = [
+            number
+            for number, sql in enumerate(statements)
+            if 'FROM "api_user"' in sql and sql.endswith("FOR UPDATE")
+        ]
+        assert len(locked) == 1
+        assert statements[locked[0] - 1].startswith("SAVEPOINT")
+        start: int = locked[0]
+        updates: List[str] = statements[start:]
+        first_update: int = next(
+            number for number, sql in enumerate(updates) if sql.startswith("UPDATE")
+        )
+        assert not [sql for sql in updates[:first_update] if "SAVEPOINT" in sql]
+        for user in users:
+            user.refresh_from_db()
+        assert (users[0].first_name, users[0].team) == ("Alex", team)
+        assert users[1].last_name == "Alan"
+        assert users[1].first_name != "Alex"
+        assert users[2].team is None
+        assert (users[3].first_name, users[3].last_name) == ("Bob", "")
+        assert users[4].team == team
+
+    def test_bulk_update_partial_failures(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test invalid items are reported by index and valid ones are saved."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        items: List = [
+            {"id": user.pk, "first_name": "Alex"},
+            "not an object",
+            {"first_name": "Bob"},
+            {"id": user.pk + 1000, "first_name": "Bob"},
+            {"id": user.pk, "first_name": "Bob"},
+            {"id": current_user.pk, "team": user.team.pk + 1000},
+            {"id": current_user.pk, "last_name": "x" * 151},
+            {"id": current_user.pk, "team": 0},
+        ]
+        url: str = reverse("users")
+        response = client.patch(url, data=json.dumps(items), headers=headers)
+        result: Dict = response.json()
+        assert response.status_code == 200
+        assert result["updated"] == 1
+        assert [error["index"] for error in result["errors"]] == [1, 2, 3, 4, 5, 6, 7]
+        assert [set(error["errors"]) for error in result["errors"]] == [
+            {"non_field_errors"},
+            {"id"},
+            {"id"},
+            {"id"},
+            {"team"},
+            {"last_name"},
+            {"team"},
+        ]
+        user.refresh_from_db()
+        assert user.first_name == "Alex"
+
+    def test_bulk_update_invalidates_cached_responses(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test cached user responses are rebuilt after bulk update."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        user_url: str = reverse("user", args=[user.pk])
+        client.get(user_url, headers=headers)
+        items: List[Dict] = [{"id": user.pk, "first_name": "Changed"}]
+        client.patch(reverse("users"), data=json.dumps(items), headers=headers)
+        assert client.get(user_url, headers=headers).json()["first_name"] == "Changed"
+
+    def test_bulk_update_not_list(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test request body must be list of items."""
+        current_user, headers = get_authorized_admin_user_data
+        data: str = json.dumps({"id": current_user.pk})
+        response = client.patch(reverse("users"), data=data, headers=headers)
+        assert response.status_code == 400
+
+    def test_bulk_update_not_admin_user(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test bulk update is allowed only for admin users."""
+        current_user, headers = get_authorized_user_data
+        items: List[Dict] = [{"id": current_user.pk, "first_name": "Alex"}]
+        response = client.patch(
+            reverse("users"), data=json.dumps(items), headers=headers
+        )
+        assert response.status_code == 403
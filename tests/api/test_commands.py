@@ -0,0 +1,216 @@
+"""Module for testing api app management commands."""
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from django.contrib.auth.hashers import get_hashers
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api import urls
+from api.benchmarks import Scenario
+from api.management.commands import benchmark_endpoints
+from api.models import Team, User
+from api.seeding import RowsReader
+
+
+class TestBenchmarkHashersCommand:
+    """Class for testing benchmark_hashers command."""
+
+    def test_report(self, settings) -> None:
+        """Test command reports throughput of every configured hasher."""
+        settings.PASSWORD_HASHERS = [
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+        out = StringIO()
+        call_command("benchmark_hashers", seconds=0.05, processes=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0] for line in lines] == ["pbkdf2_sha256", "md5"]
+        assert all("per core" in line for line in lines)
+
+    def test_configured_hashers(self) -> None:
+        """Test hashers without installed library are reported unavailable."""
+        out = StringIO()
+        call_command("benchmark_hashers", seconds=0.01, processes=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0] for line in lines] == [
+            hasher.algorithm for hasher in get_hashers()
+        ]
+        for line, hasher in zip(lines, get_hashers()):
+            try:
+                if hasher.library is not None:
+                    hasher._load_library()
+            except ValueError:
+                assert " unavailable (" in line
+            else:
+                assert "per core" in line
+
+
+class TestReportStartupCommand:
+    """Class for testing report_startup command."""
+
+    def run_report(self, **options) -> Dict:
+        """Run command with json output and get report."""
+        out = StringIO()
+        call_command("report_startup", json=True, top=1000, stdout=out, **options)
+        return json.loads(out.getvalue())
+
+    def test_report(self) -> None:
+        """Test command reports startup totals and breakdown by package."""
+        report: Dict = self.run_report()
+        assert report["docs_enabled"] is True
+        assert report["startup_ms"] > 0
+        assert report["max_rss_kb"] > 0
+        assert "django" in report["import_ms"]
+        assert "drf_yasg" in report["import_ms"]
+        assert "django" in report["memory_kb"]
+
+    def test_report_no_docs(self) -> None:
+        """Test lean startup loads neither docs packages nor coreapi."""
+        report: Dict = self.run_report(no_docs=True)
+        assert report["docs_enabled"] is False
+        assert "drf_yasg" not in report["import_ms"]
+        # Blocked coreapi import is listed, but pkg_resources it loads is not.
+        assert "pkg_resources" not in report["import_ms"]
+        for package in ("drf_yasg", "coreapi", "coreschema"):
+            assert package not in report["memory_kb"]
+
+    def test_text_report(self) -> None:
+        """Test command writes summary and sections as text by default."""
+        out = StringIO()
+        call_command("report_startup", top=2, stdout=out)
+        lines: List[str] = out.getvalue().splitlines()
+        assert lines[0].startswith("startup: ")
+        assert lines[1] == "import time by package, ms:"
+        assert lines[4] == "allocated memory by package, KB:"
+        assert len(lines) == 7
+
+
+@pytest.mark.django_db
+class TestBenchmarkEndpointsCommand:
+    """Class for testing benchmark_endpoints command."""
+
+    def run_benchmark(self, tmp_path: Path, **options) -> Dict:
+        """Run command on small dataset and get written report."""
+        output: Path = tmp_path / "report.json"
+        call_command(
+            "benchmark_endpoints",
+            teams=5,
+            users=50,
+            requests=2,
+            output=str(output),
+            stdout=StringIO(),
+            **options,
+        )
+        return json.loads(output.read_text())
+
+    def test_report(self, tmp_path: Path) -> None:
+        """Test every api route is measured and seeded rows are rolled back."""
+        report: Dict = self.run_benchmark(tmp_path)
+        url_names = {pattern.name for pattern in urls.urlpatterns}
+        assert {name.split(":")[0] for name in report["routes"]} == url_names
+        for result in report["routes"].values():
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+            assert result["peak_memory_kb"] > 0
+            assert all(int(status) < 400 for status in result["statuses"])
+        assert report["routes"]["users:get"]["queries"] > 0
+        assert not User.objects.exists()
+        assert not Team.objects.exists()
+
+    def test_allowed_host(self, tmp_path: Path, settings) -> None:
+        """Test requests are sent to host allowed by settings."""
+        settings.ALLOWED_HOSTS = [".api.example.com"]
+        report: Dict = self.run_benchmark(tmp_path, only=["teams"])
+        assert report["routes"]["teams:get"]["statuses"] == {"200": 2}
+
+    def test_existing_rows(self, tmp_path: Path) -> None:
+        """Test seeded and created emails don't clash with rows in database."""
+        User.objects.create_user(email="benchmark@example.com")
+        User.objects.create_user(email="user1@example.com")
+        report: Dict = self.run_benchmark(tmp_path, only=["token", "sign_up"])
+        assert set(report["routes"]) == {"token:post", "sign_up:post"}
+        assert User.objects.count() == 2
+
+    @pytest.mark.django_db(databases=["default", "replica"])
+    def test_replicas_not_read(self, tmp_path: Path, settings) -> None:
+        """Test reads see rows seeded in transaction, replicas don't have them."""
+        settings.API_DATABASE_REPLICAS = ["replica"]
+        report: Dict = self.run_benchmark(tmp_path, only=["user", "team_roster"])
+        assert report["routes"]["user:get"]["statuses"] == {"200": 2}
+
+    def test_no_requests(self) -> None:
+        """Test at least one timed request is required."""
+        with pytest.raises(CommandError, match="At least one timed request"):
+            call_command("benchmark_endpoints", requests=0, stdout=StringIO())
+
+    def test_failed_request(self, tmp_path: Path, monkeypatch) -> None:
+        """Test command fails when request isn't successful."""
+        monkeypatch.setattr(
+            benchmark_endpoints,
+            "SCENARIOS",
+            [Scenario("team", "get", lambda dataset, number: [[0], "", None, None])],
+        )
+        with pytest.raises(CommandError, match="team:get returned 404 status"):
+            self.run_benchmark(tmp_path)
+
+    def test_baseline_regression(self, tmp_path: Path) -> None:
+        """Test command fails when route does more queries than in baseline."""
+        report: Dict = self.run_benchmark(tmp_path, only=["teams"])
+        report["routes"]["teams:get"]["queries"] -= 1
+        baseline: Path = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report))
+        with pytest.raises(CommandError, match="teams:get queries"):
+            self.run_benchmark(tmp_path, only=["teams"], baseline=str(baseline))
+
+
+@pytest.mark.django_db
+class TestSeedDataCommand:
+    """Class for testing seed_data command."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_seed(self) -> None:
+        """Test teams and users are added with shared password and uneven teams."""
+        out = StringIO()
+        call_command(
+            "seed_data", teams=30, users=3000, password="secret", seed=1, stdout=out
+        )
+        lines: List[str] = out.getvalue().splitlines()
+        assert lines[0].startswith("teams: 30 rows in ")
+        assert lines[1].startswith("users: 3000 rows in ")
+        assert all(line.endswith(" rows/s)") for line in lines)
+        assert Team.objects.count() == 30
+        assert User.objects.count() == 3000
+        assert User.objects.values("password").distinct().count() == 1
+        assert User.objects.order_by("?").first().check_password("secret")
+        sizes: List[int] = [team.user_set.count() for team in Team.objects.all()]
+        assert max(sizes) > 3 * sorted(sizes)[len(sizes) // 2]
+        assert 0 < User.objects.filter(team=None).count() < 300
+
+    def test_seed_after_existing_rows(self) -> None:
+        """Test ids are reserved after existing rows and can be seeded again."""
+        call_command("seed_data", teams=2, users=10, stdout=StringIO())
+        call_command("seed_data", teams=2, users=10, stdout=StringIO())
+        assert User.objects.count() == 20
+        Team.objects.create(name="After")
+
+    def test_seed_nothing(self) -> None:
+        """Test zero teams or users are seeded without touching sequences."""
+        call_command("seed_data", teams=0, users=5, stdout=StringIO())
+        assert not Team.objects.exists()
+        assert User.objects.filter(team=None).count() == 5
+        call_command("seed_data", teams=2, users=0, stdout=StringIO())
+        assert Team.objects.count() == 2
+        assert User.objects.count() == 5
+        with pytest.raises(CommandError, match="can't be negative"):
+            call_command("seed_data", teams=-1, stdout=StringIO())
+
+    def test_rows_reader(self) -> None:
+        """Test reader returns requested sizes across chunks."""
+        reader = RowsReader(iter(["ab", "cde", "f"]))
+        assert reader.read(4) == "abcd"
+        assert reader.read(4) == "ef"
+        assert reader.read(4) == ""
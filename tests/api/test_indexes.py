@@ -0,0 +1,90 @@
+"""Module for testing api app access paths are served by indexes."""
+import random
+from typing import Callable, Dict, Iterator, List
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+
+from api.models import Team, User
+from api.pagination import KeysetPagination
+from api.search import search_users
+from api.seeding import analyze, seed_teams, seed_users
+from api.views import TeamsView, UsersView, roster_queryset
+
+TEAMS_COUNT: int = 2000
+USERS_COUNT: int = 100000
+PAGE_SIZE: int = 100
+
+
+@pytest.fixture(scope="module")
+def seeded(django_db_setup, django_db_blocker) -> Iterator[None]:
+    """Fill tables with large amount of rows once for all tests of module.
+
+    Rows are committed, so tables are truncated when module tests finish.
+    """
+    with django_db_blocker.unblock():
+        team_ids: List[int] = seed_teams(TEAMS_COUNT)
+        seed_users(USERS_COUNT, "!", team_ids, rng=random.Random(0))
+        analyze()
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "TRUNCATE {}, {} CASCADE".format(
+                    connection.ops.quote_name(User._meta.db_table),
+                    connection.ops.quote_name(Team._meta.db_table),
+                )
+            )
+
+
+def keyset_page(view: Callable, position_index: int = 0, reverse: bool = False):
+    """Build queryset of keyset page of view starting at given row."""
+    paginator = KeysetPagination()
+    paginator.ordering = view.keyset_ordering
+    paginator.page_size = PAGE_SIZE
+    queryset: QuerySet = view.queryset.all()
+    position = None
+    if position_index:
+        row = queryset.order_by(*view.keyset_ordering)[position_index]
+        position = paginator.get_position(row)
+    return paginator.get_page_queryset(queryset, position, reverse)
+
+
+def get_querysets() -> Dict[str, Callable[[], QuerySet]]:
+    """Get builders of querysets executed by api views."""
+    return {
+        "user": lambda: User.objects.filter(pk=User.objects.last().pk),
+        "user_by_email": lambda: User.objects.filter(
+            email__iexact="USER500@EXAMPLE.COM"
+        ),
+        "users_first_page": lambda: keyset_page(UsersView),
+        "users_next_page": lambda: keyset_page(UsersView, USERS_COUNT // 2),
+        "users_previous_page": lambda: keyset_page(
+            UsersView, USERS_COUNT // 2, reverse=True
+        ),
+        "team": lambda: Team.objects.filter(pk=Team.objects.last().pk),
+        "teams_first_page": lambda: keyset_page(TeamsView),
+        "teams_next_page": lambda: keyset_page(TeamsView, TEAMS_COUNT // 2),
+        "team_roster": lambda: roster_queryset.filter(pk=Team.objects.last().pk),
+        "team_members": lambda: User.objects.filter(
+            team_id=Team.objects.last().pk
+        ).order_by("last_name", "id"),
+        "teams_roster_members": lambda: User.objects.filter(
+            team_id__in=list(keyset_page(TeamsView).values_list("id", flat=True))
+        ).order_by("last_name", "id"),
+        "users_search": lambda: search_users(User.objects.all(), "user4242")[:20],
+    }
+
+
+@pytest.mark.django_db
+class TestAccessPaths:
+    """Class for testing views querysets plans on large tables."""
+
+    pytestmark = pytest.mark.django_db
+
+    @pytest.mark.parametrize("name", list(get_querysets()))
+    def test_no_seq_scan_or_external_sort(self, name: str, seeded: None) -> None:
+        """Test queryset is served by indexes and sorted in memory if at all."""
+        plan: str = get_querysets()[name]().explain(analyze=True)
+        assert "Seq Scan" not in plan, plan
+        assert "external" not in plan, plan
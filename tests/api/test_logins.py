@@ -0,0 +1,71 @@
+"""Module for testing api app last_login write-behind buffer."""
+from datetime import timedelta
+from typing import Dict, List
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from api.logins import last_login_buffer
+from api.models import User
+from tests.api.factories import UserFactory
+
+
+@pytest.fixture
+def write_behind(settings) -> None:
+    """Enable last_login write-behind mode without background flushing."""
+    settings.API_LAST_LOGIN_WRITE_BEHIND = True
+    settings.API_LAST_LOGIN_FLUSH_INTERVAL = 0
+    last_login_buffer.flush()
+    yield
+    last_login_buffer.pending.clear()
+
+
+@pytest.mark.django_db
+class TestLastLoginBuffer:
+    """Class for testing LastLoginBuffer."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_token_obtain_buffers_last_login(
+        self,
+        client: Client,
+        django_user_model: User,
+        django_assert_num_queries,
+        write_behind: None,
+    ) -> None:
+        """Test token issuing doesn't write last_login until flush."""
+        user: User = django_user_model.objects.create_user(
+            email="test@gmail.com", password="password"
+        )
+        token_data: Dict = {"email": user.email, "password": "password"}
+        response = client.post(reverse("token"), data=token_data)
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.last_login is None
+        assert user.pk in last_login_buffer.pending
+        with django_assert_num_queries(1):
+            assert last_login_buffer.flush() == 1
+        user.refresh_from_db()
+        assert user.last_login is not None
+
+    def test_flush_many_users(
+        self,
+        django_assert_num_queries,
+        write_behind: None,
+    ) -> None:
+        """Test pending updates of many users are written with one query."""
+        users: List[User] = UserFactory.create_batch(size=5)
+        now = timezone.now()
+        for user in users:
+            last_login_buffer.add(user.pk, now)
+        last_login_buffer.add(users[0].pk, now - timedelta(days=1))
+        with django_assert_num_queries(1):
+            assert last_login_buffer.flush() == 5
+        assert set(
+            User.objects.filter(pk__in=[user.pk for user in users]).values_list(
+                "last_login", flat=True
+            )
+        ) == {now}
+        assert not last_login_buffer.pending
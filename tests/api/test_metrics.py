@@ -0,0 +1,201 @@
+"""Module for testing api app metrics."""
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from api.metrics import merge, observe_request, registry, render
+from api.models import User
+
+REQUESTS_LINE: str = (
+    'api_requests_total{{view="{view}",method="{method}",status="{status}"}}'
+)
+
+
+def get_samples(client: Client) -> Dict[str, str]:
+    """Get metrics page as values by sample name with labels."""
+    response = client.get(reverse("metrics"))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    return dict(
+        line.rsplit(" ", 1)
+        for line in response.content.decode().splitlines()
+        if not line.startswith("#")
+    )
+
+
+def record_in_child() -> None:
+    """Record request in forked process and write it to metrics directory."""
+    observe_request("users", "GET", 200, 0.02, 3, 0.001)
+    registry.flush()
+    os._exit(0)
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """Class for testing MetricsMiddleware, registry and metrics view."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_requests_by_view(
+        self, client: Client, get_authorized_admin_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test requests are counted by url name, method and status."""
+        user, headers = get_authorized_admin_user_data
+        client.get(reverse("users"), headers=headers)
+        client.get(reverse("users"), headers=headers)
+        client.get(reverse("user", args=[user.pk + 1]), headers=headers)
+        client.get("/missing/")
+        samples: Dict[str, str] = get_samples(client)
+        assert samples[REQUESTS_LINE.format(view="token", method="POST", status=200)]
+        assert (
+            samples[REQUESTS_LINE.format(view="users", method="GET", status=200)] == "2"
+        )
+        assert samples[REQUESTS_LINE.format(view="user", method="GET", status=404)]
+        assert (
+            samples[REQUESTS_LINE.format(view="unresolved", method="GET", status=404)]
+            == "1"
+        )
+        labels: str = 'view="users",method="GET"'
+        assert samples[f"api_request_duration_seconds_count{{{labels}}}"] == "2"
+        assert (
+            samples[f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == "2"
+        )
+        assert float(samples[f"api_request_duration_seconds_sum{{{labels}}}"]) > 0
+        # Repeated request is served from response cache without queries.
+        assert samples[f'api_request_queries_bucket{{{labels},le="0"}}'] == "1"
+        assert int(samples[f"api_request_queries_sum{{{labels}}}"]) > 0
+        assert samples[f"api_request_db_duration_seconds_count{{{labels}}}"] == "2"
+
+    def test_async_view_labelled_with_namespace(self, client: Client) -> None:
+        """Test async views are told apart from sync ones."""
+        async_to_sync(AsyncClient().get)(reverse("async_api:teams"))
+        samples: Dict[str, str] = get_samples(client)
+        assert (
+            samples[
+                REQUESTS_LINE.format(view="async_api:teams", method="GET", status=401)
+            ]
+            == "1"
+        )
+
+    def test_unknown_method_labelled_other(self, client: Client) -> None:
+        """Test non-standard methods share one label."""
+        client.generic("PURGE", reverse("teams"))
+        client.generic("FOO", reverse("teams"))
+        samples: Dict[str, str] = get_samples(client)
+        assert samples[REQUESTS_LINE.format(view="teams", method="other", status=401)]
+        assert "PURGE" not in "".join(samples)
+
+    def test_access(
+        self,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test metrics are served to allowed addresses and staff only."""
+        _, headers = get_authorized_admin_user_data
+        url: str = reverse("metrics")
+        assert client.get(url).status_code == 200
+        settings.API_METRICS_ALLOWED_IPS = ["10.0.0.1"]
+        assert client.get(url).status_code == 403
+        assert client.get(url, REMOTE_ADDR="10.0.0.1").status_code == 200
+        assert client.get(url, headers=headers).status_code == 200
+        invalid: Dict = {"Authorization": "Bearer invalid"}
+        assert client.get(url, headers=invalid).status_code == 403
+
+    def test_access_not_staff(
+        self,
+        client: Client,
+        settings,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test metrics aren't served to regular users."""
+        _, headers = get_authorized_user_data
+        settings.API_METRICS_ALLOWED_IPS = []
+        assert client.get(reverse("metrics"), headers=headers).status_code == 403
+
+    def test_render(self) -> None:
+        """Test histogram buckets are cumulative in exposition format."""
+        observe_request("team", "GET", 200, 0.003, 1, 0.001)
+        observe_request("team", "GET", 200, 0.2, 2, 0.002)
+        lines: List[str] = render(registry.snapshot()).splitlines()
+        labels: str = 'view="team",method="GET"'
+        assert f'api_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+        assert f'api_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+        assert f'api_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in lines
+        assert f'api_request_queries_bucket{{{labels},le="1"}} 1' in lines
+        assert f"api_request_queries_sum{{{labels}}} 3" in lines
+        assert "# TYPE api_requests_total counter" in lines
+
+    def test_threads(self) -> None:
+        """Test concurrent updates from threads are all counted."""
+
+        def record() -> None:
+            for _ in range(1000):
+                observe_request("teams", "GET", 200, 0.01, 1, 0.001)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counted = registry.snapshot()["api_requests_total"]
+        assert counted[("teams", "GET", "200")] == [8000]
+
+    def test_processes(self, client: Client, settings, tmp_path: Path) -> None:
+        """Test metrics page sums values of processes sharing directory."""
+        settings.API_METRICS_DIR = str(tmp_path)
+        settings.API_METRICS_FLUSH_INTERVAL = 0
+        observe_request("users", "GET", 200, 0.01, 2, 0.001)
+        process = multiprocessing.get_context("fork").Process(target=record_in_child)
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert len(list(tmp_path.glob("metrics_*.json"))) == 1
+        samples: Dict[str, str] = get_samples(client)
+        assert (
+            samples[REQUESTS_LINE.format(view="users", method="GET", status=200)] == "2"
+        )
+
+    def test_exited_process_taken_over(
+        self, client: Client, settings, tmp_path: Path
+    ) -> None:
+        """Test file of exited process is removed, its values stay counted."""
+        settings.API_METRICS_DIR = str(tmp_path)
+        settings.API_METRICS_FLUSH_INTERVAL = 0
+        observe_request("users", "GET", 200, 0.01, 2, 0.001)
+        process = multiprocessing.get_context("fork").Process(target=record_in_child)
+        process.start()
+        process.join()
+        line: str = REQUESTS_LINE.format(view="users", method="GET", status=200)
+        for _ in range(2):
+            assert get_samples(client)[line] == "2"
+            assert not [
+                path
+                for path in tmp_path.iterdir()
+                if not path.name.startswith(f"metrics_{os.getpid()}_")
+            ]
+
+    def test_merge(self) -> None:
+        """Test merge sums series with same labels and keeps others."""
+        merged = merge(
+            [
+                {"api_requests_total": {("a", "GET", "200"): [1]}},
+                {
+                    "api_requests_total": {
+                        ("a", "GET", "200"): [2],
+                        ("b", "GET", "200"): [1],
+                    }
+                },
+            ]
+        )
+        assert merged["api_requests_total"] == {
+            ("a", "GET", "200"): [3],
+            ("b", "GET", "200"): [1],
+        }
@@ -0,0 +1,87 @@
+"""Module for testing api app pagination."""
+from typing import Dict, List, Tuple
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from api.models import Team, User
+from tests.api.factories import TeamFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Class for testing KeysetPagination on list views."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_users_pages_cover_ordered_list(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test following next links walks all users in keyset order."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=7)
+        expected: List[int] = list(
+            User.objects.order_by("last_name", "id").values_list("id", flat=True)
+        )
+        url: str = reverse("users") + "?page_size=3"
+        received: List[int] = []
+        while url:
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            result: Dict = response.json()
+            assert len(result["results"]) <= 3
+            received.extend(user["id"] for user in result["results"])
+            url = result["next"]
+        assert received == expected
+
+    def test_teams_previous_link(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test previous link returns the page preceding the current one."""
+        current_user, headers = get_authorized_user_data
+        TeamFactory.create_batch(size=5)
+        expected: List[int] = list(
+            Team.objects.order_by("name", "id").values_list("id", flat=True)
+        )
+        url: str = reverse("teams") + "?page_size=2"
+        first_page: Dict = client.get(url, headers=headers).json()
+        assert first_page["previous"] is None
+        second_page: Dict = client.get(first_page["next"], headers=headers).json()
+        assert [team["id"] for team in second_page["results"]] == expected[2:4]
+        previous_page: Dict = client.get(
+            second_page["previous"], headers=headers
+        ).json()
+        assert previous_page["results"] == first_page["results"]
+        assert previous_page["previous"] is None
+        assert previous_page["next"] == first_page["next"]
+
+    def test_max_page_size(
+        self,
+        client: Client,
+        settings,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test requested page size is limited by API_MAX_PAGE_SIZE."""
+        settings.API_MAX_PAGE_SIZE = 2
+        current_user, headers = get_authorized_user_data
+        TeamFactory.create_batch(size=3)
+        url: str = reverse("teams") + "?page_size=100"
+        result: Dict = client.get(url, headers=headers).json()
+        assert len(result["results"]) == 2
+        assert result["next"]
+
+    def test_invalid_cursor(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test malformed cursor is rejected."""
+        current_user, headers = get_authorized_user_data
+        url: str = reverse("users") + "?cursor=invalid"
+        response = client.get(url, headers=headers)
+        assert response.status_code == 404
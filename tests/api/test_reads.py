@@ -0,0 +1,150 @@
+"""Module for testing api app fast read path."""
+import datetime
+import decimal
+from io import StringIO
+from typing import Dict, List, Tuple
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Team, User
+from api.renderers import FastJSONRenderer
+from tests.api.factories import TeamFactory, UserFactory
+
+
+def get_both_ways(client: Client, settings, url: str, headers: Dict) -> List[bytes]:
+    """Get response content with fast read path enabled and disabled."""
+    contents: List[bytes] = []
+    for enabled in (True, False):
+        settings.API_FAST_READ_PATH = enabled
+        cache.clear()
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        contents.append(response.content)
+    return contents
+
+
+@pytest.mark.django_db
+class TestFastListMixin:
+    """Class for testing values_list() read path of UsersView and TeamsView."""
+
+    pytestmark = pytest.mark.django_db
+
+    @pytest.mark.parametrize(
+        "query",
+        ["", "?page_size=2", "?fields=email,team", "?fields=id&page_size=3"],
+    )
+    def test_users_byte_identical(
+        self,
+        query: str,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users list is the same as built by serializer byte for byte."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=5)
+        UserFactory(first_name="Zoë ", last_name='"Quoted" \\ 名前')
+        url: str = reverse("users") + query
+        fast, regular = get_both_ways(client, settings, url, headers)
+        assert fast == regular
+
+    def test_users_pages_byte_identical(
+        self,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test following next cursor gives the same pages on both paths."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=5)
+        first: Dict = client.get(
+            reverse("users") + "?page_size=2", headers=headers
+        ).json()
+        fast, regular = get_both_ways(client, settings, first["next"], headers)
+        assert fast == regular
+
+    def test_teams_byte_identical(
+        self,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test teams list is the same as built by serializer byte for byte."""
+        current_user, headers = get_authorized_admin_user_data
+        TeamFactory.create_batch(size=4)
+        fast, regular = get_both_ways(client, settings, reverse("teams"), headers)
+        assert fast == regular
+
+    def test_users_selects_serialized_columns(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test fast path reads only serialized and ordering columns."""
+        current_user, headers = get_authorized_admin_user_data
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse("users"), headers=headers)
+        select: str = queries[-1]["sql"]
+        assert '"api_user"."last_name"' in select
+        assert '"api_user"."password"' not in select
+
+    def test_roster_uses_serializer(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test lists with nested or computed fields fall back to serializer."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        response = client.get(reverse("teams_roster"), headers=headers)
+        team: Team = user.team
+        assert response.json()[0]["members"][0]["id"] == user.pk
+        assert response.json()[0]["member_count"] == team.user_set.count()
+
+
+class TestFastJSONRenderer:
+    """Class for testing FastJSONRenderer."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            None,
+            [],
+            {"text": "line separator ", "unicode": "Zoë 名前"},
+            {"date": datetime.date(2023, 1, 2), "decimal": decimal.Decimal("1.5")},
+            {
+                "datetime": datetime.datetime(2023, 1, 2, tzinfo=datetime.timezone.utc),
+                "nested": [{"a": 1, "b": None, "c": True, "d": 1.5}],
+            },
+        ],
+    )
+    def test_same_as_json_renderer(self, data) -> None:
+        """Test output equals JSONRenderer output."""
+        for media_type in (None, "application/json", "application/json; indent=4"):
+            assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(
+                data, media_type
+            )
+
+
+@pytest.mark.django_db
+class TestBenchmarkListSerializationCommand:
+    """Class for testing benchmark_list_serialization command."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_report(self) -> None:
+        """Test command reports throughput of both paths and leaves no rows."""
+        out = StringIO()
+        call_command("benchmark_list_serialization", rows=20, repeat=1, stdout=out)
+        lines: List[str] = out.getvalue().splitlines()
+        assert lines[0].startswith("serializer: ")
+        assert lines[1].startswith("fast path: ")
+        assert lines[2].endswith("identical output: True")
+        assert not User.objects.exists()
@@ -0,0 +1,139 @@
+"""Module for testing api app replica routing."""
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.middleware import ReplicaRoutingMiddleware
+from api.models import Team, User
+from api.routers import ReplicaRouter, is_reading_replica
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+
+def replicate() -> None:
+    """Copy teams and users from primary to replica, catching up the lag."""
+    User.objects.using("replica").all().delete()
+    Team.objects.using("replica").all().delete()
+    Team.objects.using("replica").bulk_create(Team.objects.using("default").all())
+    User.objects.using("replica").bulk_create(User.objects.using("default").all())
+
+
+@pytest.fixture
+def replica(settings) -> None:
+    """Enable 'replica' database for safe requests."""
+    settings.API_DATABASE_REPLICAS = ["replica"]
+    settings.API_REPLICA_STICKY_SECONDS = 0.5
+
+
+@pytest.fixture
+def reader_headers(django_user_model: User) -> Dict:
+    """Get authorization headers of regular user, other than writing admin."""
+    user: User = django_user_model.objects.create_user(
+        email="reader@gmail.com", password="password"
+    )
+    return {
+        "Authorization": f"Bearer {RefreshToken.for_user(user).access_token}",
+        "Content-Type": "application/json",
+    }
+
+
+@pytest.mark.usefixtures("replica")
+class TestReplicaRouting:
+    """Class for testing ReplicaRouter with ReplicaRoutingMiddleware."""
+
+    def test_safe_request_reads_replica(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+        reader_headers: Dict,
+    ) -> None:
+        """Test reads see replica, which doesn't have unreplicated rows yet."""
+        _, headers = get_authorized_admin_user_data
+        replicate()
+        team: Team = Team.objects.create(name="Lagging")
+        url: str = reverse("team", args=[team.pk])
+        assert client.get(url, headers=headers).status_code == 404
+        assert client.get(url, headers=reader_headers).status_code == 404
+        replicate()
+        assert client.get(url, headers=reader_headers).status_code == 200
+
+    def test_read_your_writes(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+        reader_headers: Dict,
+    ) -> None:
+        """Test writing client reads from primary for sticky window only."""
+        _, headers = get_authorized_admin_user_data
+        replicate()
+        response = client.post(
+            reverse("teams"),
+            data={"name": "New"},
+            content_type="application/json",
+            headers=headers,
+        )
+        assert response.status_code == 201
+        url: str = reverse("team", args=[response.json()["id"]])
+        assert client.get(url, headers=reader_headers).status_code == 404
+        assert client.get(url, headers=headers).status_code == 200
+        time.sleep(0.6)
+        # Other query string bypasses fresh response cached by previous request.
+        assert client.get(f"{url}?again", headers=headers).status_code == 404
+
+    def test_stale_replica_response_not_cached(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+        reader_headers: Dict,
+    ) -> None:
+        """Test response read from lagging replica doesn't reach writer."""
+        _, headers = get_authorized_admin_user_data
+        replicate()
+        response = client.post(
+            reverse("teams"),
+            data={"name": "New"},
+            content_type="application/json",
+            headers=headers,
+        )
+        team_id: int = response.json()["id"]
+        stale = client.get(reverse("teams"), headers=reader_headers).json()
+        assert team_id not in [team["id"] for team in stale]
+        fresh = client.get(reverse("teams"), headers=headers).json()
+        assert team_id in [team["id"] for team in fresh]
+
+    def test_write_goes_to_primary(self, client: Client) -> None:
+        """Test object read from replica is saved to primary."""
+        Team.objects.using("replica").create(name="Replica only")
+        team: Team = Team.objects.using("replica").get(name="Replica only")
+        assert ReplicaRouter().db_for_write(Team, instance=team) == "default"
+        team.save()
+        assert Team.objects.using("default").filter(pk=team.pk).exists()
+
+    def test_primary_outside_request(self) -> None:
+        """Test code outside requests reads from primary."""
+        assert ReplicaRouter().db_for_read(Team) == "default"
+
+    def test_async_middleware(self) -> None:
+        """Test middleware routes reads of async requests and pins writers."""
+        routed: List[bool] = []
+
+        async def get_response(request):
+            routed.append(is_reading_replica())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        factory = RequestFactory()
+        for request in (
+            factory.get("/"),
+            factory.post("/"),
+            factory.get("/", REMOTE_ADDR="127.0.0.2"),
+            factory.get("/"),
+        ):
+            async_to_sync(middleware)(request)
+        assert routed == [True, False, True, False]
@@ -0,0 +1,46 @@
+"""Module for testing api app schemas lazy loading."""
+import pytest
+from django.urls import Resolver404, resolve
+from drf_yasg import openapi
+
+from api import schemas
+
+
+class TestSchemas:
+    """Class for testing openapi objects and decorator depend on docs setting."""
+
+    def test_docs_enabled(self, settings) -> None:
+        """Test openapi objects are built and decorator is applied."""
+        settings.API_DOCS_ENABLED = True
+
+        def view_method():
+            """Handle request."""
+
+        assert isinstance(schemas.swagger_user_schema, openapi.Schema)
+        assert schemas.swagger_user_schema is schemas.swagger_user_schema
+        decorated = schemas.swagger_auto_schema(responses={200: "Ok."})(view_method)
+        assert decorated._swagger_auto_schema["responses"] == {200: "Ok."}
+
+    def test_docs_disabled(self, settings) -> None:
+        """Test openapi objects are None and decorator does nothing."""
+        settings.API_DOCS_ENABLED = False
+
+        def view_method():
+            """Handle request."""
+
+        assert schemas.swagger_user_schema is None
+        assert schemas.swagger_get_responses[200]
+        decorated = schemas.swagger_auto_schema(responses={200: "Ok."})(view_method)
+        assert decorated is view_method
+        assert not hasattr(decorated, "_swagger_auto_schema")
+
+    def test_unknown_name(self) -> None:
+        """Test unknown attribute raises AttributeError."""
+        with pytest.raises(AttributeError):
+            schemas.swagger_unknown_schema
+
+    def test_coreapi_docs_not_served(self) -> None:
+        """Test only cached OpenAPI docs are routed, coreapi ones aren't."""
+        assert resolve("/swagger/").url_name == "schema-swagger-ui"
+        with pytest.raises(Resolver404):
+            resolve("/api/")
@@ -0,0 +1,105 @@
+"""Module for testing api app users search."""
+from typing import Dict, List, Tuple
+
+import pytest
+from django.contrib.admin.sites import site
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+from api.models import User
+from api.search import search_users
+from tests.api.factories import UserFactory
+
+
+@pytest.fixture
+def people() -> List[User]:
+    """Create users with known emails and names."""
+    return [
+        UserFactory(
+            email="jonathan@example.com", first_name="Jonathan", last_name="Li"
+        ),
+        UserFactory(email="maria@example.com", first_name="Maria", last_name="Jonas"),
+        UserFactory(email="peter@example.com", first_name="Peter", last_name="Parker"),
+        UserFactory(email="50%off@example.com", first_name="Sale", last_name="Bot"),
+    ]
+
+
+@pytest.mark.django_db
+class TestSearchUsers:
+    """Class for testing search_users function."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_prefix_matches_first(self, people: List[User]) -> None:
+        """Test prefix matches of any field are ranked above fuzzy ones."""
+        result = list(search_users(User.objects.all(), "jon"))
+        assert result[:2] == people[:2]
+        assert people[2] not in result
+
+    def test_fuzzy_match(self, people: List[User]) -> None:
+        """Test misspelled query finds user."""
+        assert list(search_users(User.objects.all(), "Parkr")) == [people[2]]
+
+    def test_like_wildcards_escaped(self, people: List[User]) -> None:
+        """Test '%' and '_' in query are matched literally."""
+        assert list(search_users(User.objects.all(), "50%")) == [people[3]]
+        assert not search_users(User.objects.all(), "5_%").exists()
+
+
+@pytest.mark.django_db
+class TestUsersSearchView:
+    """Class for testing UsersSearchView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_search(
+        self,
+        people: List[User],
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test users are returned in relevance order and limited."""
+        _, headers = get_authorized_user_data
+        url: str = reverse("users_search")
+        response = client.get(url, {"q": "jon", "limit": 1}, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": people[0].pk,
+                "email": people[0].email,
+                "first_name": "Jonathan",
+                "last_name": "Li",
+                "team": people[0].team_id,
+            }
+        ]
+
+    @pytest.mark.parametrize("params", [{}, {"q": "jo"}, {"q": "jon", "limit": 0}])
+    def test_search_invalid_params(
+        self, params: Dict, client: Client, get_authorized_user_data: Tuple[User, Dict]
+    ) -> None:
+        """Test missing or too short query and bad limit are rejected."""
+        _, headers = get_authorized_user_data
+        response = client.get(reverse("users_search"), params, headers=headers)
+        assert response.status_code == 400
+
+    def test_search_unauthorized(self, client: Client) -> None:
+        """Test anonymous user can't search users."""
+        response = client.get(reverse("users_search"), {"q": "jon"})
+        assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestCustomUserAdminSearch:
+    """Class for testing CustomUserAdmin search."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_get_search_results(self, people: List[User]) -> None:
+        """Test admin search uses the same index-backed search."""
+        model_admin = site._registry[User]
+        request = RequestFactory().get("/")
+        queryset, distinct = model_admin.get_search_results(
+            request, User.objects.all(), "Parkr"
+        )
+        assert list(queryset) == [people[2]]
+        assert distinct is False
@@ -0,0 +1,146 @@
+"""Module for testing api app request timings."""
+import logging
+import re
+from typing import Dict, List, Tuple
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory
+from django.urls import reverse
+
+from api.middleware import ServerTimingMiddleware
+from api.models import Team, User
+from api.timing import RequestTimings, current_timings
+from tests.api.factories import TeamFactory
+
+
+def get_metrics(response) -> Dict[str, str]:
+    """Parse Server-Timing header into durations by metric name."""
+    return dict(
+        re.match(r"(\w+);dur=([\d.]+)", metric).groups()
+        for metric in response["Server-Timing"].split(", ")
+    )
+
+
+@pytest.mark.django_db
+class TestServerTimingMiddleware:
+    """Class for testing ServerTimingMiddleware."""
+
+    pytestmark = pytest.mark.django_db
+
+    @pytest.mark.parametrize("url_name", ["users", "teams"])
+    def test_header(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+        url_name: str,
+    ) -> None:
+        """Test staff gets SQL, auth, serializer, render and total timings."""
+        _, headers = get_authorized_admin_user_data
+        TeamFactory.create_batch(3)
+        response = client.get(reverse(url_name), headers=headers)
+        assert response.status_code == 200
+        metrics: Dict[str, str] = get_metrics(response)
+        assert list(metrics) == ["db", "auth", "serialize", "render", "total"]
+        assert float(metrics["total"]) >= float(metrics["render"])
+        assert re.search(r'db;dur=[\d.]+;desc="2 queries"', response["Server-Timing"])
+
+    def test_serializer_timed(
+        self,
+        client: Client,
+        settings,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test serializer output is timed on detail and regular list paths."""
+        user, headers = get_authorized_admin_user_data
+        settings.API_FAST_READ_PATH = False
+        for url in (reverse("user", args=[user.pk]), reverse("teams_roster")):
+            response = client.get(url, headers=headers)
+            assert "serialize" in get_metrics(response)
+
+    def test_header_staff_only(
+        self,
+        client: Client,
+        settings,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test header is sent to staff only, or to all, or to nobody."""
+        _, headers = get_authorized_user_data
+        url: str = reverse("teams")
+        assert "Server-Timing" not in client.get(url, headers=headers)
+        settings.API_SERVER_TIMING = "all"
+        assert "Server-Timing" in client.get(url, headers=headers)
+        assert "Server-Timing" in client.get(url)
+        settings.API_SERVER_TIMING = None
+        assert "Server-Timing" not in client.get(url, headers=headers)
+
+    def test_slow_request_logged(
+        self,
+        client: Client,
+        settings,
+        caplog,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test request over queries threshold is logged, others are not."""
+        _, headers = get_authorized_admin_user_data
+        url: str = reverse("teams")
+        with caplog.at_level(logging.WARNING, logger="api.middleware"):
+            client.get(url, headers=headers)
+            assert not caplog.records
+            settings.API_SLOW_REQUEST_QUERIES = 0
+            client.get(f"{url}?page_size=5", headers=headers)
+        assert len(caplog.records) == 1
+        assert (
+            caplog.records[0]
+            .getMessage()
+            .startswith("Slow request GET /team/?page_size=5: ")
+        )
+
+    def test_repeated_queries(self) -> None:
+        """Test statements run more than once are listed, most repeated first."""
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            for name in ("a", "b", "c", "d"):
+                Team.objects.filter(name=name).exists()
+            list(Team.objects.all())
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            current_timings.reset(token)
+        assert timings.queries == 6
+        repeated: List[Tuple[str, int]] = timings.get_repeated_statements()
+        assert len(repeated) == 1
+        assert repeated[0][1] == 4
+        assert "WHERE" in repeated[0][0]
+
+    def test_outside_request(self) -> None:
+        """Test queries outside measured requests aren't recorded."""
+        Team.objects.exists()
+        assert current_timings.get() is None
+
+    def test_async_middleware(self, settings) -> None:
+        """Test middleware measures async requests too."""
+        settings.API_SERVER_TIMING = "all"
+
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = ServerTimingMiddleware(get_response)
+        response = async_to_sync(middleware)(RequestFactory().get("/"))
+        assert list(get_metrics(response)) == ["db", "total"]
+
+    def test_async_session_user(self, django_user_model: User) -> None:
+        """Test lazy session user is loaded outside event loop under ASGI."""
+        client = AsyncClient()
+        client.force_login(
+            django_user_model.objects.create_superuser(
+                email="test@gmail.com", password="password"
+            )
+        )
+        for url, status in (("/missing/", 404), (reverse("metrics"), 200)):
+            response = async_to_sync(client.get)(url)
+            assert response.status_code == status
+            assert "Server-Timing" in response
@@ -3,10 +3,13 @@ import json
 from typing import Dict, List, Tuple
 
 import pytest
+from django.db import connection, transaction
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 
+from api.caching import get_versions
 from api.models import Team, User
 from tests.api.factories import TeamFactory, UserFactory
 
@@ -273,3 +276,251 @@ class TestUsersView:
                     assert getattr(users[-1 - i], key).id == value
                 else:
                     assert getattr(users[-1 - i], key) == value
+
+
+@pytest.mark.django_db
+class TestTeamRosterView:
+    """Class for testing TeamRosterView and TeamsRosterView."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_team_roster_get_method(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test TeamRosterView get method."""
+        current_user, headers = get_authorized_user_data
+        team: Team = TeamFactory()
+        members: List[User] = UserFactory.create_batch(size=3)
+        User.objects.filter(pk__in=[member.pk for member in members]).update(team=team)
+        url: str = reverse("team_roster", kwargs={"pk": team.pk})
+        response = client.get(url, headers=headers)
+        result: Dict = response.json()
+        assert response.status_code == 200
+        assert result["id"] == team.pk
+        assert result["member_count"] == 3
+        assert sorted(member["id"] for member in result["members"]) == sorted(
+            member.id for member in members
+        )
+
+    def test_team_roster_read_only(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test TeamRosterView doesn't allow changes."""
+        current_user, headers = get_authorized_admin_user_data
+        team: Team = TeamFactory()
+        url: str = reverse("team_roster", kwargs={"pk": team.pk})
+        response = client.delete(url, headers=headers)
+        assert response.status_code == 405
+
+    @pytest.mark.parametrize("teams_count, members_count", [(1, 1), (6, 4)])
+    def test_teams_roster_fixed_queries(
+        self,
+        teams_count: int,
+        members_count: int,
+        client: Client,
+        django_assert_num_queries,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test teams roster costs the same queries for any data size."""
+        current_user, headers = get_authorized_user_data
+        teams: List[Team] = TeamFactory.create_batch(size=teams_count)
+        for team in teams:
+            members: List[User] = UserFactory.create_batch(size=members_count)
+            User.objects.filter(pk__in=[member.pk for member in members]).update(
+                team=team
+            )
+        url: str = reverse("teams_roster")
+        with django_assert_num_queries(3):
+            response = client.get(url, headers=headers)
+        result: Dict = {team["id"]: team for team in response.json()}
+        assert response.status_code == 200
+        assert len(result) == Team.objects.count()
+        for team in teams:
+            team_data: Dict = result[team.pk]
+            assert team_data["member_count"] == members_count
+            assert len(team_data["members"]) == members_count
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    """Class for testing 'fields' query param of user and team views."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_users_fields(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test only requested fields are returned and selected."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=3)
+        url: str = reverse("users") + "?fields=id,email"
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 4
+        assert all(set(user) == {"id", "email"} for user in response.json())
+        select: str = queries[-1]["sql"]
+        assert '"api_user"."email"' in select
+        assert '"api_user"."password"' not in select
+        assert '"api_user"."first_name"' not in select
+
+    def test_users_fields_paginated(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test keyset cursors work with fields which don't include ordering."""
+        current_user, headers = get_authorized_admin_user_data
+        UserFactory.create_batch(size=3)
+        url: str = reverse("users") + "?fields=email&page_size=2"
+        first: Dict = client.get(url, headers=headers).json()
+        second: Dict = client.get(first["next"], headers=headers).json()
+        emails: List[str] = [user["email"] for user in first["results"]]
+        emails += [user["email"] for user in second["results"]]
+        assert sorted(emails) == sorted(User.objects.values_list("email", flat=True))
+        assert set(first["results"][0]) == {"email"}
+
+    def test_user_fields(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test fields param narrows single user and team responses."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("user", args=[user.pk]) + "?fields=team"
+        assert client.get(url, headers=headers).json() == {"team": user.team.pk}
+        url = reverse("team", args=[user.team.pk]) + "?fields=name"
+        assert client.get(url, headers=headers).json() == {"name": user.team.name}
+
+    def test_teams_roster_fields(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test fields param works for fields not backed by model columns."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("teams_roster") + "?fields=id,member_count"
+        response = client.get(url, headers=headers)
+        assert response.json() == [{"id": user.team.pk, "member_count": 1}]
+
+    @pytest.mark.parametrize("fields", ["id,password", "", ","])
+    def test_unknown_fields(
+        self,
+        fields: str,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test unknown or empty fields are rejected."""
+        current_user, headers = get_authorized_admin_user_data
+        url: str = reverse("users") + f"?fields={fields}"
+        response = client.get(url, headers=headers)
+        assert response.status_code == 400
+        assert "fields" in response.json()
+
+    def test_fields_ignored_on_update(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test updates save and return whole object regardless of fields."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("user", args=[user.pk]) + "?fields=id"
+        data: str = json.dumps({"first_name": "Alex"})
+        response = client.patch(url, data=data, headers=headers)
+        assert response.json()["first_name"] == "Alex"
+        assert response.json()["email"] == user.email
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Class for testing cached responses of user and team views."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_teams_cached_response(
+        self,
+        client: Client,
+        django_assert_num_queries,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test repeated teams list is served from cache with same ETag."""
+        current_user, headers = get_authorized_user_data
+        TeamFactory.create_batch(size=3)
+        url: str = reverse("teams")
+        first = client.get(url, headers=headers)
+        with django_assert_num_queries(0):
+            second = client.get(url, headers=headers)
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+
+    def test_teams_not_modified(
+        self,
+        client: Client,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test matching If-None-Match gets 304 until team changes."""
+        current_user, headers = get_authorized_user_data
+        team: Team = TeamFactory()
+        url: str = reverse("team", kwargs={"pk": team.pk})
+        etag: str = client.get(url, headers=headers)["ETag"]
+        conditional_headers: Dict = {**headers, "If-None-Match": etag}
+        response = client.get(url, headers=conditional_headers)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        team.name = "renamed"
+        team.save()
+        response = client.get(url, headers=conditional_headers)
+        assert response.status_code == 200
+        assert response.json()["name"] == "renamed"
+        assert response["ETag"] != etag
+
+    def test_users_invalidated_by_team_delete(
+        self,
+        client: Client,
+        get_authorized_admin_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test deleting team invalidates cached users with that team."""
+        current_user, headers = get_authorized_admin_user_data
+        user: User = UserFactory()
+        url: str = reverse("user", kwargs={"pk": user.pk})
+        assert client.get(url, headers=headers).json()["team"] == user.team.pk
+        user.team.delete()
+        assert client.get(url, headers=headers).json()["team"] is None
+
+    def test_versions_bumped_on_commit(
+        self, django_capture_on_commit_callbacks
+    ) -> None:
+        """Test change bumps versions inside transaction and after commit."""
+        before: Tuple[str, ...] = get_versions(("team",))
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                TeamFactory()
+                during: Tuple[str, ...] = get_versions(("team",))
+        after: Tuple[str, ...] = get_versions(("team",))
+        assert len({before, during, after}) == 3
+
+    def test_last_login_keeps_cache(
+        self,
+        client: Client,
+        django_assert_num_queries,
+        get_authorized_user_data: Tuple[User, Dict],
+    ) -> None:
+        """Test last_login updates on token issuing don't invalidate users."""
+        current_user, headers = get_authorized_user_data
+        url: str = reverse("users")
+        client.get(url, headers=headers)
+        token_data: Dict = {"email": current_user.email, "password": "password"}
+        client.post(reverse("token"), data=token_data)
+        with django_assert_num_queries(0):
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
@@ -0,0 +1,185 @@
+"""Module for testing pooled PostgreSQL backend."""
+import threading
+import time
+from typing import Dict, Iterator, List
+
+import pytest
+from django.db import OperationalError, connection
+
+from config.postgresql_pool.base import DatabaseWrapper
+from config.postgresql_pool.pool import ConnectionPool, PoolTimeout, close_pools
+
+
+class FakeConnection:
+    """DB-API connection stub recording calls."""
+
+    def __init__(self, healthy: bool = True) -> None:
+        """Initialize open connection."""
+        self.healthy = healthy
+        self.closed = 0
+        self.rollbacks = 0
+
+    def cursor(self) -> "FakeConnection":
+        """Get cursor, which is connection itself."""
+        return self
+
+    def __enter__(self) -> "FakeConnection":
+        """Enter cursor context."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit cursor context."""
+
+    def execute(self, sql: str) -> None:
+        """Execute query failing if connection is broken."""
+        if not self.healthy:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+    def rollback(self) -> None:
+        """Count rollbacks."""
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        """Mark connection closed."""
+        self.closed = 1
+
+
+@pytest.fixture
+def opened() -> List[FakeConnection]:
+    """Get list collecting opened fake connections."""
+    return []
+
+
+@pytest.fixture
+def connect(opened: List[FakeConnection]):
+    """Get function opening fake connections."""
+
+    def connect() -> FakeConnection:
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    return connect
+
+
+class TestConnectionPool:
+    """Class for testing ConnectionPool."""
+
+    def test_reuse(self, connect, opened: List[FakeConnection]) -> None:
+        """Test returned connection is checked out again."""
+        pool = ConnectionPool()
+        first = pool.get(connect)
+        pool.put(first)
+        assert pool.get(connect) is first
+        assert len(opened) == 1
+        stats: Dict[str, int] = pool.stats()
+        assert stats["created"] == 1
+        assert stats["checkouts"] == 2
+        assert stats["size"] == 1
+
+    def test_min_size(self, connect, opened: List[FakeConnection]) -> None:
+        """Test pool opens min size connections on first checkout."""
+        pool = ConnectionPool(min_size=3)
+        pool.get(connect)
+        assert len(opened) == 3
+        assert pool.stats()["idle"] == 2
+
+    def test_timeout(self, connect) -> None:
+        """Test checkout fails when pool stays full longer than timeout."""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        pool.get(connect)
+        with pytest.raises(PoolTimeout):
+            pool.get(connect)
+        stats: Dict[str, int] = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["waits"] >= 1
+
+    def test_wait(self, connect) -> None:
+        """Test waiting checkout gets connection returned by other thread."""
+        pool = ConnectionPool(max_size=1, timeout=5)
+        first = pool.get(connect)
+        releaser = threading.Timer(0.05, pool.put, [first])
+        releaser.start()
+        assert pool.get(connect) is first
+        releaser.join()
+        assert pool.stats()["waits"] >= 1
+
+    def test_max_lifetime(self, connect, opened: List[FakeConnection]) -> None:
+        """Test expired connection is closed instead of reused."""
+        pool = ConnectionPool(max_lifetime=0.01)
+        first = pool.get(connect)
+        time.sleep(0.02)
+        pool.put(first)
+        assert first.closed
+        assert pool.get(connect) is not first
+        assert pool.stats()["closed"] == 1
+
+    def test_health_check(self, connect, opened: List[FakeConnection]) -> None:
+        """Test broken idle connection is replaced on checkout."""
+        pool = ConnectionPool()
+        first = pool.get(connect)
+        pool.put(first)
+        first.healthy = False
+        second = pool.get(connect)
+        assert second is not first
+        assert first.closed
+        stats: Dict[str, int] = pool.stats()
+        assert stats["failed_checks"] == 1
+        assert stats["size"] == 1
+
+    def test_put_closed(self, connect) -> None:
+        """Test closed connection frees its slot on return."""
+        pool = ConnectionPool(max_size=1)
+        first = pool.get(connect)
+        first.close()
+        pool.put(first)
+        assert pool.stats()["size"] == 0
+        assert pool.get(connect) is not first
+
+    def test_connect_failure(self) -> None:
+        """Test failed connect doesn't leak pool slot."""
+        pool = ConnectionPool(max_size=1)
+
+        def connect():
+            raise ConnectionError("could not connect to server")
+
+        with pytest.raises(ConnectionError):
+            pool.get(connect)
+        assert pool.stats()["size"] == 0
+
+
+@pytest.fixture
+def settings_dict() -> Iterator[Dict]:
+    """Get settings of pooled database with the same server and database."""
+    yield {**connection.settings_dict, "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.1}}
+    close_pools(connection.alias)
+
+
+@pytest.mark.django_db
+class TestDatabaseWrapper:
+    """Class for testing pooled DatabaseWrapper."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_connection_reused(self, settings_dict: Dict) -> None:
+        """Test closed connection goes back to pool and is reused."""
+        for _ in range(3):
+            wrapper = DatabaseWrapper(settings_dict, alias=connection.alias)
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                assert cursor.fetchone() == (1,)
+            wrapper.close()
+        stats: Dict[str, int] = wrapper.pool.stats()
+        assert stats["created"] == 1
+        assert stats["checkouts"] == 3
+        assert stats["idle"] == 1
+
+    def test_pool_timeout(self, settings_dict: Dict) -> None:
+        """Test exhausted pool raises database error."""
+        first = DatabaseWrapper(settings_dict, alias=connection.alias)
+        first.ensure_connection()
+        second = DatabaseWrapper(settings_dict, alias=connection.alias)
+        with pytest.raises(OperationalError):
+            second.ensure_connection()
+        first.close()
+        second.ensure_connection()
+        second.close()
@@ -0,0 +1,94 @@
+"""Module for testing cached OpenAPI schema view."""
+from typing import List
+
+import pytest
+from django.test import Client
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from api.views import UserView
+from config import schema
+from config.schema import describe_view, get_schema_fingerprint
+
+
+@pytest.fixture
+def generated(monkeypatch) -> List[bool]:
+    """Record every schema generation."""
+    calls: List[bool] = []
+    get_schema = OpenAPISchemaGenerator.get_schema
+
+    def record(self, request=None, public=False):
+        calls.append(True)
+        return get_schema(self, request, public)
+
+    monkeypatch.setattr(OpenAPISchemaGenerator, "get_schema", record)
+    return calls
+
+
+class TestCachedSchemaView:
+    """Class for testing spec generated once and served conditionally."""
+
+    @pytest.mark.parametrize(
+        "url", ["/swagger.json/", "/swagger.yaml/", "/swagger/?format=openapi"]
+    )
+    def test_generated_once(self, url: str, client: Client, generated) -> None:
+        """Test spec is generated on first request and then served from cache."""
+        first = client.get(url)
+        second = client.get(url)
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first["ETag"] == second["ETag"]
+        assert len(generated) == 1
+
+    def test_formats_cached_separately(self, client: Client) -> None:
+        """Test json and yaml specs don't share cache entry."""
+        json_response = client.get("/swagger.json/")
+        yaml_response = client.get("/swagger.yaml/")
+        assert json_response["Content-Type"].startswith("application/json")
+        assert yaml_response["Content-Type"].startswith("application/yaml")
+        assert b'"paths"' in json_response.content
+        assert b"paths:" in yaml_response.content
+
+    def test_not_modified(self, client: Client, generated) -> None:
+        """Test matching ETag or Last-Modified gets 304 without content."""
+        response = client.get("/swagger.json/")
+        etag = client.get("/swagger.json/", headers={"If-None-Match": response["ETag"]})
+        modified = client.get(
+            "/swagger.json/", headers={"If-Modified-Since": response["Last-Modified"]}
+        )
+        assert etag.status_code == modified.status_code == 304
+        assert etag.content == b""
+        assert len(generated) == 1
+
+    def test_rebuilt_on_code_change(
+        self, client: Client, generated, monkeypatch
+    ) -> None:
+        """Test spec is generated again when fingerprint of code changes."""
+        client.get("/swagger.json/")
+        monkeypatch.setattr(schema, "get_schema_fingerprint", lambda: "changed")
+        client.get("/swagger.json/")
+        client.get("/swagger.json/")
+        assert len(generated) == 2
+
+    def test_ui_not_cached(self, client: Client) -> None:
+        """Test html ui pages are rendered as before."""
+        response = client.get("/swagger/")
+        assert response.status_code == 200
+        assert not response.has_header("ETag")
+
+
+class TestSchemaFingerprint:
+    """Class for testing code fingerprint of schema."""
+
+    def test_stable(self) -> None:
+        """Test fingerprint doesn't change between computations."""
+        fingerprint: str = get_schema_fingerprint()
+        get_schema_fingerprint.cache_clear()
+        assert get_schema_fingerprint() == fingerprint
+
+    def test_view_description_includes_overrides(self) -> None:
+        """Test view description covers its code and swagger overrides."""
+        parts: List[str] = describe_view(UserView.as_view())
+        assert parts[0] == "api.views.UserView"
+        assert any("class UserView(" in part for part in parts)
+        assert any("class UserSerializer(" in part for part in parts)
+        assert any("Operation successfully performed." in part for part in parts)
@@ -2,9 +2,21 @@
 import random
 
 import pytest
+from django.core.cache import cache
+
+from api.authentication import token_cache
+from api.metrics import registry
 
 
 @pytest.fixture(scope="function", autouse=True)
 def faker_seed() -> None:
     """Generate random seed for Faker instance."""
     return random.seed(version=3)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def clear_cache() -> None:
+    """Clear caches and metrics, they aren't rolled back between tests."""
+    cache.clear()
+    token_cache.clear()
+    registry.clear()
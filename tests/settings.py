@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_yasg",
@@ -48,12 +50,13 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.coreapi.AutoSchema",
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("api.authentication.CachedJWTAuthentication",),
 }
 
 MIDDLEWARE = [
+    "api.middleware.ServerTimingMiddleware",
+    "api.middleware.MetricsMiddleware",
+    "api.middleware.AdmissionControlMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -61,6 +64,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -110,8 +114,7 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
-    "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers"
-    ".TokenObtainPairSerializer",
+    "TOKEN_OBTAIN_SERIALIZER": "api.serializers.TokenObtainPairSerializer",
     "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers"
     ".TokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers"
@@ -142,6 +145,27 @@ DATABASES = {
         "PASSWORD": str(os.getenv("POSTGRES_PASSWORD")),
         "HOST": str(os.getenv("POSTGRES_HOST")),
         "PORT": str(os.getenv("POSTGRES_PORT")),
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": "db_for_testing_replica",
+        "USER": str(os.getenv("POSTGRES_USER")),
+        "PASSWORD": str(os.getenv("POSTGRES_PASSWORD")),
+        "HOST": str(os.getenv("POSTGRES_HOST")),
+        "PORT": str(os.getenv("POSTGRES_PORT")),
+    },
+}
+
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "person",
     }
 }
 
@@ -193,3 +217,69 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "api.User"
+
+# Api app settings
+
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+API_IMPORT_CHUNK_SIZE = 500
+API_IMPORT_HASH_WORKERS = None  # None means one process per CPU core
+API_IMPORT_HASH_POOL_MIN_ROWS = 50  # Smaller chunks are hashed inline
+API_BULK_UPDATE_BATCH_SIZE = 500
+API_EXPORT_CHUNK_SIZE = 2000
+API_RESPONSE_CACHE_TIMEOUT = 300
+API_AUTH_CACHE_MAX_SIZE = 10000
+API_AUTH_CACHE_TTL = 60
+API_LAST_LOGIN_WRITE_BEHIND = False
+API_LAST_LOGIN_FLUSH_INTERVAL = 5
+API_PASSWORD_HASH_WORKERS = None  # None means one thread per CPU core
+API_SEARCH_LIMIT = 20
+API_SEARCH_MAX_LIMIT = 100
+API_FAST_READ_PATH = True
+API_DATABASE_REPLICAS = []  # Separate 'replica' database is enabled per test
+API_REPLICA_STICKY_SECONDS = 5
+API_SERVER_TIMING = "staff"  # "all", "staff" or None to send no header
+API_SLOW_REQUEST_MS = 1000  # None disables logging slow requests by time
+API_SLOW_REQUEST_QUERIES = 50  # None disables logging slow requests by queries
+API_METRICS_DIR = None  # Metrics of test process only
+API_METRICS_FLUSH_INTERVAL = 5
+# Scrapers served without staff token by REMOTE_ADDR, other clients need one.
+API_METRICS_ALLOWED_IPS = ["127.0.0.1"]
+API_ADMISSION_CLASSES = {
+    # Password hashing.
+    "hashing": {
+        "views": [
+            "token",
+            "sign_up",
+            "users_import",
+            "async_api:token",
+            "async_api:sign_up",
+        ],
+        "limit": 4,
+        "queue": 8,
+        "timeout": 10,
+    },
+    # Reading or writing many rows.
+    "bulk": {
+        "views": [
+            "users",
+            "users_search",
+            "users_move",
+            "users_export",
+            "teams_roster",
+            "async_api:users",
+        ],
+        "limit": 8,
+        "queue": 16,
+        "timeout": 10,
+    },
+}
+API_ADMISSION_RETRY_AFTER = 5
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "True") == "True"
+
+if not API_DOCS_ENABLED:
+    INSTALLED_APPS.remove("drf_yasg")
+    # DRF imports coreapi and coreschema whenever they are installed, though
+    # only docs use them, so lean workers skip them.
+    sys.modules.setdefault("coreapi", None)
+    sys.modules.setdefault("coreschema", None)